@@ -0,0 +1,69 @@
+"""
+Answer index | MathQuiz
+
+The answers of open_answer_quiz are typed freely: "12cm³", "12 cm^3" and "12cm**3" are the same answer, like "0.5",
+"0,5" and "1/2", or "oui" and "Yes". Every way of writing an answer is brought back to one normalised text, and the
+set of the normalised accepted answers of a question is computed once, when the question is generated. Checking an
+answer is then only one normalisation and one lookup in this set.
+"""
+import re
+from fractions import Fraction
+from typing import Iterable, Optional
+
+#  The answers longer than this are wrong anyway, they are not normalised
+MAX_ANSWER_LENGTH = 64
+
+TRUE_ANSWERS = frozenset({'oui', 'o', 'yes', 'y', 'vrai', 'true', '1'})
+FALSE_ANSWERS = frozenset({'non', 'n', 'no', 'faux', 'false', '0'})
+
+_SUPERSCRIPTS = re.compile('[⁰¹²³⁴⁵⁶⁷⁸⁹⁻]+')
+_FROM_SUPERSCRIPT = str.maketrans('⁰¹²³⁴⁵⁶⁷⁸⁹⁻', '0123456789-')
+_SPACES = re.compile(r'\s+')
+#  Only plain decimals and fractions, so "1e999999" is never turned into a huge number
+_NUMBER = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)(/\d+)?')
+
+
+def normalise_answer(answer: object) -> str:
+    """
+    returns the normalised writing of an answer: lower case, no spaces, "^3" for "³" and "**3", "pi" for "π", no "*"
+    for the products ("2*pi" is "2pi"), and the numbers written as reduced fractions ("0,5", "0.50" and "1/2" are
+    "1/2", "3.0" is "3").
+    """
+    text = _SPACES.sub('', str(answer).lower())
+    text = _SUPERSCRIPTS.sub(lambda match: '^' + match.group().translate(_FROM_SUPERSCRIPT), text)
+    text = text.replace('**', '^').replace('×', '*').replace('*', '').replace('π', 'pi').replace(',', '.')
+    if _NUMBER.fullmatch(text):
+        try:
+            return str(Fraction(text))
+        except (ValueError, ZeroDivisionError):  # e.g. "1.5/2" or "1/0"
+            pass
+    return text
+
+
+def accepted_answers(answer: object, others_answers: Optional[Iterable] = None) -> frozenset[str]:
+    """
+    returns the normalised writings of all the good answers of a question.
+
+    :param answer: the expected answer, a boolean is accepted as oui/non, yes/no, vrai/faux, true/false or 1/0
+    :param others_answers: the other good answers, a single answer can be given as a string. The None are ignored.
+    """
+    if isinstance(answer, bool):
+        return TRUE_ANSWERS if answer else FALSE_ANSWERS
+    if others_answers is None:
+        others_answers = ()
+    elif isinstance(others_answers, str):
+        others_answers = (others_answers,)
+    return frozenset(normalise_answer(value) for value in (answer, *others_answers) if value is not None)
+
+
+def answer_text(answer: object) -> str:
+    """
+    returns the expected answer as shown to the user ("oui" or "non" for a boolean)
+    """
+    if isinstance(answer, bool):
+        return 'oui' if answer else 'non'
+    return str(answer)
+
+
+def is_accepted(accepted: frozenset[str], answer: str) -> bool:
+    return len(answer) <= MAX_ANSWER_LENGTH and normalise_answer(answer) in accepted
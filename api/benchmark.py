@@ -0,0 +1,345 @@
+"""
+Benchmark | MathQuiz
+
+Measures the time of every question generator ("q_" functions of the two quiz modules, drawn and rendered in each
+latex mode for the multiple choice quiz), of generate_mcq_question (and of its draw and render stages alone), of
+calculate_score and of the /api/generate path (called in-process, without network). The random draws use fixed
+seeds, so two runs measure the same questions.
+
+    python benchmark.py --output results.json
+    python benchmark.py --baseline results.json --threshold 0.25
+
+The results (throughput and p50/p95/p99/max latency in microseconds) are written in a JSON file. With a baseline, the
+cases whose p50 is slower than the baseline by more than the threshold are listed and the exit code is 1.
+
+The startup of the API is measured too, in a new interpreter: the import time of main and of its slowest modules (like
+python -X importtime) and the time of main.warm_up.
+
+With --workers, the real server (gunicorn.conf.py) is started with each number of workers, and client processes send
+requests to /api/generate over HTTP for some seconds: the result is the number of requests per second for each number
+of workers.
+
+    python benchmark.py --workers 1,2,4,8 --duration 10 --clients 16
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from random import Random
+from typing import Callable, Iterator, Optional
+
+import multiple_choice_quiz
+import open_answer_quiz
+
+Case = tuple[str, Callable[[Random], object]]
+
+
+def percentile(sorted_values: list[int], ratio: float) -> int:
+    index = min(len(sorted_values) - 1, max(0, round(ratio * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(function: Callable[[Random], object], *, iterations: int, seed: int, warmup: int = 10) -> dict:
+    """
+    Calls the function iterations times with a generator created from the seed.
+
+    :return: throughput (calls per second) and latencies in microseconds
+    """
+    rng = Random(seed)
+    for _ in range(warmup):
+        function(rng)
+    rng = Random(seed)
+    timings = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(iterations):
+        call_start = clock()
+        function(rng)
+        timings.append(clock() - call_start)
+    total = clock() - start
+    timings.sort()
+    return {'iterations': iterations,
+            'ops_per_second': round(iterations / total * 1e9, 1),
+            'p50_us': round(percentile(timings, 0.50) / 1000, 2),
+            'p95_us': round(percentile(timings, 0.95) / 1000, 2),
+            'p99_us': round(percentile(timings, 0.99) / 1000, 2),
+            'max_us': round(timings[-1] / 1000, 2)}
+
+
+def question_cases() -> Iterator[Case]:
+    """
+    All the "q_" functions of the two modules, found with their question registry.
+    """
+    for latex in (False, True):
+        for subject_name, subject in multiple_choice_quiz.get_subjects_registry(latex)['subjects'].items():
+            for entry in subject.questions:
+                yield (f'mcq/{subject_name}/{entry.question_name}/latex={latex}',
+                       lambda rng, entry=entry, subject=subject: subject.render(subject.draw_question(entry, rng=rng)))
+    for subject_name, subject in open_answer_quiz.get_subjects_registry()['subjects'].items():
+        for entry in subject.questions:
+            yield (f'open/{subject_name}/{entry.question_name}',
+                   lambda rng, entry=entry, subject=subject: entry.call(subject.clr, rng=rng))
+
+
+def score_meta_data(number_of_answers: int = 20, *, seed: int = 0) -> dict:
+    rng = Random(seed)
+    return {'answers': {str(index): {'question_name': 'q', 'subject': 'Algebra', 'timeTaken': rng.uniform(0, 20),
+                                     'correct': rng.random() < 0.7}
+                        for index in range(number_of_answers)}}
+
+
+class ASGIClient:
+    def __init__(self, app):
+        """
+        Calls an ASGI application directly, without server and network, to measure only the time of the
+        application (routing, validation, generation and serialization).
+        """
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+
+    async def _request(self, method: str, path: str, body: bytes) -> tuple[int, bytes]:
+        scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+                 'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+                 'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+                 'client': ('127.0.0.1', 0), 'server': ('127.0.0.1', 80)}
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        response = {'status': 0, 'body': b''}
+
+        async def receive():
+            return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+            elif message['type'] == 'http.response.body':
+                response['body'] += message.get('body', b'')
+
+        await self.app(scope, receive, send)
+        return response['status'], response['body']
+
+    def post(self, path: str, body: dict) -> tuple[int, bytes]:
+        return self.loop.run_until_complete(self._request('POST', path, json.dumps(body).encode()))
+
+    def close(self):
+        self.loop.close()
+
+
+def api_cases() -> Iterator[Case]:
+    import main
+    client = ASGIClient(main.app)
+    for latex in (False, True):
+        #  With a seed, the question is generated by the request (not taken from the pool of questions)
+        yield (f'api/generate/latex={latex}',
+               lambda rng, latex=latex: client.post('/api/generate', {'latex': latex, 'seed': rng.getrandbits(32)}))
+    meta_data = score_meta_data()
+    yield 'api/score', lambda rng: client.post('/api/score', meta_data)
+
+
+def all_cases(*, with_api: bool = True) -> Iterator[Case]:
+    yield from question_cases()
+    for latex in (False, True):
+        yield (f'generate_mcq_question/latex={latex}',
+               lambda rng, latex=latex: multiple_choice_quiz.generate_mcq_question('*', latex=latex, rng=rng))
+    yield 'draw_mcq_question', lambda rng: multiple_choice_quiz.draw_mcq_question('*', rng=rng)
+    #  The same draws are rendered in both formats
+    specs = [multiple_choice_quiz.draw_mcq_question('*', rng=seed) for seed in range(64)]
+    for latex in (False, True):
+        yield (f'render_question/latex={latex}',
+               lambda rng, latex=latex: multiple_choice_quiz.render_question(rng.choice(specs), latex))
+    meta_data = score_meta_data()
+    yield 'calculate_score', lambda rng: multiple_choice_quiz.calculate_score(meta_data)
+    if with_api:
+        yield from api_cases()
+
+
+def http_load(port: int, duration: float, seed: int) -> int:
+    """
+    Sends requests to /api/generate (with a seed, so the question is generated by the request) on one connection
+    for duration seconds, in a client process.
+
+    :return: number of successful requests
+    """
+    rng = Random(seed)
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    headers = {'Content-Type': 'application/json'}
+    count = 0
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        body = json.dumps({'latex': True, 'seed': rng.getrandbits(32)})
+        connection.request('POST', '/api/generate', body, headers)
+        response = connection.getresponse()
+        response.read()
+        count += response.status == 200
+    connection.close()
+    return count
+
+
+def wait_ready(port: int, *, timeout: float = 60) -> None:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/ready')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f'The server on the port {port} is not ready after {timeout} seconds.')
+
+
+def serving_throughput(workers: int, *, duration: float = 10, clients: int = 16, port: int = 8765,
+                       seed: int = 0) -> dict:
+    """
+    Starts gunicorn with this number of workers and measures the requests per second of the clients processes.
+    """
+    environment = {**os.environ, 'MATHQUIZ_WORKERS': str(workers), 'MATHQUIZ_BIND': f'127.0.0.1:{port}'}
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'main:app'],
+                              cwd=os.path.dirname(os.path.abspath(__file__)), env=environment,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port)
+        #  Every worker answers its readiness (and its first requests) before the measure
+        http_load(port, 1, seed)
+        with multiprocessing.Pool(clients) as pool:
+            counts = pool.starmap(http_load, [(port, duration, seed + client) for client in range(clients)])
+    finally:
+        server.terminate()
+        server.wait(60)
+    return {'workers': workers, 'clients': clients, 'duration': duration,
+            'requests_per_second': round(sum(counts) / duration, 1)}
+
+
+def startup_report(module: str = 'main', *, top: int = 10) -> dict:
+    """
+    Imports the module in a new interpreter with "python -X importtime", then calls its warm_up function if it has one.
+
+    :param top: number of modules listed, those with the longest import time of their own (without their imports)
+    :return: import time of the module and of the slowest modules, and time of warm_up, in milliseconds
+    """
+    code = (f'import sys, time, {module}\n'
+            f'print("warm_up", file=sys.stderr)\n'
+            f'start = time.perf_counter()\n'
+            f'getattr({module}, "warm_up", lambda: None)()\n'
+            f'print(time.perf_counter() - start)')
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    modules = {}
+    for line in process.stderr.splitlines():
+        if line == 'warm_up':
+            #  The modules imported by warm_up are not counted in the startup
+            break
+        #  "import time:  self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(own), int(cumulative))
+    slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return {'module': module,
+            'import_ms': round(modules[module][1] / 1000, 1),
+            'warm_up_ms': round(float(process.stdout.split()[-1]) * 1000, 1),
+            'slowest_imports': [{'module': name, 'self_ms': round(own / 1000, 1),
+                                 'cumulative_ms': round(cumulative / 1000, 1)}
+                                for name, (own, cumulative) in slowest]}
+
+
+def run_benchmark(*, iterations: int = 500, seed: int = 0, name_filter: Optional[str] = None,
+                  with_api: bool = True, with_startup: bool = True) -> dict:
+    results = {}
+    for name, function in all_cases(with_api=with_api):
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(function, iterations=iterations, seed=seed)
+    report = {'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                       'iterations': iterations, 'seed': seed, 'date': time.strftime('%Y-%m-%dT%H:%M:%S')},
+              'results': results}
+    if with_startup:
+        report['startup'] = startup_report()
+    return report
+
+
+def compare(results: dict, baseline: dict, *, threshold: float = 0.25, metric: str = 'p50_us') -> list[dict]:
+    """
+    :return: the cases whose metric is greater than the one of the baseline by more than the threshold (ratio)
+    """
+    regressions = []
+    for name, result in results['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None or not reference[metric]:
+            continue
+        ratio = result[metric] / reference[metric]
+        if ratio > 1 + threshold:
+            regressions.append({'name': name, 'metric': metric, 'baseline': reference[metric],
+                                'current': result[metric], 'ratio': round(ratio, 2)})
+    return regressions
+
+
+def print_results(results: dict):
+    width = max(map(len, results['results']), default=0)
+    print(f"{'case'.ljust(width)}  {'ops/s':>10}  {'p50':>9}  {'p95':>9}  {'p99':>9}  {'max':>9}  (µs)")
+    for name, result in results['results'].items():
+        print(f"{name.ljust(width)}  {result['ops_per_second']:>10}  {result['p50_us']:>9}  {result['p95_us']:>9}  "
+              f"{result['p99_us']:>9}  {result['max_us']:>9}")
+    startup = results.get('startup')
+    if startup:
+        print(f"\nimport {startup['module']}: {startup['import_ms']} ms, warm_up: {startup['warm_up_ms']} ms")
+        for module in startup['slowest_imports']:
+            print(f"  {module['module'].ljust(40)}  {module['self_ms']:>8} ms  ({module['cumulative_ms']} ms with "
+                  f"its imports)")
+
+
+def main(arguments: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark of the question generators of MathQuiz.')
+    parser.add_argument('--iterations', type=int, default=500, help='number of calls of each case')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random draws')
+    parser.add_argument('--filter', dest='name_filter', help='only the cases whose name contains this text')
+    parser.add_argument('--no-api', action='store_true', help='do not measure the /api/generate path')
+    parser.add_argument('--no-startup', action='store_true', help='do not measure the import and warm-up of the API')
+    parser.add_argument('--output', help='JSON file where the results are written')
+    parser.add_argument('--baseline', help='JSON file of previous results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='maximal slowdown of the p50 compared with the baseline (0.25 = 25%%)')
+    parser.add_argument('--workers', help='numbers of workers of the server to measure over HTTP, e.g. 1,2,4')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of requests for each number of workers')
+    parser.add_argument('--clients', type=int, default=16, help='number of client processes sending requests')
+    options = parser.parse_args(arguments)
+
+    if options.workers:
+        curve = [serving_throughput(int(workers), duration=options.duration, clients=options.clients,
+                                    seed=options.seed) for workers in options.workers.split(',')]
+        print(f"{'workers':>7}  {'requests/s':>10}  (cpu cores: {os.cpu_count()})")
+        for point in curve:
+            print(f"{point['workers']:>7}  {point['requests_per_second']:>10}")
+        if options.output:
+            with open(options.output, 'w', encoding='utf-8') as file:
+                json.dump({'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                                    'cpu_count': os.cpu_count(), 'date': time.strftime('%Y-%m-%dT%H:%M:%S')},
+                           'serving': curve}, file, indent=2)
+        return 0
+
+    results = run_benchmark(iterations=options.iterations, seed=options.seed, name_filter=options.name_filter,
+                            with_api=not options.no_api, with_startup=not options.no_startup)
+    print_results(results)
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    if options.baseline:
+        with open(options.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, threshold=options.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression['name']} {regression['metric']} {regression['baseline']} -> "
+                  f"{regression['current']} (x{regression['ratio']})", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
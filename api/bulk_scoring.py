@@ -0,0 +1,213 @@
+"""
+Bulk scoring | MathQuiz
+
+calculate_score scores the answers of one player in a Python loop. To score again the results of a whole class (e.g.
+with another base_points or decay_rate), the answers of all the players are given in columns (player, subject, correct,
+timeTaken: one row per answer) and all the scores are computed in one NumPy pass, with for each player its total and
+its score in each subject.
+
+The scores are the same as calculate_score: the points of the answers are added in the order of the rows, and the
+players whose score is too close to x.5 to be sure of the rounding (np.exp and math.exp can differ by one ulp) are
+computed again exactly with answer_points.
+
+NumPy is only imported at the first bulk score, so the API starts without it (see main.warm_up).
+"""
+import codecs
+import csv
+from array import array
+from typing import TYPE_CHECKING, AsyncIterable, Iterable, Sequence
+
+from multiple_choice_quiz import answer_points
+
+CSV_COLUMNS = ('player', 'subject', 'correct', 'timeTaken')
+TRUE_VALUES = {'1', 'true', 'True', 'TRUE', 'yes', 'oui'}
+FALSE_VALUES = {'0', 'false', 'False', 'FALSE', 'no', 'non', ''}
+#  A sum closer than this to x.5 is computed again without NumPy
+TIE_TOLERANCE = 1e-6
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class AnswerColumns:
+    def __init__(self):
+        """
+        Answers of several players in compact columns. The names of the players and subjects are replaced by their
+        index (order of first appearance), so a row only costs a few bytes.
+        """
+        self.players: dict[str, int] = {}
+        self.subjects: dict[str, int] = {}
+        self.player = array('l')
+        self.subject = array('l')
+        self.correct = bytearray()
+        self.time_taken = array('d')
+
+    def __len__(self) -> int:
+        return len(self.time_taken)
+
+    def append(self, player: str, subject: str, correct: bool, time_taken: float):
+        self.player.append(self.players.setdefault(player, len(self.players)))
+        self.subject.append(self.subjects.setdefault(subject, len(self.subjects)))
+        self.correct.append(1 if correct else 0)
+        self.time_taken.append(time_taken)
+
+    def extend(self, players: Sequence[str], subjects: Sequence[str], correct: Sequence[bool],
+               time_taken: Sequence[float]):
+        if not len(players) == len(subjects) == len(correct) == len(time_taken):
+            raise ValueError('The columns player, subject, correct and timeTaken must have the same length.')
+        for row in zip(players, subjects, correct, time_taken):
+            self.append(*row)
+
+
+def parse_bool(value: str) -> bool:
+    value = value.strip()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f'{value!r} is not a boolean.')
+
+
+def read_csv_rows(records: Iterable[str], columns: AnswerColumns, header: list[str]) -> None:
+    """
+    Adds the rows of some complete CSV records to the columns.
+    """
+    try:
+        positions = [header.index(name) for name in CSV_COLUMNS]
+    except ValueError:
+        raise ValueError(f'The CSV header must contain the columns {", ".join(CSV_COLUMNS)}.')
+    try:
+        for row in csv.reader(records):
+            if not row:
+                continue
+            if len(row) < len(header):
+                raise ValueError(f'The CSV row {row} has less columns than the header.')
+            player, subject, correct, time_taken = (row[position] for position in positions)
+            columns.append(player, subject, parse_bool(correct), float(time_taken))
+    except csv.Error as error:
+        raise ValueError(f'Invalid CSV ({error}).')
+
+
+def read_csv_header(record: str) -> list[str]:
+    try:
+        return [name.strip() for name in next(csv.reader([record]))]
+    except csv.Error as error:
+        raise ValueError(f'Invalid CSV header ({error}).')
+
+
+def split_records(text: str, pending: list[str], quoted: bool) -> tuple[list[str], bool]:
+    """
+    Cuts some CSV text at the end of its records. A newline in a quoted field doesn't end a record: an odd number of
+    quotes since the start of the record means that the record is inside a quoted field ("" in a field are two quotes).
+
+    :param pending: the beginning of the current record, from the previous texts. It's completed in place.
+    :param quoted: whether the current record is inside a quoted field at the start of the text
+    :return: the complete records (with their newline) and whether the current record is inside a quoted field
+    """
+    records = []
+    *lines, last = text.split('\n')
+    for line in lines:
+        quoted ^= line.count('"') % 2 == 1
+        pending.append(line + '\n')
+        if not quoted:
+            records.append(''.join(pending))
+            pending.clear()
+    if last:
+        quoted ^= last.count('"') % 2 == 1
+        pending.append(last)
+    return records, quoted
+
+
+async def parse_csv_stream(chunks: AsyncIterable[bytes], *, encoding: str = 'utf-8') -> AnswerColumns:
+    """
+    Reads a CSV upload (with a header) chunk by chunk, so only the current chunk, the current record and the compact
+    columns are kept in memory, never the whole text.
+
+    :raise ValueError: if the CSV is invalid, e.g. it ends inside a quoted field
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    columns = AnswerColumns()
+    header = None
+    #  The last record may be cut in the middle (or have a quoted newline), it's completed by the next chunks
+    pending: list[str] = []
+    quoted = False
+    async for chunk in chunks:
+        records, quoted = split_records(decoder.decode(chunk), pending, quoted)
+        if header is None and records:
+            header = read_csv_header(records.pop(0))
+        if records:
+            read_csv_rows(records, columns, header)
+    records, quoted = split_records(decoder.decode(b'', final=True), pending, quoted)
+    if quoted:
+        raise ValueError('The CSV ends inside a quoted field (a closing " is missing).')
+    rest = ''.join(pending)
+    if rest.strip():
+        records.append(rest)
+    if header is None:
+        if not records:
+            return columns
+        header = read_csv_header(records.pop(0))
+    if records:
+        read_csv_rows(records, columns, header)
+    return columns
+
+
+def score_columns(player: 'np.ndarray', subject: 'np.ndarray', correct: 'np.ndarray', time_taken: 'np.ndarray', *,
+                  player_count: int, subject_count: int, base_points: int = 100, decay_rate: float = 0.5
+                  ) -> tuple['np.ndarray', 'np.ndarray']:
+    """
+    :return: (score of each player, score of each player in each subject), not rounded
+    """
+    import numpy as np
+    points = np.where(correct, base_points * np.exp(-decay_rate * time_taken), 0.0)
+    #  np.add.at adds the points in the order of the rows, like calculate_score
+    totals = np.zeros(player_count)
+    np.add.at(totals, player, points)
+    breakdown = np.zeros(player_count * subject_count)
+    np.add.at(breakdown, player * subject_count + subject, points)
+    return totals, breakdown.reshape(player_count, subject_count)
+
+
+def near_tie(values: 'np.ndarray') -> 'np.ndarray':
+    import numpy as np
+    return np.abs(values - np.floor(values) - 0.5) < TIE_TOLERANCE
+
+
+def bulk_score(columns: AnswerColumns, *, base_points: int = 100, decay_rate: float = 0.5) -> dict:
+    """
+    Scores all the players of the columns.
+
+    :return: {player: {'score', 'correct', 'answers', 'subjects': {subject: score}}}
+    """
+    if not len(columns):
+        return {}
+    import numpy as np
+    player = np.frombuffer(columns.player, dtype=f'i{columns.player.itemsize}')
+    subject = np.frombuffer(columns.subject, dtype=f'i{columns.subject.itemsize}')
+    correct = np.frombuffer(columns.correct, dtype=np.uint8).astype(bool)
+    time_taken = np.frombuffer(columns.time_taken, dtype=np.float64)
+    player_count, subject_count = len(columns.players), len(columns.subjects)
+
+    totals, breakdown = score_columns(player, subject, correct, time_taken, player_count=player_count,
+                                      subject_count=subject_count, base_points=base_points, decay_rate=decay_rate)
+    answers = np.bincount(player, minlength=player_count)
+    correct_answers = np.bincount(player, weights=correct, minlength=player_count).astype(int)
+    answered_subjects = np.zeros(player_count * subject_count, dtype=bool)
+    answered_subjects[player * subject_count + subject] = True
+    answered_subjects = answered_subjects.reshape(player_count, subject_count)
+
+    #  Exact computation (same as calculate_score) of the players whose rounding is not sure
+    for player_index in np.flatnonzero(near_tie(totals) | near_tie(breakdown).any(axis=1)):
+        totals[player_index] = 0
+        breakdown[player_index] = 0
+        for row in np.flatnonzero((player == player_index) & correct):
+            points = answer_points(float(time_taken[row]), base_points=base_points, decay_rate=decay_rate)
+            totals[player_index] += points
+            breakdown[player_index, subject[row]] += points
+
+    totals, breakdown = np.round(totals, 0).tolist(), np.round(breakdown, 0).tolist()
+    subject_names = list(columns.subjects)
+    return {name: {'score': totals[index], 'correct': int(correct_answers[index]), 'answers': int(answers[index]),
+                   'subjects': {subject_names[subject_index]: breakdown[index][subject_index]
+                                for subject_index in np.flatnonzero(answered_subjects[index])}}
+            for name, index in columns.players.items()}
@@ -0,0 +1,41 @@
+"""
+Production server | MathQuiz
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Several worker processes (one per core by default), each with its uvicorn event loop. The application is imported
+and warmed up (see main.warm_up) once, in the master process, before the workers are forked: the workers share the
+subjects and the tables copy-on-write and their first request is as fast as the others.
+
+The sessions, rooms, open questions and players are kept in the memory of each worker, so with several workers the
+requests of a quiz session, of a room or of an open question must reach the same worker (sticky load balancing), or
+MATHQUIZ_WORKERS must be 1.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('MATHQUIZ_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('MATHQUIZ_WORKERS', multiprocessing.cpu_count()))
+#  Deprecated by uvicorn in favour of the uvicorn-worker package, which needs a newer uvicorn than the one pinned
+worker_class = 'uvicorn.workers.UvicornWorker'
+#  The application is imported by the master, see on_starting
+preload_app = True
+#  Seconds given to a worker to finish its requests after a SIGTERM or a SIGHUP (graceful restart)
+graceful_timeout = int(os.environ.get('MATHQUIZ_GRACEFUL_TIMEOUT', 30))
+#  A worker that doesn't answer the master for this number of seconds is restarted
+timeout = int(os.environ.get('MATHQUIZ_WORKER_TIMEOUT', 60))
+keepalive = 5
+accesslog = os.environ.get('MATHQUIZ_ACCESS_LOG')  # e.g. "-" for stdout, no access log by default
+
+
+def on_starting(server):
+    """
+    Called in the master process after the application was imported (preload_app) and before the workers are forked.
+    """
+    import main
+    main.warm_up()
+    #  The objects built until now are never freed, the garbage collector doesn't write in them anymore, so their
+    #  memory pages stay shared with the workers instead of being copied by each of them
+    gc.freeze()
+    server.log.info(f'MathQuiz warmed up, starting {server.num_workers} workers')
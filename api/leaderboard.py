@@ -0,0 +1,207 @@
+"""
+Leaderboard | MathQuiz
+
+Ranking of the players of a live game, updated at each answer. The players are kept sorted in an indexable skip list,
+so updating the score of a player or finding its rank costs O(log n) and reading the top k costs O(k), without sorting
+all the players again after each answer.
+
+Each update increases the version of the leaderboard. A client that already has the top k of a version only receives
+the rows that changed since this version instead of the whole list.
+"""
+from collections import OrderedDict
+from itertools import count
+from random import Random
+from typing import Any, Iterator, Optional
+
+from multiple_choice_quiz import answer_points
+
+
+class _Node:
+    __slots__ = ('key', 'value', 'next', 'width')
+
+    def __init__(self, key: Any, value: Any, levels: int):
+        self.key = key
+        self.value = value
+        self.next: list[Optional[_Node]] = [None] * levels
+        #  Number of nodes of the bottom level between this node and the next one (the end of the list counts as one)
+        self.width = [1] * levels
+
+
+class IndexableSkipList:
+    def __init__(self, *, max_levels: int = 24, rng: Optional[Random] = None):
+        """
+        Sorted list of (key, value) where inserting, removing and finding the index of a key cost O(log n).
+
+        :param max_levels: the list stays efficient until about 2 ** max_levels items
+        """
+        self.max_levels = max_levels
+        self.rng = rng if rng is not None else Random()
+        self.head = _Node(None, None, max_levels)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[tuple[Any, Any]]:
+        node = self.head.next[0]
+        while node is not None:
+            yield node.key, node.value
+            node = node.next[0]
+
+    def _random_levels(self) -> int:
+        levels = 1
+        while levels < self.max_levels and self.rng.random() < 0.5:
+            levels += 1
+        return levels
+
+    def _find(self, key: Any) -> tuple[list[_Node], list[int]]:
+        """
+        :return: for each level, the last node before the key and its index (+ 1, the head is at 0)
+        """
+        chain: list[_Node] = [self.head] * self.max_levels
+        positions = [0] * self.max_levels
+        node, position = self.head, 0
+        for level in reversed(range(self.max_levels)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            chain[level], positions[level] = node, position
+        return chain, positions
+
+    def insert(self, key: Any, value: Any = None):
+        chain, positions = self._find(key)
+        levels = self._random_levels()
+        new_node = _Node(key, value, levels)
+        position = positions[0]
+        for level in range(levels):
+            previous = chain[level]
+            new_node.next[level] = previous.next[level]
+            previous.next[level] = new_node
+            new_node.width[level] = previous.width[level] - (position - positions[level])
+            previous.width[level] = position - positions[level] + 1
+        for level in range(levels, self.max_levels):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, key: Any):
+        chain, _ = self._find(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        for level in range(len(node.next)):
+            previous = chain[level]
+            previous.width[level] += node.width[level] - 1
+            previous.next[level] = node.next[level]
+        for level in range(len(node.next), self.max_levels):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def index(self, key: Any) -> int:
+        chain, positions = self._find(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        return positions[0]
+
+    def first(self, k: int) -> list[tuple[Any, Any]]:
+        items = []
+        node = self.head.next[0]
+        while node is not None and len(items) < k:
+            items.append((node.key, node.value))
+            node = node.next[0]
+        return items
+
+
+class Leaderboard:
+    def __init__(self, *, base_points: int = 100, decay_rate: float = 0.5, history: int = 64):
+        """
+        :param base_points: same parameter as calculate_score
+        :param decay_rate: same parameter as calculate_score
+        :param history: number of versions of the top k kept to compute the deltas
+        """
+        self.base_points = base_points
+        self.decay_rate = decay_rate
+        self.history = history
+        self.ranking = IndexableSkipList()
+        #  Key of each player in the skip list: (-score, order of arrival), so the first to reach a score is first
+        self.keys: dict[str, tuple[float, int]] = {}
+        self._arrivals = count()
+        self.version = 0
+        self._snapshots: OrderedDict[tuple[int, int], tuple[tuple[str, float], ...]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.keys
+
+    def add_player(self, name: str):
+        """
+        Adds a player with a score of 0, a player already in the leaderboard keeps its score.
+        """
+        if name not in self.keys:
+            key = self.keys[name] = (-0.0, next(self._arrivals))
+            self.ranking.insert(key, name)
+            self.version += 1
+
+    def remove_player(self, name: str):
+        self.ranking.remove(self.keys.pop(name))
+        self.version += 1
+
+    def score(self, name: str) -> float:
+        return -self.keys[name][0]
+
+    def set_score(self, name: str, score: float):
+        old_key = self.keys[name]
+        self.ranking.remove(old_key)
+        key = self.keys[name] = (-score, old_key[1])
+        self.ranking.insert(key, name)
+        self.version += 1
+
+    def record_answer(self, name: str, correct: bool, time_taken: float) -> float:
+        """
+        Adds the points of an answer (same formula as calculate_score) to the score of a player.
+
+        :return: the new score of the player, not rounded
+        """
+        score = self.score(name)
+        if correct:
+            score += answer_points(time_taken, base_points=self.base_points, decay_rate=self.decay_rate)
+            self.set_score(name, score)
+        return score
+
+    def rank(self, name: str) -> int:
+        """
+        :return: rank of the player, 1 is the first
+        """
+        return self.ranking.index(self.keys[name]) + 1
+
+    def _top(self, k: int) -> tuple[tuple[str, float], ...]:
+        return tuple((name, round(-key[0], 0)) for key, name in self.ranking.first(k))
+
+    def top(self, k: int = 10) -> list[dict]:
+        return [{'rank': rank, 'name': name, 'score': score} for rank, (name, score) in enumerate(self._top(k), 1)]
+
+    def delta(self, since: Optional[int] = None, k: int = 10) -> dict:
+        """
+        Rows of the top k that changed since a version of the leaderboard. If this version is unknown (or None),
+        the whole top k is returned with full=True.
+
+        :return: {'version', 'full', 'changes': [{'rank', 'name', 'score'}], 'removed': [names out of the top k]}
+        """
+        current = self._top(k)
+        self._snapshots[(self.version, k)] = current
+        self._snapshots.move_to_end((self.version, k))
+        while len(self._snapshots) > self.history:
+            self._snapshots.popitem(last=False)
+        previous = self._snapshots.get((since, k)) if since is not None else None
+        if previous is None:
+            return {'version': self.version, 'full': True, 'players': len(self), 'removed': [],
+                    'changes': [{'rank': rank, 'name': name, 'score': score}
+                                for rank, (name, score) in enumerate(current, 1)]}
+        current_names = {name for name, _ in current}
+        return {'version': self.version, 'full': False, 'players': len(self),
+                'removed': [name for name, _ in previous if name not in current_names],
+                'changes': [{'rank': rank, 'name': name, 'score': score}
+                            for rank, (name, score) in enumerate(current, 1)
+                            if rank > len(previous) or previous[rank - 1] != (name, score)]}
@@ -6,21 +6,93 @@ to create npm install on Windows:
 to use npm on Windows:
 > Set-ExecutionPolicy Unrestricted -Scope CurrentUser
 """
+import os
+import importlib
+import secrets
+import asyncio
 import logging
-import uvicorn
-from fastapi import FastAPI
+import orjson
+from contextlib import asynccontextmanager
+from functools import cache
+from fastapi import FastAPI, HTTPException, Response, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, Field
 from fastapi.requests import Request
 from typing import Optional, List, Dict
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 
-from multiple_choice_quiz import generate_mcq_question, calculate_score
+from serialization import (dump_question, dump_quiz, negotiate, pack, unpack, compress_body, JSON, MSGPACK,
+                           MEDIA_TYPES)
+from multiple_choice_quiz import (generate_mcq_question, generate_mcq_batch, calculate_score, list_questions,
+                                  QuestionsMCQ, normalise_subjects, build_question_spaces)
+from open_answer_quiz import generate_question, build_question_tables
+from answer_index import MAX_ANSWER_LENGTH, answer_text, is_accepted
+from question_pool import QuestionPool
+from quiz_session import SessionManager, SessionError, BoundedStore
+from bulk_scoring import AnswerColumns, bulk_score, parse_csv_stream
+from rooms import RoomManager, RoomError, Connection
+from seen_questions import SeenQuestions
+import metrics
+from static_files import StaticSite
 
-app = FastAPI()
 logger = logging.getLogger('uvicorn.error')
 
+#  Questions generated in advance by a background thread, see question_pool.py
+question_pool = QuestionPool(low_watermark=int(os.environ.get('MATHQUIZ_POOL_LOW_WATERMARK', 16)),
+                             high_watermark=int(os.environ.get('MATHQUIZ_POOL_HIGH_WATERMARK', 64)))
+
+
+def warm_up() -> None:
+    """
+    Builds what all the requests share: the subjects of both formats and of the open quiz, the lists of the finite
+    spaces of questions (see question_space), the tables of numbers and angles (see math_tables and unit_circle), the
+    files of the React application and NumPy (used by /api/score/bulk). Nothing of this is done when the module is
+    imported, so the import stays fast.
+    With gunicorn it's called in the master process, before the workers are forked, so they share these objects and
+    don't build them again (see gunicorn.conf.py). Calling it again does nothing more.
+    """
+    for latex in (False, True):
+        build_question_spaces(latex)
+    build_question_tables()
+    get_static_site()
+    importlib.import_module('numpy')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up()
+    #  The web application asks all the subjects by default, in the latex format
+    question_pool.start(keys=[(default_subject(), True)])
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    question_pool.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+#  See /api/ready, True between the startup and the shutdown of the application
+app.state.ready = False
+#  Metrics exported by /metrics, see metrics.py
+app.add_middleware(metrics.MetricsMiddleware)
+QuestionsMCQ.timing_hook = metrics.record_generation
+
+#  Quizzes kept on the server, see quiz_session.py
+quiz_sessions = SessionManager(max_sessions=int(os.environ.get('MATHQUIZ_MAX_SESSIONS', 10_000)),
+                               ttl=float(os.environ.get('MATHQUIZ_SESSION_TTL', 3600)))
+#  Live games, see rooms.py
+rooms = RoomManager(max_rooms=int(os.environ.get('MATHQUIZ_MAX_ROOMS', 1000)),
+                    max_players=int(os.environ.get('MATHQUIZ_MAX_PLAYERS', 1000)))
+#  Questions already asked to each player, so they are not asked again (see seen_questions.py)
+seen_by_player: BoundedStore[SeenQuestions] = BoundedStore(
+    max_items=int(os.environ.get('MATHQUIZ_MAX_TRACKED_PLAYERS', 10_000)),
+    ttl=float(os.environ.get('MATHQUIZ_PLAYER_TTL', 24 * 3600)))
+#  Normalised good answers and expected answer of the open questions not answered yet (see answer_index.py)
+open_questions: BoundedStore[tuple[frozenset, str]] = BoundedStore(
+    max_items=int(os.environ.get('MATHQUIZ_MAX_OPEN_QUESTIONS', 100_000)),
+    ttl=float(os.environ.get('MATHQUIZ_OPEN_QUESTION_TTL', 3600)))
+
+#  Maximum number of questions of a batch, so one request cannot monopolise a worker
+MAX_BATCH_SIZE = int(os.environ.get('MATHQUIZ_MAX_BATCH_SIZE', 50))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow specified origins
@@ -38,6 +110,10 @@ class QuestionData(BaseModel):
     subject: str
 
 
+class QuizData(BaseModel):
+    questions: List[QuestionData]
+
+
 class Answers(BaseModel):
     question_name: str
     subject: str
@@ -56,29 +132,323 @@ def default_subject():
 class ChooseSubject(BaseModel):
     subjects: Optional[List[str]] = Field(default_factory=default_subject)
     latex: Optional[bool] = True
+    #  With a seed, the same question (or quiz) is generated again
+    seed: Optional[int] = None
+    #  Identifier chosen by the client, the questions already asked to this player are not asked again
+    player: Optional[str] = Field(default=None, min_length=1, max_length=64)
+
+
+def seen_questions_of(player: Optional[str]) -> Optional[SeenQuestions]:
+    if player is None:
+        return None
+    seen = seen_by_player.get(player)
+    if seen is None:
+        seen = SeenQuestions()
+        seen_by_player.add(player, seen)
+    return seen
+
+
+def count_subjects(subjects: ChooseSubject):
+    #  Only the known subjects, so the labels of the metric stay bounded
+    for subject in normalise_subjects(subjects.subjects):
+        metrics.subject_requests.inc(subject)
+
+
+def negotiated_response(request: Request, json_body: bytes, *, compress: bool = False) -> Response:
+    """
+    Returns the JSON bytes (already serialized with orjson, not validated again) or their MessagePack version if the
+    client asks for it in the Accept header, compressed with gzip if compress is True and the body is large.
+    """
+    response_format = negotiate(request.headers.get('accept', ''))
+    body = pack(orjson.loads(json_body)) if response_format == MSGPACK else json_body
+    headers = {'Vary': 'Accept, Accept-Encoding' if compress else 'Accept'}
+    if compress:
+        body, content_encoding = compress_body(body, request.headers.get('accept-encoding', ''))
+        if content_encoding is not None:
+            headers['Content-Encoding'] = content_encoding
+    return Response(body, media_type=MEDIA_TYPES[response_format], headers=headers)
 
 
 @app.post('/api/generate', response_model=QuestionData)
-async def generate_a_question(subjects: ChooseSubject):
-    return generate_mcq_question(**subjects.dict())
+async def generate_a_question(subjects: ChooseSubject, request: Request):
+    count_subjects(subjects)
+    if subjects.seed is not None or subjects.player is not None:
+        #  The questions of the pool don't know who will get them, so the questions of a player are generated now
+        question_data = generate_mcq_question(subjects.subjects, latex=subjects.latex, rng=subjects.seed,
+                                              seen=seen_questions_of(subjects.player))
+        return negotiated_response(request, dump_question(question_data))
+    #  The question is already serialized by the pool
+    return negotiated_response(request, question_pool.pop(subjects.subjects, subjects.latex))
+
+
+@app.get('/api/ready')
+async def readiness():
+    """
+    Readiness check of the load balancer or the orchestrator: 200 when this worker can serve the requests.
+    """
+    if not app.state.ready:
+        raise HTTPException(status_code=503, detail='The application is starting or stopping.')
+    return {'ready': True, 'pid': os.getpid()}
+
+
+@app.get('/api/pool/stats')
+async def get_pool_stats():
+    return question_pool.metrics()
+
+
+class ChooseBatch(ChooseSubject):
+    count: Optional[int] = Field(default=20, ge=1)
+    #  Number of questions for each subject, e.g. {"Algebra": 5, "Geometry": 15}. Replaces count.
+    mix: Optional[Dict[str, int]] = None
+
+
+def batch_size(batch: ChooseBatch) -> int:
+    count = sum(max(number, 0) for number in batch.mix.values()) if batch.mix else batch.count
+    if count > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=422, detail=f'A batch cannot have more than {MAX_BATCH_SIZE} questions.')
+    return count
+
+
+@app.post('/api/generate/batch', response_model=QuizData)
+async def generate_a_quiz(batch: ChooseBatch, request: Request):
+    count_subjects(batch)
+    questions = generate_mcq_batch(batch_size(batch), batch.subjects, latex=batch.latex, mix=batch.mix,
+                                   rng=batch.seed, seen=seen_questions_of(batch.player))
+    return negotiated_response(request, dump_quiz(questions), compress=True)
+
+
+class SessionAnswer(BaseModel):
+    index: int
+    answer_index: int
+
+
+@app.post('/api/quiz')
+async def create_a_quiz_session(batch: ChooseBatch):
+    count_subjects(batch)
+    questions = generate_mcq_batch(batch_size(batch), batch.subjects, latex=batch.latex, mix=batch.mix,
+                                   rng=batch.seed, seen=seen_questions_of(batch.player))
+    session_id, session = quiz_sessions.create(questions)
+    return {'session_id': session_id, 'count': len(session)}
+
+
+@app.get('/api/quiz/{session_id}')
+async def get_quiz_session(session_id: str):
+    try:
+        return quiz_sessions.get(session_id).summary()
+    except SessionError as error:
+        raise HTTPException(status_code=error.status_code, detail=str(error))
+
+
+@app.get('/api/quiz/{session_id}/question/{index}')
+async def get_quiz_session_question(session_id: str, index: int):
+    try:
+        return Response(quiz_sessions.get_question(session_id, index), media_type='application/json')
+    except SessionError as error:
+        raise HTTPException(status_code=error.status_code, detail=str(error))
+
+
+@app.post('/api/quiz/{session_id}/answer')
+async def answer_quiz_session_question(session_id: str, answer: SessionAnswer):
+    try:
+        return quiz_sessions.answer(session_id, answer.index, answer.answer_index)
+    except SessionError as error:
+        raise HTTPException(status_code=error.status_code, detail=str(error))
+
+
+class OpenAnswer(BaseModel):
+    question_id: str
+    #  Longer answers are wrong anyway, they are refused before being normalised
+    answer: str = Field(max_length=MAX_ANSWER_LENGTH)
+
+
+@app.post('/api/open/generate')
+async def generate_an_open_question(subjects: ChooseSubject):
+    count_subjects(subjects)
+    question_data = generate_question(subjects.subjects, rng=subjects.seed)
+    question_id = secrets.token_urlsafe(16)
+    #  Only what is needed to check the answer is kept, the accepted answers are already normalised
+    open_questions.add(question_id, (question_data['accepted_answers'], answer_text(question_data['answer'])))
+    return {'question_id': question_id,
+            'question': question_data['question'],
+            'subject': question_data['subject'],
+            'response_type': question_data['response_type']}
+
+
+@app.post('/api/open/verify')
+async def verify_an_open_answer(answer: OpenAnswer):
+    #  A question can be answered only once
+    question = open_questions.pop(answer.question_id)
+    if question is None:
+        raise HTTPException(status_code=404,
+                            detail=f'The question {answer.question_id} does not exist, has expired or was answered.')
+    accepted, expected_answer = question
+    return {'correct': is_accepted(accepted, answer.answer), 'answer': expected_answer}
+
+
+@app.get('/metrics')
+async def get_metrics():
+    return Response(metrics.registry.render(), media_type='text/plain; version=0.0.4')
+
+
+@app.get('/api/questions')
+async def get_available_questions():
+    return list_questions()
 
 
 @app.post('/api/score')
 async def calculate_score_from_meta_data(metaData: MetaData):
     return calculate_score(metaData.dict())
 
-#  Deploy React application from the build
-try:
-    app.mount('/static', StaticFiles(directory="../ui/build/static"), 'static')
-    templates = Jinja2Templates(directory="../ui/build")
-except Exception as e:
-    logger.warning(f'Cannot display react application ({e.__str__()}).')
-else:
+
+@app.post('/api/rooms')
+async def create_a_room(subjects: ChooseSubject):
+    count_subjects(subjects)
+    room = rooms.create(subjects.subjects, latex=subjects.latex, rng=subjects.seed)
+    return {'pin': room.pin, 'host_token': room.host_token}
+
+
+async def serve_connection(websocket: WebSocket, connection: Connection, handle_message):
+    """
+    Sends the messages of the connection (in binary frames, the same bytes for all the players) while the messages
+    of the client are given to handle_message, until the client leaves or is too slow.
+    """
+    async def read():
+        while True:
+            message = await websocket.receive()
+            if message['type'] == 'websocket.disconnect':
+                raise WebSocketDisconnect(message.get('code', 1000))
+            try:
+                #  The clients send JSON in text frames, or MessagePack in binary frames
+                text = message.get('text')
+                handle_message(orjson.loads(text) if text is not None else unpack(message['bytes']))
+            except RoomError as error:
+                connection.push_message({'type': 'error', 'detail': str(error)})
+            except (KeyError, TypeError, ValueError, IndexError) as error:
+                connection.push_message({'type': 'error', 'detail': f'Invalid message ({error!r}).'})
+
+    reader = asyncio.create_task(read())
+    writer = asyncio.create_task(connection.writer())
+    try:
+        await asyncio.wait({reader, writer}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        connection.close()
+        reader.cancel()
+        await asyncio.gather(reader, writer, return_exceptions=True)
+    if not isinstance(reader.exception() if not reader.cancelled() else None, WebSocketDisconnect):
+        #  The client is too slow: it's disconnected
+        try:
+            await websocket.close(code=1008)
+        except RuntimeError:
+            pass
+
+
+@app.websocket('/api/rooms/{pin}/host')
+async def host_a_room(websocket: WebSocket, pin: str, token: str, format: str = JSON):
+    """
+    The host sends {"action": "next"} to send the next question to the players and {"action": "end"} to end the game.
+    The messages are sent in JSON, or in MessagePack with ?format=msgpack.
+    """
+    try:
+        room = rooms.get_host(pin, token)
+    except RoomError as error:
+        await websocket.close(code=4000 + error.status_code, reason=str(error))
+        return
+    await websocket.accept()
+    if room.host is not None:
+        #  The host reconnected (e.g. from another tab): the previous connection is closed by its handler
+        room.host.close()
+    connection = room.host = Connection('host', websocket.send_bytes,
+                                        response_format=MSGPACK if format == MSGPACK else JSON)
+
+    def handle_message(message: dict):
+        if message['action'] == 'next':
+            room.next_question()
+        elif message['action'] == 'end':
+            room.end()
+
+    await serve_connection(websocket, connection, handle_message)
+    if room.host is connection:
+        room.host = None
+    if room.finished:
+        rooms.close(pin)
+
+
+@app.websocket('/api/rooms/{pin}/play')
+async def play_in_a_room(websocket: WebSocket, pin: str, name: str, format: str = JSON):
+    """
+    The player sends {"index": <index of the question>, "answer_index": <index of its answer>} to answer.
+    The messages are sent in JSON, or in MessagePack with ?format=msgpack.
+    """
+    try:
+        room = rooms.get(pin)
+        await websocket.accept()
+        connection = room.join(name, websocket.send_bytes, response_format=MSGPACK if format == MSGPACK else JSON)
+    except RoomError as error:
+        await websocket.close(code=4000 + error.status_code, reason=str(error))
+        return
+
+    def handle_message(message: dict):
+        room.answer(name, message['index'], message['answer_index'])
+
+    try:
+        await serve_connection(websocket, connection, handle_message)
+    finally:
+        room.leave(name)
+
+
+class BulkAnswers(BaseModel):
+    """
+    Answers of several players in columns, one row per answer.
+    """
+    player: List[str]
+    subject: List[str]
+    correct: List[bool]
+    timeTaken: List[float]
+    base_points: int = 100
+    decay_rate: float = 0.5
+
+
+@app.post('/api/score/bulk')
+async def calculate_bulk_score(request: Request, base_points: int = 100, decay_rate: float = 0.5):
+    """
+    Accepts a JSON body (BulkAnswers) or a CSV file (header: player,subject,correct,timeTaken) read as a stream,
+    with base_points and decay_rate in the query.
+    """
+    try:
+        if request.headers.get('content-type', '').startswith('text/csv'):
+            columns = await parse_csv_stream(request.stream())
+        else:
+            answers = BulkAnswers.model_validate_json(await request.body())
+            columns = AnswerColumns()
+            columns.extend(answers.player, answers.subject, answers.correct, answers.timeTaken)
+            base_points, decay_rate = answers.base_points, answers.decay_rate
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    return {'players': bulk_score(columns, base_points=base_points, decay_rate=decay_rate)}
+
+
+@cache
+def get_static_site() -> Optional[StaticSite]:
+    """
+    Reads the build of the React application the first time (see static_files.py), None if there is no build.
+    """
+    try:
+        static_site = StaticSite('../ui/build')
+    except OSError as e:
+        logger.warning(f'Cannot display react application ({e.__str__()}).')
+        return None
     logger.info('React App successfully found running on ["/"]')
+    return static_site
 
-    @app.get('/{rest_of_path:path}', tags=['React App'])
-    async def react_app(req: Request, rest_of_path: str):
-        return templates.TemplateResponse(f'index.html', {'request': req})
+
+#  Deploy React application from the build
+@app.get('/{rest_of_path:path}', tags=['React App'])
+async def react_app(req: Request, rest_of_path: str):
+    static_site = get_static_site()
+    if static_site is None:
+        raise HTTPException(status_code=404, detail='Not Found')
+    return static_site.response('/' + rest_of_path, req.headers)
 
 if __name__ == '__main__':
+    import uvicorn
     uvicorn.run(app)
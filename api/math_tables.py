@@ -0,0 +1,230 @@
+"""
+Math tables | MathQuiz
+
+Tables shared by multiple_choice_quiz and open_answer_quiz. They are computed only once per process and extended
+when a question needs bigger numbers, so the questions don't compute them again at each call. The shared tables are
+empty until the first question that uses them, so importing the quiz modules computes nothing.
+"""
+from math import gcd
+from bisect import bisect_left, bisect_right
+from random import Random
+
+
+class PrimeTable:
+    """
+    Sieve of Eratosthenes up to a bound that grows when we ask for bigger numbers. The prime numbers (and the odd
+    numbers that are not prime) are kept sorted, so an interval is found by bisection.
+    """
+
+    def __init__(self, bound: int = 100):
+        self.bound = 1
+        self.primes: list[int] = []
+        self.odd_non_primes: list[int] = []
+        self.extend(bound)
+
+    def extend(self, bound: int) -> None:
+        """
+        Sieves again up to the bound (at least the double of the current bound, so we don't sieve too often).
+        """
+        if bound <= self.bound:
+            return
+        bound = max(bound, 2 * self.bound)
+        sieve = bytearray([1]) * (bound + 1)
+        sieve[0] = sieve[1] = 0
+        for n in range(2, int(bound ** 0.5) + 1):
+            if sieve[n]:
+                sieve[n * n::n] = bytes(len(range(n * n, bound + 1, n)))
+        #  The new lists replace the old ones in one go, so a reader never sees a table half built
+        self.primes = [n for n in range(2, bound + 1) if sieve[n]]
+        self.odd_non_primes = [n for n in range(1, bound + 1, 2) if not sieve[n]]
+        self.bound = bound
+
+    @staticmethod
+    def _indexes(values: list[int], a: int, b: int) -> tuple[int, int]:
+        return bisect_left(values, a), bisect_right(values, b)
+
+    def is_prime(self, n: int) -> bool:
+        self.extend(n)
+        index = bisect_left(self.primes, n)
+        return index < len(self.primes) and self.primes[index] == n
+
+    def primes_between(self, a: int, b: int) -> list[int]:
+        """
+        returns all the prime numbers of the interval [a; b]
+        """
+        self.extend(b)
+        start, stop = self._indexes(self.primes, a, b)
+        return self.primes[start:stop]
+
+    def odd_non_primes_between(self, a: int, b: int) -> list[int]:
+        """
+        returns all the odd numbers of the interval [a; b] that are not prime numbers
+        """
+        self.extend(b)
+        start, stop = self._indexes(self.odd_non_primes, a, b)
+        return self.odd_non_primes[start:stop]
+
+    def random_prime(self, a: int, b: int, *, rng: Random) -> int:
+        """
+        returns a random prime number of the interval [a; b]
+        """
+        self.extend(b)
+        start, stop = self._indexes(self.primes, a, b)
+        if start >= stop:
+            raise ValueError(f'There is no prime number in the interval [{a}; {b}].')
+        return self.primes[rng.randrange(start, stop)]
+
+    def random_odd_non_prime(self, a: int, b: int, *, rng: Random) -> int:
+        """
+        returns a random odd number of the interval [a; b] that is not a prime number (an even number is too easy)
+        """
+        self.extend(b)
+        start, stop = self._indexes(self.odd_non_primes, a, b)
+        if start >= stop:
+            raise ValueError(f'There is no odd number that is not prime in the interval [{a}; {b}].')
+        return self.odd_non_primes[rng.randrange(start, stop)]
+
+
+class PythagoreanTriples:
+    """
+    All the pythagorean triples (a, b, c) with a < b < c and c under a bound, generated with the Euclid's formula:
+    a = k(m² - n²), b = k(2mn), c = k(m² + n²) with m > n > 0, m and n coprime and not both odd. The triples of an
+    interval of sides are searched only once, then a random triple is just a random index.
+    """
+
+    def __init__(self, bound: int = 50):
+        self.bound = 0
+        self.triples: list[tuple[int, int, int]] = []  # sorted by hypotenuse (the maximum side)
+        self.hypotenuses: list[int] = []
+        self.primitive: set[tuple[int, int, int]] = set()
+        self._intervals: dict[tuple, tuple] = {}
+        self.extend(bound)
+
+    def extend(self, bound: int) -> None:
+        if bound <= self.bound:
+            return
+        bound = max(bound, 2 * self.bound)
+        triples, primitive = [], set()
+        m = 2
+        while m * m + 1 <= bound:
+            for n in range(1, m):
+                c = m * m + n * n
+                if c > bound:
+                    break
+                if (m - n) % 2 == 1 and gcd(m, n) == 1:
+                    a, b = sorted((m * m - n * n, 2 * m * n))
+                    primitive.add((a, b, c))
+                    for k in range(1, bound // c + 1):
+                        triples.append((k * a, k * b, k * c))
+            m += 1
+        triples.sort(key=lambda triple: (triple[2], triple[0]))
+        self.triples, self.primitive, self._intervals = triples, primitive, {}
+        self.hypotenuses = [triple[2] for triple in triples]
+        self.bound = bound
+
+    def triples_between(self, lo: int, hi: int, *, primitive_only: bool = False) -> tuple[tuple[int, int, int], ...]:
+        """
+        returns all the triples with all sides in the interval [lo; hi], sorted like (3, 4, 5), (5, 12, 13), (6, 8, 10)
+        """
+        key = (lo, hi, primitive_only)
+        result = self._intervals.get(key)
+        if result is None:
+            self.extend(hi)
+            candidates = self.triples[:bisect_right(self.hypotenuses, hi)]
+            result = tuple(sorted(triple for triple in candidates if triple[0] >= lo
+                                  and (not primitive_only or triple in self.primitive)))
+            self._intervals[key] = result
+        return result
+
+    def random_triple(self, lo: int, hi: int, *, rng: Random, primitive_only: bool = False) -> tuple[int, int, int]:
+        """
+        returns a random triple with all sides in the interval [lo; hi]
+        """
+        triples = self.triples_between(lo, hi, primitive_only=primitive_only)
+        if not triples:
+            raise ValueError(f'There is no pythagorean triple with all sides in the interval [{lo}; {hi}].')
+        return triples[rng.randrange(len(triples))]
+
+
+class FactorTable:
+    """
+    Smallest prime factor of each integer up to a bound that grows when we ask for bigger numbers, so a number is
+    decomposed in O(log n) divisions. The numbers of an interval with at least k prime factors are also searched only
+    once for each (interval, k).
+    """
+    #  Above this bound, the table would take too much memory, so we use the trial division
+    max_bound = 10_000_000
+
+    def __init__(self, bound: int = 1_000):
+        self.bound = 1
+        self.smallest_prime_factor: list[int] = [0, 1]
+        self._intervals: dict[tuple[int, int, int], tuple[int, ...]] = {}
+        self.extend(bound)
+
+    def extend(self, bound: int) -> None:
+        if bound <= self.bound:
+            return
+        bound = min(max(bound, 2 * self.bound), self.max_bound)
+        smallest_prime_factor = list(range(bound + 1))
+        for n in range(2, int(bound ** 0.5) + 1):
+            if smallest_prime_factor[n] == n:
+                for multiple in range(n * n, bound + 1, n):
+                    if smallest_prime_factor[multiple] == multiple:
+                        smallest_prime_factor[multiple] = n
+        self.smallest_prime_factor = smallest_prime_factor
+        self.bound = bound
+
+    def factorise(self, n: int) -> list[int]:
+        """
+        returns the list of prime numbers decomposing a number, e.g. 40 => [2, 2, 2, 5] and -28 => [-1, 2, 2, 7]
+        """
+        result = []
+        if n == 0:
+            return result
+        elif n < 0:
+            n = abs(n)
+            result.append(-1)
+        if n > self.max_bound:
+            return result + self._trial_division(n)
+        self.extend(n)
+        smallest_prime_factor = self.smallest_prime_factor
+        while n > 1:
+            d = smallest_prime_factor[n]
+            result.append(d)
+            n //= d
+        return result
+
+    @staticmethod
+    def _trial_division(n: int) -> list[int]:
+        result = []
+        d = 2
+        while d * d <= n:
+            while n % d == 0:
+                result.append(d)
+                n //= d
+            d += 1 if d == 2 else 2
+        if n > 1:
+            result.append(n)
+        return result
+
+    def numbers_with_factors(self, a: int, b: int, k: int) -> tuple[int, ...]:
+        """
+        returns the integers of the interval [a; b] with at least k prime factors (counted with their multiplicity)
+        """
+        key = (a, b, k)
+        result = self._intervals.get(key)
+        if result is None:
+            result = self._intervals[key] = tuple(n for n in range(a, b + 1) if len(self.factorise(n)) >= k)
+        return result
+
+    def random_number_with_factors(self, a: int, b: int, k: int, *, rng: Random) -> int:
+        numbers = self.numbers_with_factors(a, b, k)
+        if not numbers:
+            raise ValueError(f'There is no number with {k} prime factors in the interval [{a}; {b}].')
+        return numbers[rng.randrange(len(numbers))]
+
+
+#  Built on first use: each method extends its table up to the numbers it needs
+prime_table = PrimeTable(0)
+factor_table = FactorTable(0)
+pythagorean_triples = PythagoreanTriples(0)
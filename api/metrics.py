@@ -0,0 +1,155 @@
+"""
+Metrics | MathQuiz
+
+Counters and histograms kept in memory and exported in the Prometheus text format by /metrics, without any external
+service. Recording a value is only a bisect and two additions under a lock, so the metrics can always stay enabled.
+
+The requests are measured by MetricsMiddleware (a pure ASGI middleware, so the response is not buffered) and the
+generation of the questions by QuestionsMCQ.timing_hook.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Iterable
+
+#  In seconds, from 10 µs (a simple question) to 1 s
+DEFAULT_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0)
+
+
+def format_labels(label_names: tuple[str, ...], label_values: tuple, extra: str = '') -> str:
+    labels = [f'{name}="{escape_label(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        labels.append(extra)
+    return '{' + ','.join(labels) + '}' if labels else ''
+
+
+def escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for label_values, value in sorted(self.values.items()):
+            yield f'{self.name}{format_labels(self.label_names, label_values)} {value}'
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        #  For each labels: [count of each bucket (not cumulative) + the +Inf bucket, sum]
+        self.values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            counts = self.values.get(label_values)
+            if counts is None:
+                counts = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            counts[0][bisect_left(self.buckets, value)] += 1
+            counts[1] += value
+
+    def samples(self) -> Iterable[str]:
+        for label_values, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                yield f'{self.name}_bucket{format_labels(self.label_names, label_values, le)} {cumulative}'
+            yield f'{self.name}_sum{format_labels(self.label_names, label_values)} {total}'
+            yield f'{self.name}_count{format_labels(self.label_names, label_values)} {cumulative}'
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: dict[str, object] = {}
+
+    def counter(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Counter:
+        metric = self.metrics[name] = Counter(name, documentation, label_names)
+        return metric
+
+    def histogram(self, name: str, documentation: str, label_names: Iterable[str] = (),
+                  buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        metric = self.metrics[name] = Histogram(name, documentation, label_names, buckets)
+        return metric
+
+    def render(self) -> str:
+        """
+        :return: all the metrics in the Prometheus text format (version 0.0.4)
+        """
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+http_requests = registry.counter('mathquiz_http_requests_total', 'Number of HTTP requests.',
+                                 ('method', 'path', 'status'))
+http_request_duration = registry.histogram('mathquiz_http_request_duration_seconds',
+                                           'Time to answer an HTTP request.', ('method', 'path'))
+question_generation_duration = registry.histogram('mathquiz_question_generation_seconds',
+                                                  'Time to generate a question.', ('subject', 'question_name'))
+subject_requests = registry.counter('mathquiz_subject_requests_total',
+                                    'Number of times a subject is asked in a request.', ('subject',))
+
+
+def record_generation(subject: str, question_name: str, seconds: float):
+    """
+    Function given to QuestionsMCQ.timing_hook.
+    """
+    question_generation_duration.observe(seconds, subject, question_name)
+
+
+#  Paths measured by default. Not all the paths, because the paths with an id (quiz sessions, rooms) or the paths of
+#  the React application would give an unbounded number of labels.
+MEASURED_PATHS = ('/api/generate', '/api/generate/batch', '/api/score', '/api/score/bulk', '/api/quiz')
+
+
+class MetricsMiddleware:
+    def __init__(self, app, *, paths: Iterable[str] = MEASURED_PATHS):
+        """
+        Counts and times the HTTP requests of some paths.
+        """
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_request_duration.observe(time.perf_counter() - start, scope['method'], scope['path'])
+            http_requests.inc(scope['method'], scope['path'], status)
@@ -31,10 +31,19 @@ My Personal To Do List:
   - create better test, but I don't see how I can do that
 
 """
-from tqdm import tqdm
-from typing import Optional, Union
-from random import randint, choice, shuffle, choices, random
-from math import ceil, sin, cos, radians, prod, gcd, lcm, floor, exp
+from random import Random
+from time import perf_counter
+from typing import Callable, Iterator, NamedTuple, Optional, Union
+from math import ceil, gcd, lcm, floor, exp
+
+from rng import RandomSource, get_rng
+from math_tables import prime_table, pythagorean_triples, factor_table
+from unit_circle import get_unit_circle
+from sampling import sample_excluding, sample_distinct_excluding, sample_distractors, make_choices
+from question_registry import QuestionEntry, TRUE_OR_FALSE, question, collect_questions, get_cumulative_weights
+from question_templates import compile_sentences
+from question_space import SpaceRow, get_question_space
+from seen_questions import SeenQuestions, draw_unseen
 
 
 pi = 'π'  # or 'pi' if 'π' doesn't work
@@ -54,37 +63,23 @@ class Latex:
     sin = "\\sin"
 
 
+#  Fields of the sentences that only depend on the format (latex or not), they are written in the compiled templates
+FORMAT_CONSTANTS = {
+    False: {'l': '', 'times': 'x', 'delta': 'delta', 'sqrt': '²', 'definition_domain': 'un entier', 'base': '',
+            'base_text': ' binaire'},
+    True: {'l': '$', 'times': Latex.times, 'delta': Latex.delta, 'sqrt': '^2',
+           'definition_domain': f'{Latex.in_set} {Latex.Z}', 'base': '_2', 'base_text': ''},
+}
+
+
 def decomposition_prime_factor(n: int) -> list[int]:
     """
-    script found at :
-    https://www.infinimath.com/espaceeducation/tangenteeducation/articles/TE15/FacteursPremiers.pdf
-    and I modify only a few lines
+    The decomposition uses the table of the smallest prime factors, shared for the whole process (see math_tables).
     :param n: number
     :type; int
     :return: returns the list of prime numbers decomposing a number (n)
     """
-    result = []
-    if n == 0:
-        return []
-    elif n < 0:
-        n = abs(n)
-        result.append(-1)
-    d = 2
-    while n % d == 0:
-        result.append(d)
-        n //= d
-    d = 3
-    while d <= n:
-        while n % d == 0:
-            result.append(d)
-            n //= d
-        d += 2
-    return result
-
-
-assert decomposition_prime_factor(42) == [2, 3, 7]
-assert decomposition_prime_factor(-28) == [-1, 2, 2, 7]
-assert decomposition_prime_factor(0) == []
+    return factor_table.factorise(n)
 
 
 def convert_value_to_latex(value: Union[int, str, float], center: bool = False):
@@ -94,10 +89,6 @@ def convert_value_to_latex(value: Union[int, str, float], center: bool = False):
     return f'${"$" if center else ""}{value}{"$" if center else ""}$'
 
 
-assert convert_value_to_latex(5) == "$5$"
-assert convert_value_to_latex("f(x)=5x+2", center=True) == "$$f(x)=5x+2$$"
-
-
 def convert_degree_into_radian(degree: str, latex: bool = False) -> str:
     """
     return the radian value of a degree angle
@@ -105,7 +96,6 @@ def convert_degree_into_radian(degree: str, latex: bool = False) -> str:
     :param degree: have to end with "°"
     :return: radian value of the angle
     """
-    result: str = ''
     if latex:
         if degree.endswith(Latex.degree):
             value = int(degree[:-len(Latex.degree)])
@@ -117,133 +107,219 @@ def convert_degree_into_radian(degree: str, latex: bool = False) -> str:
             value = int(degree[:-1])
         else:
             raise ValueError(f'The argument "degree" has to end by "°". (degree={degree})')
-    #  simplification :
-    prime_factor_value = decomposition_prime_factor(value)
-    prime_factor_180 = [2, 2, 3, 3, 5]
-    to_remove = []
-    for value in prime_factor_value:
-        if value in prime_factor_180:
-            prime_factor_180.remove(value)
-            to_remove.append(value)
-    if not to_remove:
-        return '0'
-    for item_to_remove in to_remove:
-        prime_factor_value.remove(item_to_remove)
-    product = prod(prime_factor_value)
-    sign = "-" if product < 0 else ""
-    #  case where the product is 1 ou -1, we don't draw 1π or -1π but just π or -π
-    if abs(product) == 1:
-        a = Latex.pi if latex else pi
-    else:
-        a = f"{abs(product)}{Latex.pi if latex else pi}"
-    b = prod(prime_factor_180)
-    if b == 1:
-        return f"{sign}{a}"
-    else:
-        if latex:
-            return f"{sign}{Latex.frac.format(a=a, b=b)}"
-        else:
-            return f"{sign}{a}/{b}"
-
+    #  The simplified fractions of π are computed once per angle (see unit_circle)
+    return get_unit_circle(latex).radian_text(value)
 
-assert convert_degree_into_radian("-50^\\circ", latex=True) == "-\\frac{5\\pi}{18}"
-assert convert_degree_into_radian("-45°", latex=False) == f"-{pi}/4"
 
-
-def generate_number_without_value(interval: tuple = (-10, 10), *, forbidden_value: Union[int, list] = 0) -> int:
+def generate_number_without_value(interval: tuple = (-10, 10), *, forbidden_value: Union[int, list] = 0,
+                                  rng: RandomSource = None) -> int:
     """
     generates a random number from an interval without a specific value. if you don't want to remove value from
     the interval, you just have to put a forbidden value that is not into the interval.
 
     :return: int from the interval
+    :raise ValueError: if the forbidden values are the only possibilities
     """
-    value = randint(min(interval), max(interval))
-    if isinstance(forbidden_value, list) or isinstance(forbidden_value, tuple):
-        #  Check if the forbidden values are the only possibilities
-        #  (this is hard to understand but trust me, easy to make)
-        assert not set([i for i in range(min(interval), max(interval) + 1)]).issubset(set(forbidden_value))
-
-        while value in forbidden_value:
-            value = randint(min(interval), max(interval))
-    elif isinstance(forbidden_value, int):
-        #  We check if the forbidden value is not the only possibilities to the random choice
-        assert not ((min(interval) == forbidden_value) and (max(interval) == forbidden_value))
-        while value == forbidden_value:
-            value = randint(min(interval), max(interval))
-    return value
+    rng = get_rng(rng)
+    forbidden_values = forbidden_value if isinstance(forbidden_value, (list, tuple)) else (forbidden_value,)
+    return sample_excluding(min(interval), max(interval), forbidden_values, rng=rng)
 
 
-def shuffle_a_list(list_of_values: list) -> list:
+def generate_numbers_without_value(interval: tuple, k: int, *, forbidden_value: Union[int, list] = 0,
+                                   rng: RandomSource = None) -> list[int]:
+    """
+    generates k different random numbers from an interval without the forbidden values, e.g. to make the fake answers.
+
+    :return: list of k int from the interval
+    :raise ValueError: if the interval doesn't have k possibilities
+    """
+    rng = get_rng(rng)
+    forbidden_values = forbidden_value if isinstance(forbidden_value, (list, tuple)) else (forbidden_value,)
+    return sample_distinct_excluding(min(interval), max(interval), k, forbidden_values, rng=rng)
+
+
+def shuffle_a_list(list_of_values: list, *, rng: RandomSource = None) -> list:
+    rng = get_rng(rng)
     new_list = list_of_values.copy()
-    shuffle(new_list)
+    rng.shuffle(new_list)
     return new_list
 
 
+class Formatted(NamedTuple):
+    """
+    A value drawn for a question that is written differently in each format, e.g. Formatted('radian', (90,)) is
+    "π/2" or "\\frac{\\pi}{2}". It's only written when the question is rendered (see write_value).
+    """
+    kind: str  # key of VALUE_FORMATS
+    data: tuple
+
+
+class Draw(NamedTuple):
+    """
+    What a "q_" function returns: the values drawn for the fields of its sentence and the suggested answers, in no
+    format.
+    """
+    fields: dict
+    choices: list
+    index_answer: int
+    #  (index of the row, number of rows) if the question was drawn in a listed space (see draw_listed)
+    row: Optional[tuple[int, int]] = None
+
+
+class QuestionSpec(NamedTuple):
+    """
+    A drawn question, in no format. The same spec can be rendered in latex and in text (see render_question), or not
+    rendered at all if only the answer is needed.
+    """
+    subject: str
+    question_name: str
+    sentence: int  # index of the sentence in the templates of the question
+    fields: dict
+    choices: tuple
+    index_answer: int
+    row: Optional[tuple[int, int]] = None  # see Draw, used to know if the question was already seen
+
+
 class QuestionsMCQ:
     """
     This object allows you to pool functions that will be used by all the different subjects, such as the function to
      generate a question. All subjects will be child objects of this object.
+
+    The functions starting with the keyword "q_" are registered once, when the child class is created, in the
+    "questions" table (see question_registry), so we don't have to search them at each draw.
+
+    A "q_" function only draws the values of the question (a Draw). Its sentences are compiled once, when the object
+    is created, for the format of the object, and render() writes the question with them.
      """
+    questions: tuple[QuestionEntry, ...] = ()
+    cumulative_weights: list[float] = []
+    #  Called with (subject, question_name, seconds) after each generated question, e.g. to export metrics
+    timing_hook: Optional[Callable[[str, str, float], None]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.questions = collect_questions(cls)
+        cls.cumulative_weights = get_cumulative_weights(cls.questions)
 
-    def __init__(self, children_object: object):
+    def __init__(self, children_object: object, latex: bool = False):
         self.children_object = children_object
         self.children_object_name = self.children_object.__class__.__name__
+        self.latex: bool = latex
         self.number_of_questions = self.get_number_of_questions()
+        #  The weight of the subject for the draws is the sum of the weights of its questions
+        self.total_weight = self.cumulative_weights[-1] if self.cumulative_weights else 0
+        self.entries: dict[str, QuestionEntry] = {entry.question_name: entry for entry in self.questions}
+        self.templates = {entry.question_name: compile_sentences(entry.sentences, FORMAT_CONSTANTS[latex])
+                          for entry in self.questions}
 
-    def generate(self, shuffle_true_or_false_answer: bool = False) -> dict:
+    def draw_question(self, question_entry: QuestionEntry, *args, rng: RandomSource = None, **kwargs) -> QuestionSpec:
+        """
+        Calls a "q_" function to draw the values of the question, then draws its sentence.
+        """
+        rng = get_rng(rng)
+        drawn = question_entry.call(self.children_object, *args, rng=rng, **kwargs)
+        #  The sentence is drawn after the values (like rng.choice(sentences))
+        sentence = rng.randrange(len(question_entry.sentences))
+        return QuestionSpec(question_entry.subject, question_entry.question_name, sentence, drawn.fields,
+                            tuple(drawn.choices), drawn.index_answer, drawn.row)
+
+    def draw_listed(self, enumerate_rows: Callable[..., Iterator[SpaceRow]], *parameters, rng: RandomSource = None,
+                    fixed_choices: Optional[tuple] = None) -> Optional[Draw]:
         """
-        Searches in the functions of the child object, all functions starting with the keyword "q_" and randomly picks a
-        question. Then returns the result of this function. This makes it possible to make the link and generate a
-        question among all those proposed by the child object.
+        Draws a question in the list of all the questions of its space (see question_space), the list is only built
+        once for each parameters.
 
-        :return: Dictionary with "question", "suggested_answer", "answer" and "subject" keyword
+        :param enumerate_rows: "enumerate_" function of the question, called with the parameters
+        :return: None if the space is too large to be listed, the question has to be drawn by its live generator
+        """
+        space = get_question_space(self.children_object_name, enumerate_rows, *parameters, fixed_choices=fixed_choices)
+        if space is None:
+            return None
+        index, fields, choices, index_answer = space.draw(get_rng(rng))
+        return Draw(fields, choices, index_answer, (index, len(space)))
+
+    def draw(self, shuffle_true_or_false_answer: bool = False, *, rng: RandomSource = None,
+             seen: Optional[SeenQuestions] = None) -> QuestionSpec:
+        """
+        Randomly picks a question in the table of the functions starting with the keyword "q_" of the child object
+        (weighted by the weight of each question), and draws it. Nothing is written, see render().
+
+        :param rng: random.Random object or seed, used for all the random draws of the question
+        :param seen: questions already asked (see seen_questions), a question among them is drawn again (question and
+        values) a few times, and the question drawn is added to them
         """
-        questions_function = []
-        #  list of all functions of the child object
-        for function_name in dir(self.children_object):
-            if function_name.startswith('q_'):
-                #  if this is a function that starts with the keyword "q_", we add the instance of the function
-                #  in the list where we'll randomly choose a function and called it
-                questions_function.append(getattr(self.children_object, function_name))
-        if not questions_function:
+        rng = get_rng(rng)
+        if not self.questions:
             raise ValueError(f"No function that begin by the keyword \"q_\" in the {self.children_object_name} object.")
-        #  We randomly chose a question
-        function_chosen = choice(questions_function)
-        #  And call this function to get the question_data
-        response: dict = function_chosen()
 
-        if shuffle_true_or_false_answer:
+        def draw_once() -> QuestionSpec:
+            #  We randomly chose a question
+            question_chosen = rng.choices(self.questions, cum_weights=self.cumulative_weights)[0]
+            return self.draw_question(question_chosen, rng=rng)
+
+        spec = draw_unseen(draw_once, seen)
+        if shuffle_true_or_false_answer and self.entries[spec.question_name].answer_kind == TRUE_OR_FALSE:
             #  If this is a True or False answer, there are only two elements in the suggested answer list
-            if len(response['suggested_answer']) == 2:
-                answer = response['suggested_answer'][response['index_answer']]
-                response['suggested_answer'] = shuffle_a_list(response['suggested_answer'])
-                response['index_answer'] = response['suggested_answer'].index(answer)
+            answer = spec.choices[spec.index_answer]
+            choices = shuffle_a_list(list(spec.choices), rng=rng)
+            spec = spec._replace(choices=tuple(choices), index_answer=choices.index(answer))
+        return spec
+
+    def render(self, spec: QuestionSpec) -> dict:
+        """
+        Writes a drawn question in the format of the object.
 
-        #  Then we add the subject key
-        response['subject'] = self.children_object_name
-        response['question_name'] = function_chosen.__name__[2:]  #  remove "q_"
+        :return: Dictionary with "question", "index_answer", "suggested_answer", "subject" and "question_name" keyword
+        """
+        latex = self.latex
+        fields = {field: VALUE_FORMATS[value.kind](value.data, latex) if isinstance(value, Formatted) else value
+                  for field, value in spec.fields.items()}
+        choices = [VALUE_FORMATS[choice.kind](choice.data, latex) if isinstance(choice, Formatted) else choice
+                   for choice in spec.choices]
+        if latex and self.entries[spec.question_name].latex_choices:
+            choices = [f'${choice}$' for choice in choices]  # see convert_value_to_latex
+        return {'question': self.templates[spec.question_name][spec.sentence].render(fields),
+                'index_answer': spec.index_answer,
+                'suggested_answer': choices,
+                'subject': spec.subject,
+                'question_name': spec.question_name}
+
+    def generate(self, shuffle_true_or_false_answer: bool = False, *, rng: RandomSource = None,
+                 seen: Optional[SeenQuestions] = None) -> dict:
+        """
+        Draws a question (see draw) and writes it in the format of the object. This makes it possible to make the
+        link and generate a question among all those proposed by the child object.
 
+        :param rng: random.Random object or seed, used for all the random draws of the question
+        :param seen: questions already asked, see draw
+        :return: Dictionary with "question", "suggested_answer", "answer" and "subject" keyword
+        """
+        timing_hook = QuestionsMCQ.timing_hook
+        if timing_hook is None:
+            return self.render(self.draw(shuffle_true_or_false_answer, rng=rng, seen=seen))
+        start = perf_counter()
+        spec = self.draw(shuffle_true_or_false_answer, rng=rng, seen=seen)
+        response = self.render(spec)
+        timing_hook(spec.subject, spec.question_name, perf_counter() - start)
         return response
 
     def get_number_of_questions(self) -> int:
         """
-        Counts the number of functions starting with the keyword "q_". This is mainly for weighted draws.
+        Counts the number of functions starting with the keyword "q_".
         :return: Number of different questions the child object has
         """
-        count = 0
-        for attribute_name in dir(self.children_object):
-            if attribute_name.startswith('q_'):
-                count += 1
-        return count
+        return len(self.questions)
 
 
 #  I split the questions in four math disciplines: Algebra, Arithmetic, Geometry and Trigonometry, so four objects
 
 
 class Algebra(QuestionsMCQ):
+    #  only used if latex format is disable.
+    exponents = ['⁰', '¹', '²', '³', '⁴', '⁵', '⁶', '⁷', '⁸', '⁹']
+
     def __init__(self, latex: bool = False):
-        super().__init__(self)
-        self.latex: bool = latex
+        super().__init__(self, latex)
 
     @staticmethod
     def format_value(coefficient: int, variable: str = "") -> str:
@@ -265,62 +341,76 @@ class Algebra(QuestionsMCQ):
                 coefficient = ''
         return f"{sign}{abs(coefficient) if coefficient else ''}{variable}".strip()
 
-    def format_equation(self, *coefficients: int, shuffle_the_equation: bool = True) -> str:
+    @staticmethod
+    def polynomial_terms(*coefficients: int, shuffle_the_equation: bool = True,
+                         rng: RandomSource = None) -> tuple[tuple[int, int], ...]:
         """
-        Returns the writing of a polynomial expanded by taking as input the coefficients.
-        Actually, this is a kind of format_value() but for a whole equation
+        Returns the terms (coefficient, exponent) of a polynomial in the order they are written, e.g. (2, 0, -1) =>
+        ((2, 2), (0, 1), (-1, 0)) or shuffled.
         """
-        equation = []
-        #  only used if latex format is disable.
-        exponents = ['⁰', '¹', '²', '³', '⁴', '⁵', '⁶', '⁷', '⁸', '⁹']
-
-        for index, coefficient in enumerate(coefficients):
-            exponent = len(coefficients) - 1 - index
+        rng = get_rng(rng)
+        terms = [(coefficient, len(coefficients) - 1 - index) for index, coefficient in enumerate(coefficients)]
+        if shuffle_the_equation:
+            rng.shuffle(terms)
+        return tuple(terms)
 
+    @staticmethod
+    def write_polynomial(terms: tuple[tuple[int, int], ...], latex: bool = False) -> str:
+        """
+        Writes the terms of a polynomial (see polynomial_terms), e.g. ((2, 2), (-1, 0)) => "2x²-1"
+        """
+        equation = []
+        for coefficient, exponent in terms:
             if exponent == 0:
                 variable = ''
             elif exponent == 1:
                 variable = 'x'
+            elif latex:
+                variable = f"x^{exponent}"
             else:
-                variable = 'x'
-                if self.latex:
-                    variable += f"^{exponent}"
-                else:
-                    for number in str(exponent):
-                        variable += exponents[int(number)]
-
-            equation.append(self.format_value(coefficient, variable))
-
-        if shuffle_the_equation:
-            shuffle(equation)
+                variable = 'x' + ''.join(Algebra.exponents[int(number)] for number in str(exponent))
+            equation.append(Algebra.format_value(coefficient, variable))
         equation = ''.join(equation)
-        try:
-            equation = equation[1:] if equation[0] == "+" else equation
-        #  If there is no number in the input of the function
-        except IndexError:
-            pass
+        #  If there is no number in the input of the function, the equation is empty
+        return equation[1:] if equation.startswith("+") else equation
+
+    def polynomial(self, *coefficients: int, shuffle_the_equation: bool = True, rng: RandomSource = None) -> Formatted:
+        """
+        Draws the order of the terms of a polynomial, it is written when the question is rendered.
+        """
+        return Formatted('polynomial', self.polynomial_terms(*coefficients, shuffle_the_equation=shuffle_the_equation,
+                                                             rng=rng))
 
-        return equation
+    def format_equation(self, *coefficients: int, shuffle_the_equation: bool = True,
+                        rng: RandomSource = None) -> str:
+        """
+        Returns the writing of a polynomial expanded by taking as input the coefficients.
+        Actually, this is a kind of format_value() but for a whole equation
+        """
+        return self.write_polynomial(self.polynomial_terms(*coefficients, shuffle_the_equation=shuffle_the_equation,
+                                                           rng=rng), self.latex)
 
     #  Starting questions. I put many arguments in the function, but they are not required.
     #  This is only to manage the "settings" of a question.
+    #  l means latex_format (If latex is equal to true, we add $$ in math formula)
+    @question(sentences=('Quelle est la valeur de {l}x{l} dans {l}{equation}={c}{l} ?',
+                         'Quelle est la solution de {l}{equation}={c}{l} ?',
+                         'Donner l\'antécédent de {l}{c}{l} avec {l}f(x)={equation}{l}.'))
     def q_calculate_antecedent(self, shuffle_the_equation: bool = True, *, a_interval: tuple = (-4, 4),
-                               c_interval: tuple = (-2, 2), x_interval: tuple = (-10, 10)) -> dict:
+                               c_interval: tuple = (-2, 2), x_interval: tuple = (-10, 10),
+                               rng: RandomSource = None) -> Draw:
         """
         Ask the user to found the antecedent of a first degree's function (it's the same as resolve an equation)
         """
+        rng = get_rng(rng)
 
         #  Check if arguments are valid (in this case, if a_interval is equal to (0, 0))
         assert a_interval != (0, 0)
 
-        #  l means latex_format (If latex is equal to true, we add $$ in math formula)
-        sentences = ['Quelle est la valeur de {l}x{l} dans {l}{equation}={c}{l} ?',
-                     'Quelle est la solution de {l}{equation}={c}{l} ?',
-                     'Donner l\'antécédent de {l}{c}{l} avec {l}f(x)={equation}{l}.']
         #  We randomly took a coefficient before the x
-        a = generate_number_without_value(a_interval)
-        x = generate_number_without_value(x_interval)
-        c = generate_number_without_value(c_interval) * a
+        a = generate_number_without_value(a_interval, rng=rng)
+        x = generate_number_without_value(x_interval, rng=rng)
+        c = generate_number_without_value(c_interval, rng=rng) * a
 
         b = int(c - a * x)  # We can put the int method because we know It can't be a float value (c and a*x are int)
 
@@ -330,37 +420,36 @@ class Algebra(QuestionsMCQ):
         if int(a * c + b) != x and a * c + b != -(c + b) / a:
             values.append(int(a * c + b))  # This value is to trap the user if he confuses image and antecedent
         else:
-            generated_value = generate_number_without_value(x_interval, forbidden_value=values)
+            generated_value = generate_number_without_value(x_interval, forbidden_value=values, rng=rng)
             values.append(generated_value)
-        values.append(generate_number_without_value(x_interval, forbidden_value=values))
-        values = shuffle_a_list(values)
+        values.append(generate_number_without_value(x_interval, forbidden_value=values, rng=rng))
+        values = shuffle_a_list(values, rng=rng)
 
-        equation = self.format_equation(a, b, shuffle_the_equation=shuffle_the_equation)
-        return {'question': choice(sentences).format(equation=equation, c=c, l="$" if self.latex else ""),
-                'index_answer': values.index(x),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]
-                }
+        equation = self.polynomial(a, b, shuffle_the_equation=shuffle_the_equation, rng=rng)
+        return Draw(fields={'equation': equation, 'c': c}, choices=values, index_answer=values.index(x))
 
+    @question(sentences=('Combien vaut {l}g({x}){l} avec {l}g(x)={equation}{l} ?',
+                         'Calcule l\'image de {l}{x}{l} dans l\'équation {l}{equation}=y{l}.',
+                         'Donner l\'image de {l}{x}{l} avec {l}f(x)={equation}{l}.'))
     def q_calculate_image(self, shuffle_the_equation: bool = True, *, a_interval: tuple = (-4, 4),
-                          b_interval: tuple = (-6, 6), c_interval: tuple = (-10, 10), x_interval: tuple = (-2, 2)):
+                          b_interval: tuple = (-6, 6), c_interval: tuple = (-10, 10), x_interval: tuple = (-2, 2),
+                          rng: RandomSource = None) -> Draw:
         """
         ask user to calculate the image of a number, in first or second degrees equations
         """
+        rng = get_rng(rng)
         #  Check if the intervals are in the good order (e.g., [5, -5] is not correct but [-5, 5] is)
         assert a_interval == (min(a_interval), max(a_interval)) and b_interval == (min(b_interval), max(b_interval))
         assert c_interval == (min(c_interval), max(c_interval)) and x_interval == (min(x_interval), max(x_interval))
 
-        sentences = ['Combien vaut {l}g({x}){l} avec {l}g(x)={equation}{l} ?',
-                     'Calcule l\'image de {l}{x}{l} dans l\'équation {l}{equation}=y{l}.',
-                     'Donner l\'image de {l}{x}{l} avec {l}f(x)={equation}{l}.']
         #  I do that to have 1 in 2 a chance to get a first degree equation
-        a = choice([0, generate_number_without_value(a_interval)])
-        b = generate_number_without_value(b_interval)
-        c = randint(*c_interval)
+        a = rng.choice([0, generate_number_without_value(a_interval, rng=rng)])
+        b = generate_number_without_value(b_interval, rng=rng)
+        c = rng.randint(*c_interval)
 
-        x = randint(*x_interval)
+        x = rng.randint(*x_interval)
         answer = a * x ** 2 + b * x + c
-        equation: str = self.format_equation(a, b, c, shuffle_the_equation=shuffle_the_equation)
+        equation = self.polynomial(a, b, c, shuffle_the_equation=shuffle_the_equation, rng=rng)
         values = [answer]
         if a == 0:
             min_value = min(b * min(x_interval) + c, b * max(x_interval) + c)
@@ -381,68 +470,68 @@ class Algebra(QuestionsMCQ):
                 min_value = min(a * min(x_interval) ** 2 + b * min(x_interval) + c,
                                 a * max(x_interval) ** 2 + b * max(x_interval) + c)
 
-        for _ in range(3):
-            try:
-                values.append(int(generate_number_without_value((min_value, max_value), forbidden_value=values)))
-            except AssertionError:
-                values.append(
-                    int(generate_number_without_value((min_value - 4, max_value + 4), forbidden_value=values)))
-        values = shuffle_a_list(values)
-        return {'question': choice(sentences).format(equation=equation, x=x, l="$" if self.latex else ""),
-                'index_answer': values.index(answer),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]
-                }
-
-    def q_give_factorisation_form(self, shuffle_the_equation: bool = True) -> dict:
+        try:
+            values += generate_numbers_without_value((min_value, max_value), 3, forbidden_value=values, rng=rng)
+        except ValueError:
+            #  Not enough values in the interval, so we make it bigger
+            values += generate_numbers_without_value((min_value - 4, max_value + 4), 3, forbidden_value=values,
+                                                     rng=rng)
+        values = shuffle_a_list(values, rng=rng)
+        return Draw(fields={'equation': equation, 'x': x}, choices=values, index_answer=values.index(answer))
+
+    @question(sentences=('Quelle est la forme factorisée du polynôme {l}{equation}=y{l}.',
+                         'Donner sous forme de produit {l}f(x)={equation}{l}.'))
+    def q_give_factorisation_form(self, shuffle_the_equation: bool = True, *, rng: RandomSource = None) -> Draw:
         """
         Ask user to found which equation is the factorization form of the polynomial equation.
         E.g., -x²+5x-4 => -(x-1)(x-4)
         :param shuffle_the_equation: if we want to make this problem easier, we just have to turn off this arg
-        :return: Dictionary with the classic keys
+        :return: the values of the question, the suggested answers are the same in both formats
         """
-        sentences = ['Quelle est la forme factorisée du polynôme {l}{equation}=y{l}.',
-                     'Donner sous forme de produit {l}f(x)={equation}{l}.']
+        rng = get_rng(rng)
         factored_equation = '{a}(x{x1})(x{x2})'
-        a = generate_number_without_value((-2, 2))
+        a = generate_number_without_value((-2, 2), rng=rng)
         #  easy root of polynomial equation
-        x1 = generate_number_without_value((-1, 2))
-        x2 = generate_number_without_value((-10, 10), forbidden_value=[i for i in range(-2, 3)])
+        x1 = generate_number_without_value((-1, 2), rng=rng)
+        x2 = generate_number_without_value((-10, 10), forbidden_value=[i for i in range(-2, 3)], rng=rng)
 
         b = -(x1 + x2) * a
         c = x1 * x2 * a
 
-        equation = self.format_equation(a, b, c, shuffle_the_equation=shuffle_the_equation)
-        a_format = self.format_equation(a, 0)[:-1]
-        x1_format, x2_format = shuffle_a_list([self.format_value(-x1), self.format_value(-x2)])
+        equation = self.polynomial(a, b, c, shuffle_the_equation=shuffle_the_equation, rng=rng)
+        #  "ax" without the x, it's written in the same way in both formats
+        a_format = self.format_equation(a, 0, rng=rng)[:-1]
+        x1_format, x2_format = shuffle_a_list([self.format_value(-x1), self.format_value(-x2)], rng=rng)
 
         answer = factored_equation.format(a=a_format, x1=x1_format, x2=x2_format)
 
         values = [answer]
         #  Create fake values
-        a_format = self.format_equation(a * choice([1, -1]), 0)[:-1]
-        fake_x1, fake_x2 = shuffle_a_list([x1, b // (a * x1)])
-        x1_format, x2_format = shuffle_a_list([self.format_value(fake_x1), self.format_value(fake_x2)])
+        a_format = self.format_equation(a * rng.choice([1, -1]), 0, rng=rng)[:-1]
+        fake_x1, fake_x2 = shuffle_a_list([x1, b // (a * x1)], rng=rng)
+        x1_format, x2_format = shuffle_a_list([self.format_value(fake_x1), self.format_value(fake_x2)], rng=rng)
         values.append(factored_equation.format(a=a_format, x1=x1_format, x2=x2_format))
 
-        a_format = self.format_equation(a * choice([1, -1]), 0)[:-1]
-        fake_x1, fake_x2 = shuffle_a_list([x1, x2])
+        a_format = self.format_equation(a * rng.choice([1, -1]), 0, rng=rng)[:-1]
+        fake_x1, fake_x2 = shuffle_a_list([x1, x2], rng=rng)
         x1_format, x2_format = self.format_value(-fake_x1), self.format_value(fake_x2)
         values.append(factored_equation.format(a=a_format, x1=x1_format, x2=x2_format))
 
-        a_format = self.format_equation(a, 0)[:-1]
-        fake_x1, fake_x2 = shuffle_a_list([x1, b // (a * x1)])
+        a_format = self.format_equation(a, 0, rng=rng)[:-1]
+        fake_x1, fake_x2 = shuffle_a_list([x1, b // (a * x1)], rng=rng)
         x1_format, x2_format = self.format_value(-fake_x1), self.format_value(fake_x2)
         values.append(factored_equation.format(a=a_format, x1=x1_format, x2=x2_format))
 
-        values = shuffle_a_list(values)
+        values = shuffle_a_list(values, rng=rng)
 
-        return {'question': choice(sentences).format(equation=equation, l="$" if self.latex else ""),
-                'index_answer': values.index(answer),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]
-                }
+        return Draw(fields={'equation': equation}, choices=values, index_answer=values.index(answer))
 
+    @question(sentences=('Combien vaut le discriminant de {l}{equation}{l}',
+                         'Calcule {l}{delta}{l} dans l\'équation {l}{equation}{l}',
+                         'Le {l}{delta}{l} est égal à combien dans l\'equation {l}{equation}{l}'))
     def q_calculate_discriminant(self, shuffle_the_equation: bool = True, a_interval: tuple = (-4, 4),
-                                 b_interval: tuple = (-6, 6), c_interval: tuple = (-4, 4)) -> dict:
+                                 b_interval: tuple = (-6, 6), c_interval: tuple = (-4, 4), *,
+                                 rng: RandomSource = None) -> Draw:
         """
         Generates a question asking to calculate the discriminant of a quadratic equation.
         E.g., -x² + 5x - 4 => Δ = 5² - 4×(-1)×(-4) = 9
@@ -451,20 +540,18 @@ class Algebra(QuestionsMCQ):
         :param a_interval: Range of possible values for coefficient a, excluding 0.
         :param b_interval: Range of possible values for coefficient b.
         :param c_interval: Range of possible values for coefficient c.
-        :return: A dictionary containing:
-            - 'question': The formatted question statement.
+        :return: A Draw containing:
+            - 'fields': The values of the question statement (the equation).
+            - 'choices': A list of possible answers.
             - 'index_answer': The index of the correct answer in the list of choices.
-            - 'suggested_answer': A list of possible answers, formatted in LaTeX if enabled.
         """
-        sentences = ['Combien vaut le discriminant de {l}{equation}{l}',
-                     'Calcule {l}{delta}{l} dans l\'équation {l}{equation}{l}',
-                     'Le {l}{delta}{l} est égal à combien dans l\'equation {l}{equation}{l}']
+        rng = get_rng(rng)
 
-        a = generate_number_without_value(a_interval, forbidden_value=0)
-        b = generate_number_without_value(b_interval)
-        c = generate_number_without_value(c_interval)
+        a = generate_number_without_value(a_interval, forbidden_value=0, rng=rng)
+        b = generate_number_without_value(b_interval, rng=rng)
+        c = generate_number_without_value(c_interval, rng=rng)
         #  To review this because I'm not sure at all ...
-        equation = self.format_equation(a, b, c, shuffle_the_equation=shuffle_the_equation)
+        equation = self.polynomial(a, b, c, shuffle_the_equation=shuffle_the_equation, rng=rng)
 
         possible_interval = (-4 * max(max(a, c) * max(a, c), min(a, c) * min(a, c)),
                              max(abs(min(b_interval)), abs(max(b_interval))) ** 2 + 4 * max(a_interval) * max(c_interval)
@@ -473,27 +560,51 @@ class Algebra(QuestionsMCQ):
         values = [answer]
         if answer != a**2 - 4 * b * c:
             values.append(a**2 - 4 * b * c)
-        for _ in range(4 - len(values)):
-            values.append(generate_number_without_value(possible_interval, forbidden_value=values))
+        values += generate_numbers_without_value(possible_interval, 4 - len(values), forbidden_value=values, rng=rng)
 
-        return {'question': choice(sentences).format(equation=equation, l="$" if self.latex else "",
-                                                     delta=Latex.delta if self.latex else "delta"),
-                'index_answer': values.index(answer),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]
-                }
+        return Draw(fields={'equation': equation}, choices=values, index_answer=values.index(answer))
 
+    @question(sentences=('Quel est le produit de {l}{n1}{l} par {l}{n2}{l} ?',
+                         'Combien font {l}{n1}{times}{n2}{l} ?',
+                         '{l}{n1}{times}{n2}=?{l}'))
     def q_calcul_product(self, multiplication_tables_interval: tuple = (6, 12),
-                         odds_for_11: Optional[float] = 1 / 6) -> dict:
+                         odds_for_11: Optional[float] = 1 / 6, *, rng: RandomSource = None) -> Draw:
         """
         generates a question about multiplication tables, and offers several answers.
         I try to make the other answers consistent.
-        :return: dictionary with the classic keys
+        :return: the values of the question
         """
+        rng = get_rng(rng)
         assert odds_for_11 is None or 0 < odds_for_11 < 1
-        sentences = ['Quel est le produit de {l}{n1}{l} par {l}{n2}{l} ?',
-                     'Combien font {l}{n1}{times}{n2}{l} ?',
-                     '{l}{n1}{times}{n2}=?{l}']
+        drawn = self.draw_listed(self.enumerate_calcul_product, multiplication_tables_interval, odds_for_11, rng=rng)
+        if drawn is not None:
+            return drawn
         table = range(min(multiplication_tables_interval), max(multiplication_tables_interval))
+        weights = self.multiplication_tables_weights(table, odds_for_11)
+
+        n1 = rng.choices(table, weights=weights)[0]
+        if n1 == 11:
+            #  that why numbers are older if it's the 11 multiplication tables
+            n2 = rng.randint(12, 99)
+        else:
+            n2 = rng.choice(table)
+
+        answer = n1 * n2
+
+        #  The fake values are other products of the same kind: 11 by another number, or two numbers of the tables
+        if n1 == 11:
+            fake_values = (11 * fake_n2 for fake_n2 in range(12, 100))
+        else:
+            low, high = min(multiplication_tables_interval), max(multiplication_tables_interval)
+            fake_values = (fake_n1 * fake_n2 for fake_n1 in range(low, high + 1) if fake_n1 != n1
+                           for fake_n2 in range(low, high + 1))
+        values, index_answer = make_choices(answer, sample_distractors(fake_values, 3, answer=answer, rng=rng),
+                                            rng=rng)
+
+        return Draw(fields={'n1': n1, 'n2': n2}, choices=values, index_answer=index_answer)
+
+    @staticmethod
+    def multiplication_tables_weights(table: range, odds_for_11: Optional[float]) -> list[float]:
         #  There is a technique to calculate the 11 multiplication tables
         if 11 in table and odds_for_11 is not None:
             weights = []
@@ -501,44 +612,30 @@ class Algebra(QuestionsMCQ):
                 weights.append(odds_for_11 if i == 11 else (1 - odds_for_11) / len(table))
         else:
             weights = [i / len(table) for i in table]
+        return weights
 
-        n1 = choices(table, weights=weights)[0]
-        if n1 == 11:
-            #  that why numbers are older if it's the 11 multiplication tables
-            n2 = randint(12, 99)
-        else:
-            n2 = choice(table)
-
-        answer = n1 * n2
-
-        values = [answer]
-        count = ['', '', '']
-        for _ in count:
+    def enumerate_calcul_product(self, multiplication_tables_interval: tuple,
+                                 odds_for_11: Optional[float]) -> Iterator[SpaceRow]:
+        """
+        All the products of q_calcul_product, with the same probabilities.
+        """
+        low, high = min(multiplication_tables_interval), max(multiplication_tables_interval)
+        table = range(low, high)
+        for n1, weight in zip(table, self.multiplication_tables_weights(table, odds_for_11)):
             if n1 == 11:
-                fake_n1 = n1
-                fake_n2 = generate_number_without_value((12, 99), forbidden_value=n2)
-            else:
-                fake_n1 = generate_number_without_value(multiplication_tables_interval, forbidden_value=n1)
-                fake_n2 = generate_number_without_value(multiplication_tables_interval)
-            #  It's a bit slapped together, but it's just to say that we don't want the same value twice.
-            if fake_n1 * fake_n2 in values:
-                count.append('')
+                other_numbers = range(12, 100)
+                candidates = tuple(11 * fake_n2 for fake_n2 in other_numbers)
             else:
-                values.append(fake_n1 * fake_n2)
-
-        values = shuffle_a_list(values)
-
-        return {'question': choice(sentences).format(n1=n1, n2=n2, l="$" if self.latex else "",
-                                                     times=Latex.times if self.latex else "x"),
-                'index_answer': values.index(answer),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]
-                }
+                other_numbers = table
+                candidates = tuple(dict.fromkeys(fake_n1 * fake_n2 for fake_n1 in range(low, high + 1) if fake_n1 != n1
+                                                 for fake_n2 in range(low, high + 1)))
+            for n2 in other_numbers:
+                yield SpaceRow({'n1': n1, 'n2': n2}, n1 * n2, candidates, weight / len(other_numbers))
 
 
 class Arithmetic(QuestionsMCQ):
     def __init__(self, latex: bool = False):
-        super().__init__(self)
-        self.latex = latex
+        super().__init__(self, latex)
 
     @staticmethod
     def all_prime_number_of_an_interval(interval: tuple = (5, 50)) -> list[int]:
@@ -547,100 +644,111 @@ class Arithmetic(QuestionsMCQ):
         """
         #  Check if the interval arg is just a tuple (or list) of two elements, sorted.
         assert interval == (min(interval), max(interval))
-
-        #  Algorithm that we saw in math last year8
-        def is_prime(n: int) -> bool:
-            """
-            say if the number is a prime number or not
-            """
-            #  First check if the number is lower or equal than 1
-            if n <= 1:
-                return False
-            #  We check if we can divide our number by all numbers between 2 and sqrt(n)+1
-            #  2 because every number can be divided by 1, and sqrt(n)+1 because no one number
-            #  greater can divide n, don't need to search more
-            for i in range(2, int(n ** 0.5) + 1):
-                #  If we can divide, this is not a prime number
-                if n % i == 0:
-                    return False
-            #  else, this is a prime number
-            return True
-
-        # All prime numbers in the interval
-        prime_numbers = [num for num in range(min(interval), max(interval) + 1) if is_prime(num)]
-
-        return prime_numbers
-
-    def q_perfect_square(self, interval: tuple = (25, 196)) -> dict:
+        #  The primes are sieved once for the whole process (see math_tables)
+        return prime_table.primes_between(min(interval), max(interval))
+
+    @question(answer_kind=TRUE_OR_FALSE, sentences=(
+        'Le nombre {l}{number_generated}{l} est-il un carré parfait ?',
+        '{l}{number_generated}{l} est-il le carré d\'un nombre entier ?',
+        'Peut-on écrire {l}{number_generated}{l} comme {l}k{sqrt}{l} avec {l}k {definition_domain}{l} ?'))
+    def q_perfect_square(self, interval: tuple = (25, 196), *, rng: RandomSource = None) -> Draw:
         """
         ask if a number is a perfect square or not, the answer is True or False.
         """
-        sentences = ['Le nombre {l}{number_generated}{l} est-il un carré parfait ?',
-                     '{l}{number_generated}{l} est-il le carré d\'un nombre entier ?',
-                     'Peut-on écrire {l}{number_generated}{l} comme {l}k{sqrt}{l} avec {l}k {definition_domain}{l} ?']
+        rng = get_rng(rng)
+        drawn = self.draw_listed(self.enumerate_perfect_square, interval, rng=rng, fixed_choices=(True, False))
+        if drawn is not None:
+            return drawn
         #  list of the perfect square in the interval
-        perfect_square = [number ** 2 for number in range(floor(min(interval) ** 0.5), ceil(max(interval) ** 0.5) + 1)]
+        perfect_square = self.perfect_squares(interval)
         #  I always shuffle but actually it is not necessary
         values = [True, False]
         #  This line decides if the answer is True or False
-        is_perfect_square = choice(values)
+        is_perfect_square = rng.choice(values)
 
         if is_perfect_square:
             #  If the answer is a perfect square, we chose one from the perfect square list
-            number_generated = choice(perfect_square)
+            number_generated = rng.choice(perfect_square)
         else:
             #  else we chose a number in this interval that is not a perfect square
-            number_generated = generate_number_without_value(interval, forbidden_value=perfect_square)
+            number_generated = generate_number_without_value(interval, forbidden_value=perfect_square, rng=rng)
 
-        return {'question': choice(sentences).format(number_generated=number_generated, l="$" if self.latex else "",
-                                                     sqrt='^2' if self.latex else "²",
-                                                     definition_domain=f"{Latex.in_set} {Latex.Z}" if self.latex
-                                                     else "un entier"),
-                'suggested_answer': values,
-                'index_answer': values.index(is_perfect_square)}
+        return Draw(fields={'number_generated': number_generated}, choices=values,
+                    index_answer=values.index(is_perfect_square))
 
-    def q_prime_number(self, interval: tuple = (10, 40)) -> dict:
+    @staticmethod
+    def perfect_squares(interval: tuple) -> list[int]:
+        return [number ** 2 for number in range(floor(min(interval) ** 0.5), ceil(max(interval) ** 0.5) + 1)]
+
+    @staticmethod
+    def true_or_false_rows(fields_name: str, true_numbers: list[int], false_numbers: list[int]) -> Iterator[SpaceRow]:
+        """
+        The rows of a True or False question on a number: the answer is True one time in two, then the number is drawn
+        uniformly among the numbers of the answer. The weights are integers, so the probabilities are exact.
+        """
+        for number in true_numbers:
+            yield SpaceRow({fields_name: number}, True, (), len(false_numbers) or 1)
+        for number in false_numbers:
+            yield SpaceRow({fields_name: number}, False, (), len(true_numbers) or 1)
+
+    def enumerate_perfect_square(self, interval: tuple) -> Iterator[SpaceRow]:
+        perfect_square = self.perfect_squares(interval)
+        numbers = [number for number in range(min(interval), max(interval) + 1) if number not in set(perfect_square)]
+        return self.true_or_false_rows('number_generated', perfect_square, numbers)
+
+    @question(answer_kind=TRUE_OR_FALSE, sentences=(
+        '{l}{number_generated}{l} est-il divisible uniquement par {l}1{l} et lui-même ?',
+        'Peut-on dire que {l}{number_generated}{l} est un nombre premier ?',
+        'Est-ce que {l}{number_generated}{l} est considéré comme un nombre premier ?'))
+    def q_prime_number(self, interval: tuple = (10, 40), *, rng: RandomSource = None) -> Draw:
         """
         ask if a number is a prime number or not.
         """
-        sentences = ['{l}{number_generated}{l} est-il divisible uniquement par {l}1{l} et lui-même ?',
-                     'Peut-on dire que {l}{number_generated}{l} est un nombre premier ?',
-                     'Est-ce que {l}{number_generated}{l} est considéré comme un nombre premier ?']
-
-        prime_number = self.all_prime_number_of_an_interval(interval)
+        rng = get_rng(rng)
+        drawn = self.draw_listed(self.enumerate_prime_number, interval, rng=rng, fixed_choices=(True, False))
+        if drawn is not None:
+            return drawn
         values = [True, False]
-        is_prime = choice(values)
+        is_prime = rng.choice(values)
         if is_prime:
-            number_generated = choice(prime_number)
+            number_generated = prime_table.random_prime(min(interval), max(interval), rng=rng)
         else:
-            number_generated = generate_number_without_value(interval, forbidden_value=prime_number)
             #  We don't want a pair number because this is too easy to see it's not a prime number
-            while number_generated % 2 == 0 and number_generated != 2:
-                number_generated = generate_number_without_value(interval, forbidden_value=prime_number)
+            number_generated = prime_table.random_odd_non_prime(min(interval), max(interval), rng=rng)
 
-        return {'question': choice(sentences).format(number_generated=number_generated, l="$" if self.latex else ""),
-                'suggested_answer': values,
-                'index_answer': values.index(is_prime)}
+        return Draw(fields={'number_generated': number_generated}, choices=values, index_answer=values.index(is_prime))
 
+    @staticmethod
+    def enumerate_prime_number(interval: tuple) -> Iterator[SpaceRow]:
+        return Arithmetic.true_or_false_rows('number_generated',
+                                             prime_table.primes_between(min(interval), max(interval)),
+                                             prime_table.odd_non_primes_between(min(interval), max(interval)))
+
+    @question(sentences=('Trouve le {gcd_or_lcm} entre {l}{n1}{l} et {l}{n2}{l}.',
+                         'Calcule le {gcd_or_lcm} des nombres {l}{n1}{l} et {l}{n2}{l}.',
+                         'Quel est le {gcd_or_lcm} de {l}{n1}{l} et {l}{n2}{l} ?'))
     def q_greatest_lower_common_divisor_multiple(self, interval: tuple = (20, 40),
-                                                 solution_interval: tuple = (2, 6)) -> dict:
+                                                 solution_interval: tuple = (2, 6), *,
+                                                 rng: RandomSource = None) -> Draw:
         """
         ask the greatest common divisor or the lower common multiple of two numbers and suggest several solutions.
         :param interval: interval of the two numbers
         :param solution_interval: to generate "friendly" numbers, I generate number which
         has a common number into this interval
         """
+        rng = get_rng(rng)
         #  Check if the interval is a tuple of two numbers, sorted.
         assert interval == (min(interval), max(interval))
-        sentences = ['Trouve le {gcd_or_lcm} entre {l}{n1}{l} et {l}{n2}{l}.',
-                     'Calcule le {gcd_or_lcm} des nombres {l}{n1}{l} et {l}{n2}{l}.',
-                     'Quel est le {gcd_or_lcm} de {l}{n1}{l} et {l}{n2}{l} ?']
-        gcd_or_lcm = choice([[choice(['plus grand diviseur commmun', 'PGCD']), gcd],
-                             [choice(['plus petit mutliple commmun', 'PPCM']), lcm]])
-        k = generate_number_without_value(solution_interval)  # can't take 0, you will see why
+        drawn = self.draw_listed(self.enumerate_greatest_lower_common_divisor_multiple, interval, solution_interval,
+                                 rng=rng)
+        if drawn is not None:
+            return drawn
+        gcd_or_lcm = rng.choice([[rng.choice(['plus grand diviseur commmun', 'PGCD']), gcd],
+                             [rng.choice(['plus petit mutliple commmun', 'PPCM']), lcm]])
+        k = generate_number_without_value(solution_interval, rng=rng)  # can't take 0, you will see why
 
-        n1 = randint(min(interval) // k, max(interval) // k)
-        n2 = generate_number_without_value((min(interval) // k, max(interval) // k), forbidden_value=n1)
+        n1 = rng.randint(min(interval) // k, max(interval) // k)
+        n2 = generate_number_without_value((min(interval) // k, max(interval) // k), forbidden_value=n1, rng=rng)
 
         answer = gcd_or_lcm[1](n1, n2)
         values = [answer]
@@ -649,24 +757,63 @@ class Arithmetic(QuestionsMCQ):
         while len(values) < 4:
             count += 1
             #  Generate other values
-            fake_n1 = randint(min(interval) // k, max(interval) // k)
-            fake_n2 = generate_number_without_value((min(interval) // k, max(interval) // k), forbidden_value=fake_n1)
+            fake_n1 = rng.randint(min(interval) // k, max(interval) // k)
+            fake_n2 = generate_number_without_value((min(interval) // k, max(interval) // k), forbidden_value=fake_n1,
+                                                    rng=rng)
             fake_value = gcd_or_lcm[1](fake_n1, fake_n2)
             if fake_value not in values:
                 values.append(fake_value)
             elif count > 10:
-                values.append(generate_number_without_value((min(values), max(values) + 4), forbidden_value=values))
+                values.append(generate_number_without_value((min(values), max(values) + 4), forbidden_value=values,
+                                                            rng=rng))
 
-        values = shuffle_a_list(values)
+        values = shuffle_a_list(values, rng=rng)
 
-        return {'question': choice(sentences).format(gcd_or_lcm=gcd_or_lcm[0], n1=n1, n2=n2,
-                                                     l="$" if self.latex else ""),
-                'index_answer': values.index(answer),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]
-                }
+        return Draw(fields={'gcd_or_lcm': gcd_or_lcm[0], 'n1': n1, 'n2': n2}, choices=values,
+                    index_answer=values.index(answer))
 
+    @staticmethod
+    def enumerate_greatest_lower_common_divisor_multiple(interval: tuple,
+                                                         solution_interval: tuple) -> Iterator[SpaceRow]:
+        """
+        All the couples of q_greatest_lower_common_divisor_multiple, with the same probabilities. A couple that can be
+        drawn with several k is only one row (its weight is the sum of the weights).
+        """
+        names = {gcd: ['plus grand diviseur commmun', 'PGCD'], lcm: ['plus petit mutliple commmun', 'PPCM']}
+        pairs_of_k = {}
+        for k in range(min(solution_interval), max(solution_interval) + 1):
+            if k != 0:
+                numbers = range(min(interval) // k, max(interval) // k + 1)
+                pairs_of_k[k] = [(n1, n2) for n1 in numbers for n2 in numbers if n1 != n2]
+        #  k and the couple are drawn uniformly: each couple of k has the weight common_multiple / len(pairs)
+        common_multiple = lcm(*map(len, pairs_of_k.values()))
+        rows = {}
+        for function, function_names in names.items():
+            for pairs in pairs_of_k.values():
+                values = list(dict.fromkeys(function(n1, n2) for n1, n2 in pairs))
+                #  Like the live generator, other numbers are added if there are not enough different values
+                fake_value = max(values) + 1
+                while len(values) < 4:
+                    values.append(fake_value)
+                    fake_value += 1
+                candidates = tuple(values)
+                weight = common_multiple // len(pairs)
+                for name in function_names:
+                    for n1, n2 in pairs:
+                        row = rows.get((name, n1, n2))
+                        if row is None:
+                            rows[name, n1, n2] = SpaceRow({'gcd_or_lcm': name, 'n1': n1, 'n2': n2},
+                                                          function(n1, n2), candidates, weight)
+                        else:
+                            rows[name, n1, n2] = row._replace(weight=row.weight + weight)
+        return iter(rows.values())
+
+    @question(answer_kind=TRUE_OR_FALSE, sentences=(
+        'Le nombre {l}{k}{l} divise-t-il {l}{final_number}{l} ?',
+        '{l}{k}{l} peut-il diviser {l}{final_number}{l} sans laisser de reste ?',
+        '{l}{final_number}{l} est-il divisible par {l}{k}{l} ?'))
     def q_is_divisible_by_a_number(self, interval: tuple = (100, 10_000),
-                                   divisors: tuple = (3, 5, 6, 7, 9, 10, 15)) -> dict:
+                                   divisors: tuple = (3, 5, 6, 7, 9, 10, 15), *, rng: RandomSource = None) -> Draw:
         """
         ask if a number is divisible by another one, using the divisible rules with specific numbers.
         The rule for the number 7 is not famous, but I know the trick :
@@ -685,57 +832,58 @@ class Arithmetic(QuestionsMCQ):
         :param divisors: the numbers for which we can ask if a number is divisible by that one
         :return:
         """
-        sentences = ['Le nombre {l}{k}{l} divise-t-il {l}{final_number}{l} ?',
-                     '{l}{k}{l} peut-il diviser {l}{final_number}{l} sans laisser de reste ?',
-                     '{l}{final_number}{l} est-il divisible par {l}{k}{l} ?']
-
+        rng = get_rng(rng)
         values = [True, False]
-        is_divisible = choice(values)
+        is_divisible = rng.choice(values)
 
-        k = choice(divisors)
+        k = rng.choice(divisors)
         if is_divisible:
             #  divide the interval by k, then multiply by k to be sure to have a multiple of k
-            final_number = k * randint(min(interval) // k, max(interval) // k)
+            final_number = k * rng.randint(min(interval) // k, max(interval) // k)
         else:
-            final_number = randint(min(interval), max(interval))
+            final_number = rng.randint(min(interval), max(interval))
             #  We search for a number that k cannot divide
             while final_number % k == 0:
-                final_number = randint(min(interval), max(interval))
+                final_number = rng.randint(min(interval), max(interval))
 
-        return {'question': choice(sentences).format(final_number=final_number, k=k, l="$" if self.latex else ""),
-                'suggested_answer': values,
-                'index_answer': values.index(is_divisible)}
+        return Draw(fields={'final_number': final_number, 'k': k}, choices=values,
+                    index_answer=values.index(is_divisible))
 
-    def q_convert_bin_to_dec(self, interval: tuple = (5, 32)) -> dict:
+    @question(sentences=("Transforme le nombre {l}{number}{base}{l}{base_text} en nombre décimal.",
+                         "Exprime {l}{number}{base}{l}{base_text} en base {l}10{l}.",
+                         "Convertis {l}{number}{l} du binaire vers le décimal."))
+    def q_convert_bin_to_dec(self, interval: tuple = (5, 32), *, rng: RandomSource = None) -> Draw:
         """
         Ask to convert a binary number to a decimal number
         :param interval: the interval of the values that can be asked
         :return:
         """
-        sentences = ["Transforme le nombre {l}{number}{base}{l}{base_text} en nombre décimal.",
-                     "Exprime {l}{number}{base}{l}{base_text} en base {l}10{l}.",
-                     "Convertis {l}{number}{l} du binaire vers le décimal."]
-        value = randint(*interval)
+        rng = get_rng(rng)
+        drawn = self.draw_listed(self.enumerate_convert_bin_to_dec, interval, rng=rng)
+        if drawn is not None:
+            return drawn
+        value = rng.randint(*interval)
         
-        values = [value]
-        for _ in range(4 - len(values)):
-            values.append(generate_number_without_value(interval, forbidden_value=values))
+        values = [value] + generate_numbers_without_value(interval, 3, forbidden_value=value, rng=rng)
         answer = str(bin(value))[2:]
 
-        values = shuffle_a_list(values)
+        values = shuffle_a_list(values, rng=rng)
+
+        return Draw(fields={'number': answer}, choices=values, index_answer=values.index(value))
 
-        return {'question': choice(sentences).format(number=answer, l="$" if self.latex else "",
-                                                     base="_2" if self.latex else "",
-                                                     base_text="" if self.latex else " binaire"),
-                'index_answer': values.index(value),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]}
+    @staticmethod
+    def enumerate_convert_bin_to_dec(interval: tuple) -> Iterator[SpaceRow]:
+        candidates = tuple(range(min(interval), max(interval) + 1))
+        for value in candidates:
+            yield SpaceRow({'number': bin(value)[2:]}, value, candidates)
 
 
 class Geometry(QuestionsMCQ):
 
     def __init__(self, latex: bool = False):
-        super().__init__(self)
-        self.latex = latex
+        super().__init__(self, latex)
+        #  (interval, sides) -> possible third sides of a scalene triangle, see scalene_third_sides
+        self._scalene_third_sides: dict[tuple, tuple[int, ...]] = {}
         self.prefix = {
                 'shapes': {
                     'pent': 5,
@@ -745,10 +893,10 @@ class Geometry(QuestionsMCQ):
                 },
                 'units': ["kilo", "hecto", "deca", "", "deci", "centi", "milli"]}
         self.degree = f"{Latex.degree}" if latex else "°"
+        #  The sums are written in degrees or in radians when the question is rendered
         self.geometric_shapes_with_their_angles = {
-            'triangle': (f'180{self.degree}', convert_degree_into_radian(f'180{self.degree}', latex=latex)),
-            'carré': (f'360{self.degree}', convert_degree_into_radian(f'360{self.degree}', latex=latex)),
-            'pentagone': (f'540{self.degree}', convert_degree_into_radian(f'540{self.degree}', latex=latex))
+            shape: (Formatted('degree', (angles_sum,)), Formatted('radian', (angles_sum,)))
+            for shape, angles_sum in (('triangle', 180), ('carré', 360), ('pentagone', 540))
         }
 
     @staticmethod
@@ -760,18 +908,8 @@ class Geometry(QuestionsMCQ):
         :return: list of tuple of three items
         """
         assert min(interval) > 0
-        result = []
-        for i in range(min(interval), max(interval) + 1):
-            for j in range(min(interval), max(interval) + 1):
-                if int((i ** 2 + j ** 2) ** 0.5) == (i ** 2 + j ** 2) ** 0.5 and int((i ** 2 + j ** 2) ** 0.5) <= max(
-                        interval):
-                    is_new_triplet = True
-                    for triplet in result:
-                        if min(triplet) == min(i, j) and max(triplet) == int((i ** 2 + j ** 2) ** 0.5):
-                            is_new_triplet = False
-                    if is_new_triplet:  # append only if there isn't already this tuple
-                        result.append((i, j, int((i ** 2 + j ** 2) ** 0.5)))
-        return result
+        #  The triples are generated once for the whole process (see math_tables)
+        return list(pythagorean_triples.triples_between(min(interval), max(interval)))
 
     @staticmethod
     def format_number(number: Union[int, float]) -> str:
@@ -805,166 +943,195 @@ class Geometry(QuestionsMCQ):
         delta = self.prefix['units'].index(target_prefix) - self.prefix['units'].index(source_prefix)
         return source_value * 10 ** delta
 
-    def q_how_many_side(self) -> dict:
-        sentences = ['Combien de côté un {l}{polygone_prefix}agone{l} possède t\'il ?',
-                     'Un {l}{polygone_prefix}agone{l}, c\'est un polygone à combien de coté ?',
-                     'Quel est le nombre de coté d\'un {l}{polygone_prefix}agone{l} ?']
-
-        prefix = choice(list(self.prefix['shapes']))
+    @question(sentences=('Combien de côté un {l}{polygone_prefix}agone{l} possède t\'il ?',
+                         'Un {l}{polygone_prefix}agone{l}, c\'est un polygone à combien de coté ?',
+                         'Quel est le nombre de coté d\'un {l}{polygone_prefix}agone{l} ?'))
+    def q_how_many_side(self, *, rng: RandomSource = None) -> Draw:
+        rng = get_rng(rng)
+        #  The shapes are given to the list, so it's listed again if the table of the object is changed
+        drawn = self.draw_listed(self.enumerate_how_many_side, tuple(self.prefix['shapes'].items()), rng=rng)
+        if drawn is not None:
+            return drawn
+        prefix = rng.choice(list(self.prefix['shapes']))
         answer = self.prefix['shapes'][prefix]
         values = [answer]
 
         min_value = min(list(self.prefix['shapes'].values()))
         max_value = max(list(self.prefix['shapes'].values()))
-        for _ in range(3):
-            values.append(generate_number_without_value((min_value, max_value), forbidden_value=values))
+        values += generate_numbers_without_value((min_value, max_value), 3, forbidden_value=values, rng=rng)
 
-        values = shuffle_a_list(values)
+        values = shuffle_a_list(values, rng=rng)
 
-        return {'question': choice(sentences).format(polygone_prefix=prefix, l="$" if self.latex else ""),
-                'index_answer': values.index(answer),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]}
+        return Draw(fields={'polygone_prefix': prefix}, choices=values, index_answer=values.index(answer))
 
-    def q_angles_sum(self) -> dict:
+    @staticmethod
+    def enumerate_how_many_side(shapes: tuple[tuple[str, int], ...]) -> Iterator[SpaceRow]:
+        #  The fake values are all the numbers between the smallest and the biggest number of sides
+        numbers_of_sides = [number_of_sides for _, number_of_sides in shapes]
+        candidates = tuple(range(min(numbers_of_sides), max(numbers_of_sides) + 1))
+        for prefix, number_of_sides in shapes:
+            yield SpaceRow({'polygone_prefix': prefix}, number_of_sides, candidates)
+
+    @question(sentences=('Quelle est la sommes des angles d\'un {l}{shape}{l}',
+                         'Quel est le résultat de l’addition des angles d’un {l}{shape}{l} ?',
+                         'Que vaut la somme des angles d’un {l}{shape}{l} ?'))
+    def q_angles_sum(self, *, rng: RandomSource = None) -> Draw:
         """
          Creates a multiple-choice question about the sum of angles of a geometric shape.
         """
-        sentences = ['Quelle est la sommes des angles d\'un {l}{shape}{l}',
-                     'Quel est le résultat de l’addition des angles d’un {l}{shape}{l} ?',
-                     'Que vaut la somme des angles d’un {l}{shape}{l} ?']
-        shape_chosen = choice(list(self.geometric_shapes_with_their_angles))
-        answer = choice(self.geometric_shapes_with_their_angles[shape_chosen])
-
-        values = [answer]
-
-        #  Generate fake values
-        while len(values) < 4:
-            fake_shape = choice(list(self.geometric_shapes_with_their_angles))
-            if fake_shape == shape_chosen:
-                continue
-            fake_value = choice(list(self.geometric_shapes_with_their_angles[fake_shape]))
-            if fake_value in values:
-                continue
-            values.append(fake_value)
+        rng = get_rng(rng)
+        drawn = self.draw_listed(self.enumerate_angles_sum, tuple(self.geometric_shapes_with_their_angles.items()),
+                                 rng=rng)
+        if drawn is not None:
+            return drawn
+        shape_chosen = rng.choice(list(self.geometric_shapes_with_their_angles))
+        answer = rng.choice(self.geometric_shapes_with_their_angles[shape_chosen])
+
+        #  The fake values are the sums of the angles of the other shapes (in degrees or radians)
+        fake_values = [value for shape, shape_values in self.geometric_shapes_with_their_angles.items()
+                       if shape != shape_chosen for value in shape_values]
+        values, index_answer = make_choices(answer, sample_distractors(fake_values, 3, answer=answer, rng=rng),
+                                            rng=rng)
+
+        return Draw(fields={'shape': shape_chosen}, choices=values, index_answer=index_answer)
 
-        values = shuffle_a_list(values)
-
-        return {'question': choice(sentences).format(shape=shape_chosen, l="$" if self.latex else ""),
-                'index_answer': values.index(answer),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]
-                }
-
-    def q_triangle_nature(self, interval: tuple = (3, 10), shuffle_answers: bool = True) -> dict:
+    @staticmethod
+    def enumerate_angles_sum(shapes: tuple[tuple[str, tuple[Formatted, ...]], ...]) -> Iterator[SpaceRow]:
+        """
+        Each shape with its sum in degrees or in radians
+        """
+        for shape_chosen, answers in shapes:
+            #  The fake values are the sums of the angles of the other shapes (in degrees or radians)
+            fake_values = tuple(value for shape, shape_values in shapes if shape != shape_chosen
+                                for value in shape_values)
+            for answer in answers:
+                yield SpaceRow({'shape': shape_chosen}, answer, fake_values)
+
+    @question(sentences=(
+        'Détermine la nature du triangle aux côtés {l}{a}{l}, {l}{b}{l}, et {l}{c}{l}.',
+        'À quelle catégorie appartient le triangle avec des côtés de {l}{a}{l}, {l}{b}{l} et {l}{c}{l} ?',
+        'Identifie la nature du triangle ayant pour côtés {l}{a}{l}, {l}{b}{l}, et {l}{c}{l}.'))
+    def q_triangle_nature(self, interval: tuple = (3, 10), shuffle_answers: bool = True, *,
+                          rng: RandomSource = None) -> Draw:
         """
         Generates a multiple-choice question to determine the type of triangle based on its sides.
 
         :param interval: A tuple specifying the range of possible side lengths (default is (3, 10)).
         :param shuffle_answers: If True, shuffle the order of the suggested answers (default is True).
         """
+        rng = get_rng(rng)
         assert interval == (min(interval), max(interval))
-        sentences = ['Détermine la nature du triangle aux côtés {l}{a}{l}, {l}{b}{l}, et {l}{c}{l}.',
-                     'À quelle catégorie appartient le triangle avec des côtés de {l}{a}{l}, {l}{b}{l} et {l}{c}{l} ?',
-                     'Identifie la nature du triangle ayant pour côtés {l}{a}{l}, {l}{b}{l}, et {l}{c}{l}.']
         values = ['rectangle', 'isocèle', 'équilatéral', 'quelconque']
         if shuffle_answers:
-            values = shuffle_a_list(values)
-        answer = choice(values)
+            values = shuffle_a_list(values, rng=rng)
+        answer = rng.choice(values)
 
         if answer == 'rectangle':
-            side = list(choice(self.pythagorean_triplet(interval)))
+            side = list(pythagorean_triples.random_triple(min(interval), max(interval), rng=rng))
         else:
-            side: list = [randint(*interval)]
+            side: list = [rng.randint(*interval)]
             if answer == 'équilatéral':
                 side *= 3
             else:
-                side.append(generate_number_without_value(interval, forbidden_value=side))
+                side.append(generate_number_without_value(interval, forbidden_value=side, rng=rng))
                 if answer == 'isocèle':
-                    side.append(choice(side))
+                    side.append(rng.choice(side))
                 else:
-                    new_side = generate_number_without_value(interval, forbidden_value=side)
-                    side.append(new_side)
-                    side.sort()
-                    while side[0] ** 2 + side[1] ** 2 == side[2] ** 2:
-                        side.remove(new_side)
+                    #  The third side is taken among the ones that don't give a right triangle
+                    side += sample_distractors(self.scalene_third_sides(interval, *side), 1, rng=rng)
 
-                        new_side = generate_number_without_value(interval, forbidden_value=side)
-                        side.append(new_side)
-                        side.sort()
-                        
-        a, b, c = shuffle_a_list(side)
+        a, b, c = shuffle_a_list(side, rng=rng)
 
-        return {'question': choice(sentences).format(a=a, b=b, c=c, l="$" if self.latex else ""),
-                'index_answer': values.index(answer),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]}
+        return Draw(fields={'a': a, 'b': b, 'c': c}, choices=values, index_answer=values.index(answer))
 
-    def q_convert_unit(self) -> dict:
+    def scalene_third_sides(self, interval: tuple, side1: int, side2: int) -> tuple[int, ...]:
+        """
+        All the values of the interval that can be the third side of a triangle with two different sides, so that the
+        three sides are different and don't form a right triangle. Computed once for each couple of sides.
+        """
+        key = (min(interval), max(interval), min(side1, side2), max(side1, side2))
+        third_sides = self._scalene_third_sides.get(key)
+        if third_sides is None:
+            right_triangles = {frozenset(triple) for triple in pythagorean_triples.triples_between(*key[:2])}
+            third_sides = self._scalene_third_sides[key] = tuple(
+                side3 for side3 in range(key[0], key[1] + 1)
+                if side3 not in (side1, side2) and frozenset((side1, side2, side3)) not in right_triangles)
+        return third_sides
+
+    #  The suggested answers are already written with their own latex formulas (see write_quantity)
+    @question(sentences=('Convertis {l}{source_value}{l} {l}{source_unit}{l} en {l}{target_unit}{l}.',
+                         '{l}{source_value}{l} {l}{source_unit}{l} font combien de {l}{target_unit}{l} ?',
+                         'Transforme {l}{source_value}{l} {l}{source_unit}{l} en {l}{target_unit}{l}.'),
+              latex_choices=False)
+    def q_convert_unit(self, *, rng: RandomSource = None) -> Draw:
         """
         generates a question for converting a value between units with proper formatting.
         """
+        rng = get_rng(rng)
         unit_range = (0, len(self.prefix['units']) - 1)
-        sentences = ['Convertis {l}{source_value}{l} {l}{source_unit}{l} en {l}{target_unit}{l}.',
-                     '{l}{source_value}{l} {l}{source_unit}{l} font combien de {l}{target_unit}{l} ?',
-                     'Transforme {l}{source_value}{l} {l}{source_unit}{l} en {l}{target_unit}{l}.']
-        unit = choice(['grammes', 'litres', 'mètres'])
+        unit = rng.choice(['grammes', 'litres', 'mètres'])
 
-        source_value = round(random() * 10, 1)
+        source_value = round(rng.random() * 10, 1)
         #  first, we manipulate index, because this is the easier way to generate random prefix
-        source_unit_index = randint(*unit_range)
-        answer_index = generate_number_without_value(unit_range, forbidden_value=source_unit_index)
-        unit_index_of_fake_value = []
-
-        for _ in range(3):
-            #  Generate 3 others different values
-            unit_index_of_fake_value.append(
-                generate_number_without_value(
-                    unit_range,
-                    forbidden_value=[source_unit_index, answer_index, *unit_index_of_fake_value])
-            )
+        source_unit_index = rng.randint(*unit_range)
+        answer_index = generate_number_without_value(unit_range, forbidden_value=source_unit_index, rng=rng)
+        #  Generate 3 others different values
+        unit_index_of_fake_value = generate_numbers_without_value(unit_range, 3,
+                                                                  forbidden_value=[source_unit_index, answer_index],
+                                                                  rng=rng)
 
         #  we've got all prefix indexes to generate new values, so now we transform index into values with their units.
         source_prefix = self.prefix['units'][source_unit_index]
         answer_prefix = self.prefix['units'][answer_index]
-        latex = '$' if self.latex else ''
 
-        answer = (f"{latex}{self.format_number(self.convert_value_unit(source_value, source_prefix, answer_prefix))}{latex}"
-                  + f" {latex}{answer_prefix}{unit}{latex}")
+        answer = Formatted('quantity', (self.format_number(self.convert_value_unit(source_value, source_prefix,
+                                                                                   answer_prefix)),
+                                        answer_prefix + unit))
         values = [answer]
         for fake_value_index in unit_index_of_fake_value:
             fake_target_prefix = self.prefix['units'][fake_value_index]
             fake_value = self.convert_value_unit(source_value, source_prefix, fake_target_prefix)
-            latex = '$' if self.latex else ''
-            fake_value = f"{latex}{self.format_number(fake_value)}{latex}" + f" {latex}{answer_prefix}{unit}{latex}"
-            values.append(fake_value)
+            values.append(Formatted('quantity', (self.format_number(fake_value), answer_prefix + unit)))
 
-        values = shuffle_a_list(values)
+        values = shuffle_a_list(values, rng=rng)
         source_unit = source_prefix + unit
         target_unit = answer_prefix + unit
-        return {'question': choice(sentences).format(source_value=source_value, source_unit=source_unit,
-                                                     target_unit=target_unit, l="$" if self.latex else ""),
-                'index_answer': values.index(answer),
-                'suggested_answer': values}
+        return Draw(fields={'source_value': source_value, 'source_unit': source_unit, 'target_unit': target_unit},
+                    choices=values, index_answer=values.index(answer))
 
 
 class Trigonometry(QuestionsMCQ):
     def __init__(self, latex: bool = False):
-        super().__init__(self)
-        self.latex = latex
-        self.values_into_str = {0: "0",
-                       0.5: f"{Latex.frac.format(a=1, b=2)}" if self.latex else "1/2",
-                       0.707: f"{Latex.frac.format(a=Latex.sqrt.format(n=2), b=2)}" if self.latex else f'{sqrt.format(number=2)}/2',
-                       0.866: f"{Latex.frac.format(a=Latex.sqrt.format(n=3), b=2)}" if self.latex else f'{sqrt.format(number=3)}/2',
-                       1: '1'}
+        super().__init__(self, latex)
+        #  Exact values (degrees, radians, cos and sin) of the angles, built once per format (see unit_circle)
+        self.unit_circle = get_unit_circle(latex)
         self.relation = {
             'cosinus': 'adjacent/hypothénuse',
             'sinus': 'opposé/hypothénuse',
             'tangente': 'opposé/adjacent'
         }
+        #  All the ratios of two different sides of a right triangle, for the wrong formulas
+        sides = list(dict.fromkeys(side for ratio in self.relation.values() for side in ratio.split('/')))
+        self.side_ratios = [(side1, side2) for side1 in sides for side2 in sides if side1 != side2]
 
         #  "base" angle that we are supposed to know and from which, we can find all the others
         self.degree = f"{Latex.degree}" if latex else "°"
         self.angles_base = [f'0{self.degree}', f'30{self.degree}', f'45{self.degree}', f'60{self.degree}']
-        self.angles = self.get_extended_angles(start=-4, stop=4)
-
+        #  Rows of the unit circle between -360° and 360°
+        self.angle_rows = self.unit_circle.rows
+        self.angles = [row.degree_text for row in self.angle_rows]
+        #  Rows between -180° and 180°, for the conversions
+        self.conversion_rows = self.unit_circle.rows_between(-180, 180)
+        #  All the different values of cos and sin on the unit circle, each one is given by the first angle that has
+        #  this value, so that two equal values are also equal before being written
+        self.trigo_values: dict[str, tuple[Formatted, ...]] = {}
+        self._trigo_value_of_angle: dict[tuple[str, int], Formatted] = {}
+        for function in ('cos', 'sin'):
+            values_of_texts = {}
+            for row in self.angle_rows:
+                value = values_of_texts.setdefault(getattr(row, f'{function}_text'), Formatted(function, (row.degree,)))
+                self._trigo_value_of_angle[function, row.degree] = value
+            self.trigo_values[function] = tuple(values_of_texts.values())
 
     def get_extended_angles(self, *, start: int = -2, stop: int = 2) -> list[str]:
         """
@@ -974,14 +1141,7 @@ class Trigonometry(QuestionsMCQ):
         :param stop: Ending multiplier for 90° (exclusive).
         :return: A list of angles as strings, angles in degrees
         """
-        new_angles = []
-        for i in range(start, stop):
-            for value in self.angles_base:
-                new_angle: str = self.add_angles(value, 90 * i)
-                new_angles.append(new_angle)
-
-        new_angles.append(f'{90 * stop}{self.degree}')
-        return new_angles
+        return [row.degree_text for row in self.unit_circle.rows_between(90 * start, 90 * stop)]
 
     def add_angles(self, angle_degree: str, delta_in_degree: int):
         value = int(angle_degree[:-len(self.degree)])
@@ -989,110 +1149,84 @@ class Trigonometry(QuestionsMCQ):
         value = str(value) + self.degree
         return value
 
-    def q_trigo_formula(self):
-        sentences = [
-            'Dans un triangle rectangle, {determinant} {l}{trigo_function}{l} est-il le rapport entre l\'{l}{side1}{l} et l\'{l}{side2}{l} ?',
-            '{determinant} {l}{trigo_function}{l} d\'un angle est-il égal au rappport {l}{frac}{l} ?'
-        ]
-        trigo_function = choice(list(self.relation))
+    @question(answer_kind=TRUE_OR_FALSE, sentences=(
+        'Dans un triangle rectangle, {determinant} {l}{trigo_function}{l} est-il le rapport entre l\'{l}{side1}{l} et l\'{l}{side2}{l} ?',
+        '{determinant} {l}{trigo_function}{l} d\'un angle est-il égal au rappport {l}{frac}{l} ?'
+    ))
+    def q_trigo_formula(self, *, rng: RandomSource = None) -> Draw:
+        rng = get_rng(rng)
+        trigo_function = rng.choice(list(self.relation))
         values = [True, False]
-        result = choice(values)
+        result = rng.choice(values)
+        good_ratio = tuple(self.relation[trigo_function].split("/"))
         if result:
-            side1, side2 = self.relation[trigo_function].split("/")
+            side1, side2 = good_ratio
         else:
-            while True:
-                possibilities = []
-                for i in self.relation:
-                    side1, side2 = self.relation[i].split("/")
-                    if side1 not in possibilities:
-                        possibilities.append(side1)
-                    if side2 not in possibilities:
-                        possibilities.append(side2)
-                side1 = choice(possibilities)
-                possibilities.remove(side1)
-                side2 = choice(possibilities)
-                #  Check if it's unfortunately the good result.
-                if [side1, side2] != self.relation[trigo_function].split('/'):
-                    break
+            #  Any ratio of two different sides, except the good one
+            side1, side2 = sample_distractors(self.side_ratios, 1, answer=good_ratio, rng=rng)[0]
 
-        sentence = choice(sentences)
         determinant = 'le' if trigo_function in ['sinus', 'cosinus'] else 'la'
-        return {'question': sentence.format(determinant=determinant, trigo_function=trigo_function,
-                                            l="$" if self.latex else "", frac=Latex.frac.format(a=side1, b=side2) if self.latex else f"{side1}/{side2}",
-                                            side1=side1, side2=side2),
-                'index_answer': values.index(result),
-                'suggested_answer': values}
-
-    def q_found_value(self) -> dict:
+        return Draw(fields={'determinant': determinant, 'trigo_function': trigo_function,
+                            'frac': Formatted('frac', (side1, side2)), 'side1': side1, 'side2': side2},
+                    choices=values, index_answer=values.index(result))
+
+    @question(sentences=('Quelle est la valeur de {l}{trigo_function}({value}){l} ?',
+                         'Quelle valeur doit-on attribuer à {l}{trigo_function}({value}){l} ?',
+                         'Quel est le résultat de {l}{trigo_function}({value}){l} dans l’unité cercle ?'))
+    def q_found_value(self, *, rng: RandomSource = None) -> Draw:
         """
         Generates a question about the value of a trigonometric function for a given angle.
         """
-        sentences = ['Quelle est la valeur de {l}{trigo_function}({value}){l} ?',
-                     'Quelle valeur doit-on attribuer à {l}{trigo_function}({value}){l} ?',
-                     'Quel est le résultat de {l}{trigo_function}({value}){l} dans l’unité cercle ?']
-        # Select a trigonometric function and its string representation
-        trigo_function = choice([(cos, Latex.cos if self.latex else 'cos'), (sin, Latex.sin if self.latex else 'sin')])
-        value = choice(self.angles)
-        answer = round(trigo_function[0](radians(int(value[:-len(self.degree)]))), 3)
-        if answer < 0:
-            answer = "-" + self.values_into_str[abs(answer)]
-        else:
-            answer = self.values_into_str[answer]
+        rng = get_rng(rng)
+        # Select a trigonometric function
+        trigo_function = rng.choice(['cos', 'sin'])
+        row = rng.choice(self.angle_rows)
+        answer = self._trigo_value_of_angle[trigo_function, row.degree]
         #  can ask in radian
-        if choice([True, False]):
-            value = convert_degree_into_radian(value, latex=self.latex)
+        value = Formatted('radian' if rng.choice([True, False]) else 'degree', (row.degree,))
 
-        values = [answer]
-        while len(values) < 4:
-            fake_value = choice(self.angles)
-            fake_value = round(trigo_function[0](radians(int(fake_value[:-len(self.degree)]))), 3)
-            if fake_value < 0:
-                fake_value = "-" + self.values_into_str[abs(fake_value)]
-            else:
-                fake_value = self.values_into_str[fake_value]
-            if fake_value in values:  # Avoid duplicates
-                continue
-            values.append(fake_value)
+        #  The fake values are other values that the function takes on the unit circle
+        values, index_answer = make_choices(
+            answer, sample_distractors(self.trigo_values[trigo_function], 3, answer=answer, rng=rng), rng=rng)
 
-        return {'question': choice(sentences).format(trigo_function=trigo_function[1], value=value, l="$" if self.latex else ""),
-                'index_answer': values.index(answer),
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]}
+        return Draw(fields={'trigo_function': Formatted('function', (trigo_function,)), 'value': value},
+                    choices=values, index_answer=index_answer)
 
-    def q_is_the_same_value(self) -> dict:
+    @question(answer_kind=TRUE_OR_FALSE, sentences=(
+        '{l}{angle1}{l} est-il confondu avec {l}{angle2}{l} dans le cerle trigonométrique ?',
+        '{l}{angle1}{l} et {l}{angle2}{l} ont-ils la même position sur le cercle trigo ?',
+        'Peut-on superposer {l}{angle1}{l} et {l}{angle2}{l} dans le cercle trigo d\'unité 1 ?'))
+    def q_is_the_same_value(self, *, rng: RandomSource = None) -> Draw:
         """
             Generates a question about whether two angles are equivalent on the unit circle.
         """
-        sentences = ['{l}{angle1}{l} est-il confondu avec {l}{angle2}{l} dans le cerle trigonométrique ?',
-                     '{l}{angle1}{l} et {l}{angle2}{l} ont-ils la même position sur le cercle trigo ?',
-                     'Peut-on superposer {l}{angle1}{l} et {l}{angle2}{l} dans le cercle trigo d\'unité 1 ?']
-        angle1 = choice(self.angles)
+        rng = get_rng(rng)
+        angle1 = rng.choice(self.angle_rows).degree
         values = [True, False]
-        answer = choice(values)
-        k = randint(-1, 1)
+        answer = rng.choice(values)
+        k = rng.randint(-1, 1)
         while k == 0:
-            k = randint(-1, 1)
+            k = rng.randint(-1, 1)
         if answer:
-            angle2 = self.add_angles(angle1, 360 * k)
+            angle2 = angle1 + 360 * k
         else:
             while True:
-                angle2 = choice(self.angles)
+                angle2 = rng.choice(self.angle_rows).degree
                 if angle1 != angle2:
                     break
         angles = [angle1, angle2]
-        shuffle(angles)
-        angle1, angle2 = angles
-        if choice([True, False]):
-            angle1 = convert_degree_into_radian(angle1, latex=self.latex)
-
-        if choice([True, False]):
-            angle2 = convert_degree_into_radian(angle2, latex=self.latex)
-
-        sentence = choice(sentences)
-        return {'question': sentence.format(angle1=angle1, angle2=angle2, l="$" if self.latex else ""),
-                'index_answer': values.index(answer),
-                'suggested_answer': values}
-
-    def q_convert_value_into_degree_or_radian(self, **kwargs):
+        rng.shuffle(angles)
+        #  Each angle is written in degrees or in radians
+        angle1, angle2 = [Formatted('radian' if rng.choice([True, False]) else 'degree', (angle,))
+                          for angle in angles]
+
+        return Draw(fields={'angle1': angle1, 'angle2': angle2}, choices=values, index_answer=values.index(answer))
+
+    @question(sentences=('{l}{value}{l} correspond à quelle valeur en {l}{unit_target}{l} ?',
+                         'Combien de {l}{unit_target}{l} représente {l}{value}{l} ?',
+                         '{l}{value}{l} donne combien en {l}{unit_target}{l} ?',
+                         'Quelle est l’équivalence exacte en {l}{unit_target}{l} de {l}{value}{l} ?'))
+    def q_convert_value_into_degree_or_radian(self, rng: RandomSource = None, **kwargs) -> Draw:
         """
         Generates a question about converting a value between degrees and radians.
 
@@ -1103,21 +1237,14 @@ class Trigonometry(QuestionsMCQ):
         - Convert the remaining values into the appropriate unit (degrees or radians).
 
         """
-        sentences = ['{l}{value}{l} correspond à quelle valeur en {l}{unit_target}{l} ?',
-                     'Combien de {l}{unit_target}{l} représente {l}{value}{l} ?',
-                     '{l}{value}{l} donne combien en {l}{unit_target}{l} ?',
-                     'Quelle est l’équivalence exacte en {l}{unit_target}{l} de {l}{value}{l} ?']
+        rng = get_rng(rng)
 
-        couple_values = []
-        while len(couple_values) < 4:
-            new_value = choice(self.get_extended_angles())
-            new_value = (new_value, convert_degree_into_radian(new_value, latex=self.latex))
-            if new_value not in couple_values:
-                couple_values.append(new_value)
-        degree_or_radian = randint(0, 1)  # Chose if radian or degree
+        couple_values = [(Formatted('degree', (row.degree,)), Formatted('radian', (row.degree,)))
+                         for row in rng.sample(self.conversion_rows, 4)]
+        degree_or_radian = rng.randint(0, 1)  # Chose if radian or degree
         #  Chose an answer (currently, this is a couple of values)
-        couple_values = shuffle_a_list(couple_values)
-        answer = choice(couple_values)
+        couple_values = shuffle_a_list(couple_values, rng=rng)
+        answer = rng.choice(couple_values)
         #  Get the index of the good answer
         answer_index = -1
         for i, item in enumerate(couple_values):
@@ -1132,12 +1259,104 @@ class Trigonometry(QuestionsMCQ):
 
         unit_target = ('degrés', 'radians')[1 - degree_or_radian]
 
-        return {'question': choice(sentences).format(value=answer, unit_target=unit_target, l="$" if self.latex else ""),
-                'index_answer': answer_index,
-                'suggested_answer': [convert_value_to_latex(value) if self.latex else value for value in values]}
+        return Draw(fields={'value': answer, 'unit_target': unit_target}, choices=values, index_answer=answer_index)
+
+
+def write_quantity(data: tuple[str, str], latex: bool = False) -> str:
+    """
+    (value, unit) => "$value$ $unit$" or "value unit"
+    """
+    l = '$' if latex else ''
+    value, unit = data
+    return f"{l}{value}{l} {l}{unit}{l}"
+
+
+#  How each kind of Formatted value is written, called with (data, latex)
+VALUE_FORMATS: dict[str, Callable[[tuple, bool], str]] = {
+    'polynomial': Algebra.write_polynomial,
+    'degree': lambda data, latex: get_unit_circle(latex).degree_text(data[0]),
+    'radian': lambda data, latex: get_unit_circle(latex).radian_text(data[0]),
+    'cos': lambda data, latex: get_unit_circle(latex).row(data[0]).cos_text,
+    'sin': lambda data, latex: get_unit_circle(latex).row(data[0]).sin_text,
+    'function': lambda data, latex: getattr(Latex, data[0]) if latex else data[0],
+    'frac': lambda data, latex: Latex.frac.format(a=data[0], b=data[1]) if latex else f"{data[0]}/{data[1]}",
+    'quantity': write_quantity,
+}
+
+
+def write_value(value, latex: bool = False):
+    """
+    Writes a value drawn for a question in a format, the values that are not Formatted are returned as they are.
+    """
+    if isinstance(value, Formatted):
+        return VALUE_FORMATS[value.kind](value.data, latex)
+    return value
+
+
+#  The subjects objects are built only once per process (one set for each latex mode), because building them
+#  also builds their tables (angles, radians of the shapes...). A question draw only has to pick in the registry.
+_subjects_registry: dict[bool, dict] = {}
+
+
+def build_subjects_registry(latex: bool = False) -> dict:
+    """
+    Creates the four subjects objects for a latex mode and computes their draw weights (the sum of the weights of
+    the questions of each subject), so we don't have to compute them again at each draw.
+
+    :param latex: If the subjects generate the questions in the latex format
+    :return: Dictionary with the "subjects" (name -> object) and "weights" (name -> weight) keys
+    """
+    #  I link "manually" word with the function that generate question about the math discipline.
+    subjects = {
+        'Arithmetic': Arithmetic(latex=latex),
+        'Trigonometry': Trigonometry(latex=latex),
+        'Geometry': Geometry(latex=latex),
+        'Algebra': Algebra(latex=latex)
+    }
+    weights = {subject_name: subject.total_weight for subject_name, subject in subjects.items()}
+    return {'subjects': subjects, 'weights': weights}
+
+
+def get_subjects_registry(latex: bool = False) -> dict:
+    """
+    Returns the registry of the latex mode, and builds it if this is the first call of the process.
+    """
+    registry = _subjects_registry.get(latex)
+    if registry is None:
+        registry = _subjects_registry[latex] = build_subjects_registry(latex)
+    return registry
+
+
+def rebuild_subjects_registry(latex: Optional[bool] = None) -> None:
+    """
+    Rebuilds the registry of a latex mode (or of both modes if latex is None), e.g. after changing a subject table.
+    """
+    for latex_mode in ([False, True] if latex is None else [latex]):
+        _subjects_registry[latex_mode] = build_subjects_registry(latex_mode)
+
+
+def build_question_spaces(latex: bool = False) -> None:
+    """
+    Draws each question once, with its default parameters, so the lists of the finite spaces of questions (see
+    question_space) and the other tables are built before the first real draw.
+    """
+    rng = Random(0)
+    for subject in get_subjects_registry(latex)['subjects'].values():
+        for entry in subject.questions:
+            entry.call(subject.children_object, rng=rng)
+
+
+def normalise_subjects(subjects: Union[list[str], str] = '*') -> tuple[str, ...]:
+    """
+    Returns the known subjects of the list, in the order of the registry (or all the subjects if there is none). Two
+    lists with the same subjects give the same tuple, so it can be used as a key.
+    """
+    all_subjects = get_subjects_registry()['subjects']
+    return tuple(subject for subject in all_subjects if subject in subjects) or tuple(all_subjects)
 
 
-def generate_mcq_question(subjects: Union[list[str], str] = '*', *, latex: bool = False) -> dict:
+def generate_mcq_question(subjects: Union[list[str], str] = '*', *, latex: bool = False,
+                          rng: RandomSource = None, seen: Optional[SeenQuestions] = None) -> dict:
     """
     This is the main function that will be called everytime.
 
@@ -1149,23 +1368,95 @@ def generate_mcq_question(subjects: Union[list[str], str] = '*', *, latex: bool
     :rtype subjects: list of str or just a str ("*")
     :param latex: If the response is in the latex formula format
     :rtype latex: boolean value, if true, it returns a latex string value
+    :param rng: random.Random object or seed. With the same seed, we get the same question.
+    :param seen: questions already asked to the player (see seen_questions), they are not asked again if possible
     :return: The question in text, the suggestions answer, the index of the good answer and the subject that was chosen.
     """
-    #  I link "manually" word with the function that generate question about the math discipline.
-    all_subjects = {
-        'Arithmetic': Arithmetic(latex=latex),
-        'Trigonometry': Trigonometry(latex=latex),
-        'Geometry': Geometry(latex=latex),
-        'Algebra': Algebra(latex=latex)
-    }
-    subjects = [subject for subject in subjects if subject in all_subjects]
-    if not subjects:
-        subjects = list(all_subjects)
-    k = [all_subjects[subject_name].get_number_of_questions() for subject_name in subjects]
-    random_subject = choices(subjects, weights=k)[0]
+    rng = get_rng(rng)
+    registry = get_subjects_registry(latex)
+    all_subjects = registry['subjects']
+    subjects = normalise_subjects(subjects)
+    k = [registry['weights'][subject_name] for subject_name in subjects]
+    random_subject = rng.choices(subjects, weights=k)[0]
 
     #  returns the dictionary with the following keys "question", "suggested_answer", "index_answer" and "subject"
-    return all_subjects[random_subject].generate()
+    return all_subjects[random_subject].generate(rng=rng, seen=seen)
+
+
+def draw_mcq_question(subjects: Union[list[str], str] = '*', *, rng: RandomSource = None,
+                      seen: Optional[SeenQuestions] = None) -> QuestionSpec:
+    """
+    Draws a question like generate_mcq_question, without writing it. With the same rng, generate_mcq_question gives
+    the rendering of the same question.
+
+    :return: the question in no format, see render_question
+    """
+    rng = get_rng(rng)
+    #  The draws don't depend on the format, so the subjects of any format can draw
+    registry = get_subjects_registry()
+    subjects = normalise_subjects(subjects)
+    k = [registry['weights'][subject_name] for subject_name in subjects]
+    random_subject = rng.choices(subjects, weights=k)[0]
+    return registry['subjects'][random_subject].draw(rng=rng, seen=seen)
+
+
+def render_question(spec: QuestionSpec, latex: bool = False) -> dict:
+    """
+    Writes a drawn question in a format, with the templates compiled for this format. The same spec can be rendered
+    in both formats, e.g. latex for the web application and text for the terminal or the printed answers.
+
+    :return: the same keys as generate_mcq_question
+    """
+    return get_subjects_registry(latex)['subjects'][spec.subject].render(spec)
+
+
+def generate_mcq_batch(count: int = 20, subjects: Union[list[str], str] = '*', *, latex: bool = False,
+                       mix: Optional[dict[str, int]] = None, rng: RandomSource = None,
+                       seen: Optional[SeenQuestions] = None) -> list[dict]:
+    """
+    Generates a whole quiz in one call, with the same subjects objects for all the questions.
+
+    :param count: number of questions, ignored if there is a mix
+    :param subjects: Trigonometry, Arithmetic, Geometry, Algebra or all of these ("*")
+    :param latex: If the response is in the latex formula format
+    :param mix: number of questions for each subject, e.g. {"Algebra": 5, "Geometry": 15}. The unknown subjects are
+    ignored and the order of the subjects is shuffled.
+    :param rng: random.Random object or seed, one generator is used for the whole batch
+    :param seen: questions already asked to the player, by default only the questions of the batch are not repeated
+    :return: list of questions, with the same keys as generate_mcq_question
+    """
+    rng = get_rng(rng)
+    if seen is None:
+        seen = SeenQuestions()
+    registry = get_subjects_registry(latex)
+    all_subjects = registry['subjects']
+    if mix:
+        subjects_drawn = [subject_name for subject_name, number in mix.items() if subject_name in all_subjects
+                          for _ in range(number)]
+        rng.shuffle(subjects_drawn)
+    else:
+        subjects = normalise_subjects(subjects)
+        k = [registry['weights'][subject_name] for subject_name in subjects]
+        #  All the subjects of the quiz are drawn at once
+        subjects_drawn = rng.choices(subjects, weights=k, k=count)
+    return [all_subjects[subject_name].generate(rng=rng, seen=seen) for subject_name in subjects_drawn]
+
+
+def list_questions(subjects: Union[list[str], str] = '*') -> list[dict]:
+    """
+    Returns the metadata (subject, question_name, weight and answer_kind) of all the questions that can be generated.
+    """
+    all_subjects = get_subjects_registry()['subjects']
+    return [entry.metadata() for subject_name in normalise_subjects(subjects)
+            for entry in all_subjects[subject_name].questions]
+
+
+def answer_points(time_taken: float, *, base_points: int = 100, decay_rate: float = 0.5) -> float:
+    """
+    Points of one correct answer given in time_taken seconds (see calculate_score), not rounded.
+    """
+    # La rapidité est récompensée par une décroissance exponentielle :
+    return base_points * exp(-decay_rate * time_taken)
 
 
 def calculate_score(metaData: dict, *, base_points: int = 100, decay_rate: float = 0.5):
@@ -1186,9 +1477,7 @@ def calculate_score(metaData: dict, *, base_points: int = 100, decay_rate: float
     score = 0
     for answer in metaData["answers"].values():
         if answer["correct"]:
-            # La rapidité est récompensée par une décroissance exponentielle :
-            time_bonus = exp(-decay_rate * answer["timeTaken"])
-            score += base_points * time_bonus
+            score += answer_points(answer["timeTaken"], base_points=base_points, decay_rate=decay_rate)
     return round(score, 0)
 
 
@@ -1229,10 +1518,13 @@ def run(number_of_questions: Optional[int] = None, subjects: Union[list[str], st
 
 
 def simple_test():
+    #  Only needed by this test, so it's not imported with the module
+    from tqdm import tqdm
     stats = {}
+    geometry = Geometry(latex=True)
     for _ in tqdm(range(15_000)):
         #  data = generate_mcq_question("*", latex=True)
-        data = Geometry(latex=True).q_triangle_nature()
+        data = geometry.render(geometry.draw_question(geometry.entries['triangle_nature']))
         print(data)
         
         for important_key in ["question", "suggested_answer", "index_answer"]:
@@ -1,71 +1,63 @@
-from random import randint, choice, shuffle, choices
-from math import ceil, log10, sin, cos, radians, prod, gcd, lcm
+from math import ceil, log10, gcd, lcm
+from random import Random
 from time import time
 
+from answer_index import accepted_answers, is_accepted
+from rng import RandomSource, get_rng
+from math_tables import prime_table, pythagorean_triples, factor_table
+from unit_circle import get_unit_circle
+from question_registry import QuestionEntry, TRUE_OR_FALSE, OPEN_ANSWER, question, collect_questions, \
+    get_cumulative_weights
+
 
 def decomposition_prime_factor(n, /) -> list[int]:
     """
     returns the list of prime numbers decomposing a number
 
-    script found at :
-    https://www.infinimath.com/espaceeducation/tangenteeducation/articles/TE15/FacteursPremiers.pdf
-    and I modify only few lines
+    the decomposition uses the table of the smallest prime factors, shared for the whole process (see math_tables)
     :param n:
     :return:
     """
-    result = []
-
-    if n == 0:
-        return []
-    elif n < 0:
-        n = abs(n)
-        result.append(-1)
-    d = 2
-    while n % d == 0:
-        result.append(d)
-        n //= d
-
-    d = 3
-    while d <= n:
-        while n % d == 0:
-            result.append(d)
-            n //= d
-        d += 2
-    return result
-
-
-assert decomposition_prime_factor(40) == [2, 2, 2, 5]
-assert decomposition_prime_factor(-28) == [-1, 2, 2, 7]
+    return factor_table.factorise(n)
 
 
 class Questions:
     """
     This object allows you to pool functions that will be used by all the different subjects, such as the function to
      generate a question. All subjects will be child objects of this object.
+
+    The functions starting with the keyword "q_" are registered once, when the child class is created, in the
+    "questions" table (see question_registry).
      """
+    questions: tuple[QuestionEntry, ...] = ()
+    cumulative_weights: list[float] = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.questions = collect_questions(cls, default_answer_kind=OPEN_ANSWER)
+        cls.cumulative_weights = get_cumulative_weights(cls.questions)
 
     def __init__(self, child: object) -> None:
         self.clr = child
 
-    def generate(self) -> dict:
+    def generate(self, *, rng: RandomSource = None) -> dict:
         """
-        searches in the functions of the child object, all functions starting with the keyword "q_" and randomly picks a
-        question. Then returns the result of this function. This makes it possible to make the link and generate a
+        randomly picks a question in the table of the functions starting with the keyword "q_" of the child object.
+        Then returns the result of this function. This makes it possible to make the link and generate a
         question among all those proposed by the child object.
 
-        :return: dictionary with "question", "answer", "other answer" and "subject" keys
+        :param rng: random.Random object or seed, used for all the random draws of the question
+        :return: dictionary with "question", "answer", "other answer", "subject", "response_type" and
+        "accepted_answers" (the normalised good answers, see answer_index) keys
         """
-        questions = []
-        for attribute_name in dir(self.clr):
-            attribute = getattr(self.clr, attribute_name)
-            if callable(attribute) and not attribute_name.startswith("__") and attribute_name.startswith('q_'):
-                questions.append([attribute, attribute_name])
-        if not questions:
+        rng = get_rng(rng)
+        if not self.questions:
             dict_response = {'question': f'({self.clr.__class__.__name__}) No function begin with "q_".',
                              'answer': ''}
         else:
-            function, function_name = choice(questions)
-            dict_response = function()
+            question_chosen = rng.choices(self.questions, cum_weights=self.cumulative_weights)[0]
+            function_name = 'q_' + question_chosen.question_name
+            dict_response = question_chosen.call(self.clr, rng=rng)
             try:
                 if dict_response.get('question') is None:
                     dict_response = {
@@ -84,19 +76,16 @@ class Questions:
                 }
         dict_response['subject'] = self.clr.__class__.__name__
         dict_response['response_type'] = type(dict_response['answer']).__name__
+        dict_response['accepted_answers'] = accepted_answers(dict_response['answer'],
+                                                             dict_response.get('others_answers'))
         return dict_response
 
     def get_number_of_questions(self) -> int:
         """
-        Counts the number of functions starting with the keyword "q_". This is mainly for weighted draws.
+        Counts the number of functions starting with the keyword "q_".
         :return: number of different questions the child object has
         """
-        count = 0
-        for attribute_name in dir(self.clr):
-            attribute = getattr(self.clr, attribute_name)
-            if callable(attribute) and not attribute_name.startswith("__") and attribute_name.startswith('q_'):
-                count += 1
-        return count
+        return len(self.questions)
 
 
 class Algebra(Questions):
@@ -119,10 +108,12 @@ class Algebra(Questions):
                 coefficient = ''
         return f"{sign}{abs(coefficient) if coefficient else ''}{variable}".strip()
 
-    def format_equation(self, *coefficients: int, shuffle_the_equation: bool = True) -> str:
+    def format_equation(self, *coefficients: int, shuffle_the_equation: bool = True,
+                        rng: RandomSource = None) -> str:
         """
         returns the writing of a polynomial expanded by taking as input the coefficients
         """
+        rng = get_rng(rng)
         equation = []
         exponents = ['⁰', '¹', '²', '³', '⁴', '⁵', '⁶', '⁷', '⁸', '⁹']
 
@@ -141,7 +132,7 @@ class Algebra(Questions):
             equation.append(self.format_value(coefficient, variable))
 
         if shuffle_the_equation:
-            shuffle(equation)
+            rng.shuffle(equation)
         equation = ''.join(equation)
         try:
             equation = equation[1:] if equation[0] == "+" else equation
@@ -151,7 +142,7 @@ class Algebra(Questions):
         return equation
 
     def q_simple_equation(self, shuffle_the_equation: bool = True, *, a_interval: tuple = (-4, 4),
-                          x_interval: tuple = (-10, 10), c_interval: tuple = (-2, 2)) -> dict:
+                          x_interval: tuple = (-10, 10), c_interval: tuple = (-2, 2), rng: RandomSource = None) -> dict:
         """
         Asks questions about degree one equation, such as :
         ax + b = c
@@ -160,95 +151,100 @@ class Algebra(Questions):
         and c € [
         :return:
         """
+        rng = get_rng(rng)
         assert a_interval != (0, 0)
         sentences = ['Quelle est la valeur de x dans {equation}={c}',
                      'Quelle est la solution de {equation}={c}',
                      'Donner l\'antécédent de {c} avec f(x)={equation}']
-        a = randint(min(a_interval), max(a_interval))
+        a = rng.randint(min(a_interval), max(a_interval))
         while a == 0:
-            a = randint(min(a_interval), max(a_interval))
-        x = randint(min(x_interval), max(x_interval))
+            a = rng.randint(min(a_interval), max(a_interval))
+        x = rng.randint(min(x_interval), max(x_interval))
         while x == 0:
-            x = randint(min(x_interval), max(x_interval))
+            x = rng.randint(min(x_interval), max(x_interval))
 
-        c = randint(min(c_interval), (max(c_interval))) * a
+        c = rng.randint(min(c_interval), (max(c_interval))) * a
         b = c - a * x
-        equation = self.format_equation(a, b, shuffle_the_equation=shuffle_the_equation)
-        sentence_chosen = choice(sentences)
+        equation = self.format_equation(a, b, shuffle_the_equation=shuffle_the_equation, rng=rng)
+        sentence_chosen = rng.choice(sentences)
 
         return {'question': sentence_chosen.format(equation=equation, c=c),
                 'answer': x}
 
-    def q_give_factorisation_form(self, shuffle_the_equation: bool = True) -> dict:
+    def q_give_factorisation_form(self, shuffle_the_equation: bool = True, *, rng: RandomSource = None) -> dict:
+        rng = get_rng(rng)
         sentences = ['Donner la forme factorisé du polynôme f(x)=', 'Exprimer sous forme de produit f(x)=']
-        a = randint(-1, 1)
+        a = rng.randint(-1, 1)
         while a == 0:
-            a = randint(-1, 1)
+            a = rng.randint(-1, 1)
         #  easy root of polynomial equation
-        x1 = randint(-1, 1)
+        x1 = rng.randint(-1, 1)
         while x1 == 0:
-            x1 = randint(-1, 1)
-        x2 = choice([randint(-10, -2), randint(2, 10)])
+            x1 = rng.randint(-1, 1)
+        x2 = rng.choice([rng.randint(-10, -2), rng.randint(2, 10)])
         #  x1, x2 = min(x1, x2), max(x1, x2)
         b = -(x1 + x2) * a
         c = x1 * x2 * a
 
-        expanded_equation = self.format_equation(a, b, c, shuffle_the_equation=shuffle_the_equation)
-        factorised_equation = [(f'{self.format_equation(a, 0)[:-1]}(x{self.format_value(-x1, "")})'
+        expanded_equation = self.format_equation(a, b, c, shuffle_the_equation=shuffle_the_equation, rng=rng)
+        factorised_equation = [(f'{self.format_equation(a, 0, rng=rng)[:-1]}(x{self.format_value(-x1, "")})'
                                 f'(x{self.format_value(-x2, "")})'),
-                               (f'{self.format_equation(a, 0)[:-1]}(x{self.format_value(-x2, "")})'
+                               (f'{self.format_equation(a, 0, rng=rng)[:-1]}(x{self.format_value(-x2, "")})'
                                 f'(x{self.format_value(-x1, "")})')
                                ]
-        sentence_chosen = choice(sentences)
+        sentence_chosen = rng.choice(sentences)
         return {'question': f'{sentence_chosen}{expanded_equation}',
                 'answer': factorised_equation[0],
                 'others_answers': factorised_equation[1:]}
 
-    def q_calculate_discriminant(self):
+    def q_calculate_discriminant(self, *, rng: RandomSource = None):
+        rng = get_rng(rng)
         sentences = ['Combien vaut le discriminant dans', 'Calcule le discriminant de l\'équation',
                      'Delta est égal à combien dans']
-        a = randint(-2, 2)
-        b = randint(-5, 5)
-        c = randint(-3, 3)
+        a = rng.randint(-2, 2)
+        b = rng.randint(-5, 5)
+        c = rng.randint(-3, 3)
         while a == 0 or (b == 0 and c == 0):
-            a = randint(-2, 2)
-            b = randint(-5, 5)
-            c = randint(-3, 3)
-        equation = self.format_equation(a, b, c)
+            a = rng.randint(-2, 2)
+            b = rng.randint(-5, 5)
+            c = rng.randint(-3, 3)
+        equation = self.format_equation(a, b, c, rng=rng)
         delta = b ** 2 - 4 * a * c
-        sentence_chosen = choice(sentences)
+        sentence_chosen = rng.choice(sentences)
 
         return {'question': f'{sentence_chosen} {equation} ?',
                 'answer': delta}
 
-    def q_calculate_image(self):
+    def q_calculate_image(self, *, rng: RandomSource = None):
+        rng = get_rng(rng)
         sentences = ['Combien vaut g({x}) avec g(x)={equation}',
                      'Calcule l\'image de {x} dans l\'équation {equation}=y',
                      'Donner l\'image de {x} avec f(x)={equation}']
-        a = randint(-4, 4)
-        b = randint(-6, 6)
-        c = randint(-10, 10)
+        a = rng.randint(-4, 4)
+        b = rng.randint(-6, 6)
+        c = rng.randint(-10, 10)
 
-        x = randint(-2, 2)
-        equation = self.format_equation(a, b, c, shuffle_the_equation=False)
-        sentence_chosen = choice(sentences)
+        x = rng.randint(-2, 2)
+        equation = self.format_equation(a, b, c, shuffle_the_equation=False, rng=rng)
+        sentence_chosen = rng.choice(sentences)
 
         return {'question': sentence_chosen.format(x=x, equation=equation),
                 'answer': a * x ** 2 + b * x + c}
 
     @staticmethod
-    def q_simple_calcul():
+    def q_simple_calcul(*, rng: RandomSource = None):
+        rng = get_rng(rng)
         sentences = ['Combien font {equation} ?',
                      '{equation}=?']
-        if randint(1, 4):
-            numbers = [randint(11, 99), 11]
-            shuffle(numbers)
+        if rng.randint(1, 4):
+            numbers = [rng.randint(11, 99), 11]
+            rng.shuffle(numbers)
             a, b = numbers
         else:
-            a = randint(0, 12)
-            b = randint(2, 10)
+            a = rng.randint(0, 12)
+            b = rng.randint(2, 10)
         answer = a * b
-        sentence = choice(sentences)
+        sentence = rng.choice(sentences)
         return {'question': sentence.format(equation=f'{a}x{b}'),
                 'answer': answer}
 
@@ -265,39 +261,23 @@ class Arithmetic(Questions):
         :param max_number:
         :return: list of all prime number in the interval
         """
+        #  The primes are sieved once for the whole process (see math_tables)
+        return prime_table.primes_between(min_number, max_number)
 
-        #  Algorithm that we saw in math last year
-        def is_prime(n: int) -> bool:
-            #  First check if the number is lower or equal than 1
-            if n <= 1:
-                return False
-            #  We check if we can divide our number by all numbers between 2 and sqrt(n)+1
-            #  2 because every number can be divided by 1, and sqrt(n)+1 because no one number
-            #  greater can divide n, don't need to search more
-            for i in range(2, int(n ** 0.5) + 1):
-                #  If we can divide, this is not a prime number
-                if n % i == 0:
-                    return False
-            #  else, this is a prime number
-            return True
-
-        # All prime number in the interval
-        prime_numbers = [num for num in range(min_number, max_number + 1) if is_prime(num)]
-
-        return prime_numbers
-
-    def generate_friendly_number(self, length: int = 4) -> int:
+    def generate_friendly_number(self, length: int = 4, *, rng: RandomSource = None) -> int:
+        rng = get_rng(rng)
         prime_number = self.prime_number_interval(2, 7)
         weight = [length - index for index in range(length)]
 
-        list_number_chosen = choices(prime_number, weights=weight, k=randint(2, 3))
+        list_number_chosen = rng.choices(prime_number, weights=weight, k=rng.randint(2, 3))
         number = 1
         for i in list_number_chosen:
             number *= i
         return number
 
     @staticmethod
-    def q_perfect_square(min_number: int = 5, max_number: int = 12) -> dict[str, bool]:
+    @question(answer_kind=TRUE_OR_FALSE)
+    def q_perfect_square(min_number: int = 5, max_number: int = 12, *, rng: RandomSource = None) -> dict[str, bool]:
         """
         Ask if a number is a perfect square or not, so the answer is a boolean.
         Generate a number in the interval [min_number**2 ; max_number**2]
@@ -309,29 +289,32 @@ class Arithmetic(Questions):
 
         :return: dictionary with "question" and "answer" keys
         """
+        rng = get_rng(rng)
 
         perfect_square = [number ** 2 for number in range(min_number, max_number + 1)]
-        is_perfect_square = choice([True, False])
+        is_perfect_square = rng.choice([True, False])
         if is_perfect_square:
-            number_generated = choice(perfect_square)
+            number_generated = rng.choice(perfect_square)
         else:
-            number_generated = randint(min_number ** 2, max_number ** 2)
+            number_generated = rng.randint(min_number ** 2, max_number ** 2)
             while number_generated in perfect_square:
-                number_generated = randint(min_number ** 2, max_number ** 2)
+                number_generated = rng.randint(min_number ** 2, max_number ** 2)
 
         return {'question': f'Le nombre {number_generated} est-il un carré parfait ? (Oui/Non)',
                 'answer': is_perfect_square}
 
-    def q_greatest_lower_common_divisor_multiple(self) -> dict[str, int]:
-        discipline: tuple = choice([('plus grand diviseur commun', gcd), ('plus petit multiple commun', lcm)])
-        n1 = self.generate_friendly_number()
-        n2 = self.generate_friendly_number()
+    def q_greatest_lower_common_divisor_multiple(self, *, rng: RandomSource = None) -> dict[str, int]:
+        rng = get_rng(rng)
+        discipline: tuple = rng.choice([('plus grand diviseur commun', gcd), ('plus petit multiple commun', lcm)])
+        n1 = self.generate_friendly_number(rng=rng)
+        n2 = self.generate_friendly_number(rng=rng)
 
         answer: int = discipline[1](n1, n2)
         return {'question': f'Quel est le {discipline[0]} de {min(n1, n2)} et {max(n1, n2)} ?',
                 'answer': answer}
 
-    def q_prime_number(self, min_number: int = 10, max_number: int = 40) -> dict[str, bool]:
+    @question(answer_kind=TRUE_OR_FALSE)
+    def q_prime_number(self, min_number: int = 10, max_number: int = 40, *, rng: RandomSource = None) -> dict[str, bool]:
         """
         Ask if a number is a prime number or not, the answer is also a boolean.
         Generate a number in the interval [min_number ; max_number]
@@ -343,39 +326,41 @@ class Arithmetic(Questions):
 
         :return: dictionary with "question" and "answer" keys
         """
+        rng = get_rng(rng)
 
-        prime_number = self.prime_number_interval(min_number, max_number)
-        is_prime = choice([True, False])
+        is_prime = rng.choice([True, False])
         if is_prime:
-            number_generated = choice(prime_number)
+            number_generated = prime_table.random_prime(min_number, max_number, rng=rng)
         else:
-            number_generated = randint(min_number, max_number)
-            while number_generated in prime_number or number_generated % 2 == 0:
-                number_generated = randint(min_number, max_number)
+            number_generated = prime_table.random_odd_non_prime(min_number, max_number, rng=rng)
 
         return {'question': f'{number_generated} est-il un nombre premier ? (Oui/Non)',
                 'answer': is_prime}
 
     @staticmethod
-    def q_convert_bin_to_dec(min_number: int = 5, max_number: int = 32) -> dict[str, int]:
-        number = randint(min_number, max_number)
+    def q_convert_bin_to_dec(min_number: int = 5, max_number: int = 32, *, rng: RandomSource = None) -> dict[str, int]:
+        rng = get_rng(rng)
+        number = rng.randint(min_number, max_number)
         return {'question': f'Convertis le nombre binaire {str(bin(number))[2:]} en décimal',
                 'answer': number}
 
     @staticmethod
-    def q_is_divisible_by_a_number(min_number: int = 100, max_number: int = 10000) -> dict[str, bool]:
+    @question(answer_kind=TRUE_OR_FALSE)
+    def q_is_divisible_by_a_number(min_number: int = 100, max_number: int = 10000, *,
+                                   rng: RandomSource = None) -> dict[str, bool]:
+        rng = get_rng(rng)
         #  numbers for which we know the divisibility criteria
         list_divisible = [3, 5, 6, 10]
-        is_divisible = choice([True, False])
+        is_divisible = rng.choice([True, False])
 
-        k = choice(list_divisible)
+        k = rng.choice(list_divisible)
 
         if is_divisible:
-            final_number = k * randint(int(min_number / k), int(max_number / k))
+            final_number = k * rng.randint(int(min_number / k), int(max_number / k))
         else:
-            final_number = randint(min_number, max_number)
+            final_number = rng.randint(min_number, max_number)
             while final_number % k == 0:
-                final_number = randint(min_number, max_number)
+                final_number = rng.randint(min_number, max_number)
 
         return {'question': f'Est-ce que {final_number} est divisible par {k} ? (Oui/Non)',
                 'answer': is_divisible}
@@ -408,62 +393,56 @@ class Geometry(Questions):
     @staticmethod
     def pythagorean_triplet(interval: tuple = (1, 13)):
         assert min(interval) > 0
-        result = []
-        for i in range(min(interval), max(interval) + 1):
-            for j in range(min(interval), max(interval) + 1):
-                if int((i ** 2 + j ** 2) ** 0.5) == (i ** 2 + j ** 2) ** 0.5 and int((i ** 2 + j ** 2) ** 0.5) <= max(
-                        interval):
-                    is_new_triplet = True
-                    for triplet in result:
-                        if min(triplet) == min(i, j) and max(triplet) == int((i ** 2 + j ** 2) ** 0.5):
-                            is_new_triplet = False
-                    if is_new_triplet:
-                        result.append((i, j, int((i ** 2 + j ** 2) ** 0.5)))
-        return result
+        #  The triples are generated once for the whole process (see math_tables)
+        return list(pythagorean_triples.triples_between(min(interval), max(interval)))
 
-    def q_how_many_side(self):
+    def q_how_many_side(self, *, rng: RandomSource = None):
+        rng = get_rng(rng)
         sentences = ['Combien de côté un {polygone_prefix}agone possède t\'il ?',
                      'Un {polygone_prefix}agone, c\'est un polygone à comien de coté ?',
                      'Nombre de coté d\'un {polygone_prefix}agone ?']
-        sentence_chosen: str = choice(sentences)
-        prefix = choice(list(self.prefix['shapes']))
+        sentence_chosen: str = rng.choice(sentences)
+        prefix = rng.choice(list(self.prefix['shapes']))
         return {'question': sentence_chosen.format(polygone_prefix=prefix),
                 'answer': self.prefix['shapes'][prefix]}
 
     @staticmethod
-    def q_angles_sum():
+    def q_angles_sum(*, rng: RandomSource = None):
+        rng = get_rng(rng)
         interrogative_word = ['Trouve', 'Détermine', 'Quelle est', 'Calcule']
         sentence = '{0} la sommes des angles d\'un {1}'
         geometric_shapes_with_angles = [('triangle', ['180°', '180', 'pi']),
                                         ('carré', ['360°', '360', '2pi', '2*pi']),
                                         ('pentagone', ['540°', '540', '3pi', '3*pi'])]
-        shape_chosen = choice(geometric_shapes_with_angles)
-        question = sentence.format(choice(interrogative_word), shape_chosen[0])
+        shape_chosen = rng.choice(geometric_shapes_with_angles)
+        question = sentence.format(rng.choice(interrogative_word), shape_chosen[0])
         return {'question': question,
                 'answer': shape_chosen[1][0],
                 'others_answers': shape_chosen[1][1:]}
 
-    def q_triangle_nature(self, triangle_side_value_interval: tuple = (3, 10)):
+    @question(answer_kind=TRUE_OR_FALSE)
+    def q_triangle_nature(self, triangle_side_value_interval: tuple = (3, 10), *, rng: RandomSource = None):
+        rng = get_rng(rng)
         assert min(triangle_side_value_interval) > 0
         assert abs(max(triangle_side_value_interval) - min(triangle_side_value_interval)) >= 2
         assert min(triangle_side_value_interval) != max(triangle_side_value_interval)
 
         def generate_random_side(value_interval: tuple = triangle_side_value_interval, /):
-            return (randint(min(value_interval), max(value_interval)),
-                    randint(min(value_interval), max(value_interval)),
-                    randint(min(value_interval), max(value_interval)))
+            return (rng.randint(min(value_interval), max(value_interval)),
+                    rng.randint(min(value_interval), max(value_interval)),
+                    rng.randint(min(value_interval), max(value_interval)))
 
         sentences = ['Est-ce que le triangle de coté {c1}, {c2} et {c3} est {triangle_type} ?',
                      'Les côtés {c1}, {c2} et {c3} permettent-ils de former un triangle {triangle_type} ?',
                      'Un triangle de côtés {c1}, {c2} et {c3} peut-il être {triangle_type} ?']
 
-        is_a_particular_triangle = choice([True, False])
-        triangle_type = choice(['isocèle', 'rectangle', 'équilateral'])
+        is_a_particular_triangle = rng.choice([True, False])
+        triangle_type = rng.choice(['isocèle', 'rectangle', 'équilateral'])
 
-        sentence_chosen: str = choice(sentences)
+        sentence_chosen: str = rng.choice(sentences)
         if triangle_type == 'équilateral':
             if is_a_particular_triangle:
-                c1 = randint(min(triangle_side_value_interval), max(triangle_side_value_interval))
+                c1 = rng.randint(min(triangle_side_value_interval), max(triangle_side_value_interval))
                 c2 = c3 = c1
             else:
                 c1, c2, c3 = generate_random_side()
@@ -471,11 +450,11 @@ class Geometry(Questions):
                     c1, c2, c3 = generate_random_side()
         elif triangle_type == 'isocèle':
             if is_a_particular_triangle:
-                c1 = randint(min(triangle_side_value_interval), max(triangle_side_value_interval))
-                c2 = randint(min(triangle_side_value_interval), max(triangle_side_value_interval))
+                c1 = rng.randint(min(triangle_side_value_interval), max(triangle_side_value_interval))
+                c2 = rng.randint(min(triangle_side_value_interval), max(triangle_side_value_interval))
                 while c1 == c2:
-                    c2 = randint(min(triangle_side_value_interval), max(triangle_side_value_interval))
-                c3 = choice([c1, c2])
+                    c2 = rng.randint(min(triangle_side_value_interval), max(triangle_side_value_interval))
+                c3 = rng.choice([c1, c2])
             else:
                 c1, c2, c3 = generate_random_side()
                 while c1 == c2 or c2 == c3 or c1 == c3:
@@ -483,15 +462,16 @@ class Geometry(Questions):
         elif triangle_type == 'rectangle':
             if is_a_particular_triangle:
                 try:
-                    c1, c2, c3 = choice(self.pythagorean_triplet(interval=triangle_side_value_interval))
-                except IndexError:
+                    c1, c2, c3 = pythagorean_triples.random_triple(min(triangle_side_value_interval),
+                                                                   max(triangle_side_value_interval), rng=rng)
+                except ValueError:
                     c1, c2, c3 = generate_random_side()
                     is_a_particular_triangle = False
                     while c1 == c2 or c2 == c3 or c3 == c1:
                         c1, c2, c3 = generate_random_side()
 
                 side_value = [c1, c2, c3]
-                shuffle(side_value)
+                rng.shuffle(side_value)
                 c1, c2, c3 = side_value
             else:
                 c1, c2, c3 = generate_random_side()
@@ -506,28 +486,27 @@ class Geometry(Questions):
                 'answer': is_a_particular_triangle}
 
     @staticmethod
-    def generate_area_or_volume_value(product_interval: tuple, /, number_of_value: int = 2):
-        prime_values = []
+    def generate_area_or_volume_value(product_interval: tuple, /, number_of_value: int = 2, *,
+                                      rng: RandomSource = None):
         """ generate n value whose product is included in a defined interval
 
         :param number_of_value: choose how many value will be returns
         :param product_interval:
         :return: n value in a tuple
         """
+        rng = get_rng(rng)
         min_product, max_product = product_interval
-        for i in range(min_product, max_product + 1):
-            prime_value_result = decomposition_prime_factor(i)
-            if len(prime_value_result) >= number_of_value:
-                prime_values.append(prime_value_result)
-        chosen = choice(prime_values)
-        return chosen
+        #  The numbers of the interval with enough prime factors are searched only once (see math_tables)
+        chosen = factor_table.random_number_with_factors(min_product, max_product, number_of_value, rng=rng)
+        return decomposition_prime_factor(chosen)
 
     @staticmethod
-    def separate_in_two_list(list_of_values: list):
+    def separate_in_two_list(list_of_values: list, *, rng: RandomSource = None):
+        rng = get_rng(rng)
         length = len(list_of_values)
         assert length >= 2
-        shuffle(list(list_of_values))
-        split = (randint(2, length - 1) if length != 2 else 2) - 1
+        rng.shuffle(list(list_of_values))
+        split = (rng.randint(2, length - 1) if length != 2 else 2) - 1
         return list_of_values[split:], list_of_values[:split]
 
     @staticmethod
@@ -537,7 +516,8 @@ class Geometry(Questions):
             result *= i
         return result
 
-    def q_volume(self, result_interval: tuple = (4, 60)):
+    def q_volume(self, result_interval: tuple = (4, 60), *, rng: RandomSource = None):
+        rng = get_rng(rng)
         sentences = [
             'Quel est {determiner1}{area_or_volume} {determiner2}{shape} de base {b}{unit}{exponent} et de hauteur '
             '{h}{unit} ?',
@@ -547,8 +527,8 @@ class Geometry(Questions):
             '{area_or_volume} ?'
         ]
 
-        sentence_chosen = choice(sentences)
-        unit = choice(['dam', 'm', 'dm', 'cm', 'mm'])
+        sentence_chosen = rng.choice(sentences)
+        unit = rng.choice(['dam', 'm', 'dm', 'cm', 'mm'])
 
         shapes = {
             'volume': {
@@ -562,32 +542,32 @@ class Geometry(Questions):
 
             }
         }
-        area_or_volume = choice(list(shapes))
-        shape_chosen = choice(list(shapes[area_or_volume]))
+        area_or_volume = rng.choice(list(shapes))
+        shape_chosen = rng.choice(list(shapes[area_or_volume]))
         determiner1 = self.format_le_before_word('le', area_or_volume)
         determiner2 = f'de {self.format_le_before_word("la", shape_chosen)}' if shape_chosen == 'pyramide' else 'du '
         if shape_chosen == 'pyramide':
             min_value, max_value = result_interval
             base, height = self.separate_in_two_list(
-                self.generate_area_or_volume_value((min_value // 3, max_value // 3))
-            )
-            if choice([True, False]):
+                self.generate_area_or_volume_value((min_value // 3, max_value // 3), rng=rng)
+            , rng=rng)
+            if rng.choice([True, False]):
                 base += [3]
             else:
                 height += [3]
         elif shape_chosen == 'triangle':
             min_value, max_value = result_interval
             base, height = self.separate_in_two_list(
-                self.generate_area_or_volume_value((min_value // 2, max_value // 2))
-            )
-            if choice([True, False]):
+                self.generate_area_or_volume_value((min_value // 2, max_value // 2), rng=rng)
+            , rng=rng)
+            if rng.choice([True, False]):
                 base += [2]
             else:
                 height += [2]
         else:
             base, height = self.separate_in_two_list(
-                self.generate_area_or_volume_value(result_interval)
-            )
+                self.generate_area_or_volume_value(result_interval, rng=rng)
+            , rng=rng)
         base = self.prod(base)
         height = self.prod(height)
         #  We can put "int" because the values generated makes only integers, not float.
@@ -622,37 +602,38 @@ class Geometry(Questions):
                 result += " "
         return result
 
-    def q_convert_unit(self, answer_interval: tuple = (1, 100)):
+    def q_convert_unit(self, answer_interval: tuple = (1, 100), *, rng: RandomSource = None):
+        rng = get_rng(rng)
         assert len(answer_interval) == 2 and [min(answer_interval), max(answer_interval)] == list(answer_interval) and \
                min(answer_interval) > -1
         assert isinstance(answer_interval[0], int) and isinstance(answer_interval[1], int)
 
-        units_type = choice(['mètres', 'litres', 'grammes'])
+        units_type = rng.choice(['mètres', 'litres', 'grammes'])
 
         sentences = ['Convertis {number} {unit1} en {unit2}.',
                      '{number} {unit1} font combien de {unit2} ?',
                      'Quel est la longueur d\'une droite de {number} {unit1} en {unit2} ?']
-        unit1_index = randint(0, len(self.prefix['units']) - 1)
-        unit2_index = randint(0, len(self.prefix['units']) - 1)
+        unit1_index = rng.randint(0, len(self.prefix['units']) - 1)
+        unit2_index = rng.randint(0, len(self.prefix['units']) - 1)
         while unit1_index == unit2_index:
-            unit2_index = randint(0, len(self.prefix['units']) - 1)
+            unit2_index = rng.randint(0, len(self.prefix['units']) - 1)
         unit1 = self.prefix['units'][unit1_index] + units_type
         unit2 = self.prefix['units'][unit2_index] + units_type
         comma_unit = unit2_index - unit1_index
 
-        number_length = randint(ceil(log10(min(answer_interval))), ceil(log10(max(answer_interval))))
+        number_length = rng.randint(ceil(log10(min(answer_interval))), ceil(log10(max(answer_interval))))
         while number_length == 0:
-            number_length = randint(ceil(log10(min(answer_interval))), ceil(log10(max(answer_interval))))
+            number_length = rng.randint(ceil(log10(min(answer_interval))), ceil(log10(max(answer_interval))))
 
         def generate_number(length):
             #  I want to have the same chance to generate a two-length number as a one-length number so :
             result = 0
             for i in range(length):
                 if i == 0 or i == length - 1:
-                    result += randint(1, 9) * 10 ** i
+                    result += rng.randint(1, 9) * 10 ** i
                 else:
-                    if choice([True, False]):
-                        result += randint(1, 9) * 10 ** i
+                    if rng.choice([True, False]):
+                        result += rng.randint(1, 9) * 10 ** i
             return result
 
         answer = generate_number(number_length)
@@ -662,10 +643,10 @@ class Geometry(Questions):
         number = answer / 10 ** comma_unit
         if number == int(number):
             number = int(number)
-        sentence = choice(sentences)
+        sentence = rng.choice(sentences)
 
         return {'question': sentence.format(number=self.write_number(number), unit1=unit1, unit2=unit2),
-                'answer': answer, 'others_answers': f"{answer}{unit2}"}
+                'answer': answer, 'others_answers': [f"{answer}{unit2}"]}
 
 
 class Trigonometry(Questions):
@@ -688,36 +669,16 @@ class Trigonometry(Questions):
 
     def __init__(self):
         super().__init__(self)
+        #  Exact values (degrees, radians, cos and sin) of the angles, built once (see unit_circle)
+        self.unit_circle = get_unit_circle(latex=False)
         self.angles = self.get_extended_angles(start=-4, stop=4)
+        #  For each function, the angles with a value easy to type (0, 0.5, 1, -0.5, -1)
+        self.simple_value_rows = {function: [row for row in self.unit_circle.rows
+                                             if getattr(row, function) == round(getattr(row, function), 2)]
+                                  for function in ('cos', 'sin')}
 
     def convert_degree_into_radian(self, degree: str):
-        result: str = ''
-        value = int(degree[:-1])
-
-        #  simplification :
-        prime_factor_value = decomposition_prime_factor(value)
-        prime_factor_180 = [2, 2, 3, 3, 5]
-        to_remove = []
-        for value in prime_factor_value:
-            if value in prime_factor_180:
-                prime_factor_180.remove(value)
-                to_remove.append(value)
-        if not to_remove:
-            return '0'
-        for item_to_remove in to_remove:
-            prime_factor_value.remove(item_to_remove)
-        product = prod(prime_factor_value)
-        if abs(product) == 1:
-            result += f'{"-" if product < 0 else ""}{self.pi}'
-        else:
-            result += f'{product}{self.pi}'
-        product2 = prod(prime_factor_180)
-        if product2 == 1:
-            pass
-        else:
-            result += f'/{product2}'
-
-        return result
+        return self.unit_circle.radian_text(int(degree[:-1]))
 
     @staticmethod
     def add_angles(angle_degree: str, delta_in_degree: int):
@@ -727,43 +688,30 @@ class Trigonometry(Questions):
         return value
 
     def get_extended_angles(self, *, start: int = -2, stop: int = 2):
-        data = {'value': {'radian': [], 'degree': []},
-                'result': {'cos': [], 'sin': []}}
-        for i in range(start, stop):
-            for value in self.angles_base['value']['degree']:
-                new_angle = self.add_angles(value, 90 * i)
-                data['value']['degree'].append(new_angle)
-                data['value']['radian'].append(self.convert_degree_into_radian(new_angle))
-                data['result']['cos'].append(round(cos(radians(int(new_angle[:-1]))), 5))
-                data['result']['sin'].append(round(sin(radians(int(new_angle[:-1]))), 5))
-
-        new_angle = f'{90 * stop}°'
-        data['value']['degree'].append(new_angle)
-        data['value']['radian'].append(self.convert_degree_into_radian(new_angle))
-        data['result']['cos'].append(round(cos(radians(int(new_angle[:-1]))), 5))
-        data['result']['sin'].append(round(sin(radians(int(new_angle[:-1]))), 5))
-        return data
-
-    def get_random_values(self):
-        trigo_function_chosen = choice(list(self.angles['result']))
-        options = []
-        for index, result in enumerate(self.angles['result'][trigo_function_chosen]):
-            if result == round(result, 2):
-                options.append((index, result))
-        index_chosen, result_chosen = choice(options)
-        value = self.angles['value'][choice(list(self.angles['value']))][index_chosen]
+        rows = self.unit_circle.rows_between(90 * start, 90 * stop)
+        return {'value': {'radian': [row.radian_text for row in rows], 'degree': [row.degree_text for row in rows]},
+                'result': {'cos': [round(row.cos, 5) for row in rows], 'sin': [round(row.sin, 5) for row in rows]}}
+
+    def get_random_values(self, *, rng: RandomSource = None):
+        rng = get_rng(rng)
+        trigo_function_chosen = rng.choice(list(self.simple_value_rows))
+        row = rng.choice(self.simple_value_rows[trigo_function_chosen])
+        value = row.radian_text if rng.choice([True, False]) else row.degree_text
+        result_chosen = getattr(row, trigo_function_chosen)
         if int(result_chosen) == result_chosen:
             result_chosen = int(result_chosen)
         return trigo_function_chosen, value, result_chosen
 
-    def q_trigo_formula(self):
+    @question(answer_kind=TRUE_OR_FALSE)
+    def q_trigo_formula(self, *, rng: RandomSource = None):
+        rng = get_rng(rng)
         sentences = [
             'Dans un rectangle, {determinant} {trigo_function} est-il le rapport entre l\'{side1} et l\'{side2} ?',
             '{determinant} {trigo_function} d’un angle est-il l\'{side1} sur l’{side2} ?',
             'Dans un rectangle, {determinant} {trigo_function} est-il égal à l\'{side1}/l\'{side2} ?'
         ]
-        trigo_function = choice(list(self.relation))
-        result = choice([True, False])
+        trigo_function = rng.choice(list(self.relation))
+        result = rng.choice([True, False])
         if result:
             side1, side2 = self.relation[trigo_function].split("/")
         else:
@@ -775,72 +723,76 @@ class Trigonometry(Questions):
                         possibilities.append(side1)
                     if side2 not in possibilities:
                         possibilities.append(side2)
-                side1 = choice(possibilities)
+                side1 = rng.choice(possibilities)
                 possibilities.remove(side1)
-                side2 = choice(possibilities)
+                side2 = rng.choice(possibilities)
                 #  Check if it's unfortunately the good result.
                 if [side1, side2] != self.relation[trigo_function].split('/'):
                     break
 
-        sentence = choice(sentences)
+        sentence = rng.choice(sentences)
         determinant = 'le' if trigo_function in ['sinus', 'cosinus'] else 'la'
         return {'question': sentence.format(determinant=determinant, trigo_function=trigo_function,
                                             side1=side1, side2=side2),
                 'answer': result}
 
-    def q_found_value(self):
+    def q_found_value(self, *, rng: RandomSource = None):
+        rng = get_rng(rng)
         sentences = ['Quelle est la valeur de {trigo_function}({value}) ?',
                      'Quelle valeur doit-on attribuer à {trigo_function}({value}) ?',
                      'Quel est le résultat de {trigo_function}({value}) dans l’unité cercle ?']
-        trigo_function, value, result = self.get_random_values()
+        trigo_function, value, result = self.get_random_values(rng=rng)
 
-        sentence = choice(sentences).format(trigo_function=trigo_function, value=value)
+        sentence = rng.choice(sentences).format(trigo_function=trigo_function, value=value)
         return {'question': sentence,
                 'answer': result, 'others_answers': ['1/2' if result == 0.5 else None]}
 
-    def q_is_the_same_value(self):
+    @question(answer_kind=TRUE_OR_FALSE)
+    def q_is_the_same_value(self, *, rng: RandomSource = None):
+        rng = get_rng(rng)
         sentences = ['{angle1} est-il confondu avec {angle2} dans le cerle trigonométrique ?',
                      '{angle1} et {angle2} ont-ils la même position sur le cercle trigo ?',
                      'Peut-on superposer {angle1} et {angle2} dans le cercle trigo d\'unité 1 ?']
-        angle1 = choice(self.angles_base['value']['degree'])
-        answer = choice([True, False])
-        k = randint(-1, 1)
+        angle1 = rng.choice(self.angles_base['value']['degree'])
+        answer = rng.choice([True, False])
+        k = rng.randint(-1, 1)
         while k == 0:
-            k = randint(-1, 1)
+            k = rng.randint(-1, 1)
         if answer:
             angle2 = self.add_angles(angle1, 360 * k)
         else:
             while True:
-                angle2 = choice(self.angles_base['value']['degree'])
+                angle2 = rng.choice(self.angles_base['value']['degree'])
                 if angle1 != angle2:
                     break
         angles = [angle1, angle2]
-        shuffle(angles)
+        rng.shuffle(angles)
         angle1, angle2 = angles
-        if choice([True, False]):
+        if rng.choice([True, False]):
             angle1 = self.convert_degree_into_radian(angle1)
 
-        if choice([True, False]):
+        if rng.choice([True, False]):
             angle2 = self.convert_degree_into_radian(angle2)
 
-        sentence = choice(sentences)
+        sentence = rng.choice(sentences)
         return {'question': sentence.format(angle1=angle1, angle2=angle2),
                 'answer': answer}
 
-    def q_convert_value_into_degree_or_radian(self):
+    def q_convert_value_into_degree_or_radian(self, *, rng: RandomSource = None):
+        rng = get_rng(rng)
         sentences = ['{value} {unit1} correspond à quelle valeur en {unit2} ?',
                      'Combien de {unit2} représente {value} {unit1} ?',
                      '{value} {unit1} donne combien en {unit2} ?',
                      'Quelle est l’équivalence exacte en {unit2} de {value} {unit1} ?']
 
-        degree_value = choice(self.angles['value']['degree'])
-        radian_value = self.convert_degree_into_radian(degree_value)
+        row = rng.choice(self.unit_circle.rows)
+        degree_value, radian_value = row.degree_text, row.radian_text
         values = [(degree_value, 'degrés'), (radian_value, 'radians')]
-        shuffle(values)
+        rng.shuffle(values)
 
         value, unit1 = values[0]
         answer, unit2 = values[1]
-        sentence = choice(sentences)
+        sentence = rng.choice(sentences)
         others_answers = []
         if unit2 == 'radians':
             others_answers.append(answer.replace(self.pi, "pi"))
@@ -851,7 +803,53 @@ class Trigonometry(Questions):
                 'answer': answer, 'others_answers': others_answers}
 
 
-def generate_question(subjects: list[str] = '*') -> dict:
+#  Same as in multiple_choice_quiz, the subjects objects are built once per process and not at each question.
+_subjects_registry: dict = {}
+
+
+def build_subjects_registry() -> dict:
+    """
+    Creates the four subjects objects and computes their draw weights (the sum of the weights of their questions).
+
+    :return: dictionary with the "subjects" (name -> object) and "weights" (name -> weight) keys
+    """
+    subjects = {'Trigonometry': Trigonometry(),
+                'Arithmetic': Arithmetic(),
+                'Geometry': Geometry(),
+                'Algebra': Algebra()}
+    weights = {subject_name: subject.cumulative_weights[-1] for subject_name, subject in subjects.items()}
+    return {'subjects': subjects, 'weights': weights}
+
+
+def get_subjects_registry() -> dict:
+    """
+    Returns the registry of the subjects, and builds it if this is the first call of the process.
+    """
+    if not _subjects_registry:
+        _subjects_registry.update(build_subjects_registry())
+    return _subjects_registry
+
+
+def rebuild_subjects_registry() -> None:
+    """
+    Rebuilds the registry of the subjects, e.g. after changing a subject table.
+    """
+    _subjects_registry.clear()
+    _subjects_registry.update(build_subjects_registry())
+
+
+def build_question_tables() -> None:
+    """
+    Draws each question once, with its default parameters, so the subjects and the tables they use (see math_tables
+    and unit_circle) are built before the first real draw.
+    """
+    rng = Random(0)
+    for subject in get_subjects_registry()['subjects'].values():
+        for entry in subject.questions:
+            entry.call(subject.clr, rng=rng)
+
+
+def generate_question(subjects: list[str] = '*', *, rng: RandomSource = None) -> dict:
     """
     This is the main function that will be called everytime.
 
@@ -861,51 +859,34 @@ def generate_question(subjects: list[str] = '*') -> dict:
 
     :param subjects: Trigonometry, Arithmetic, Geometry, Algebra or all of these ("*")
     :rtype subjects: list of str or just a str ("*")
+    :param rng: random.Random object or seed. With the same seed, we get the same question.
     :return: The question, his correct answer and the subject that was chosen.
     """
-    #  I link "manually" word with the function that generate question about the math discipline.
-    #  The value in front of the key is function but not called yet.
-    #  I could have called the functions, but it's to optimise, I will call only if it's chosen
-    all_subjects = {'Trigonometry': Trigonometry(),
-                    'Arithmetic': Arithmetic(),
-                    'Geometry': Geometry(),
-                    'Algebra': Algebra()}
+    rng = get_rng(rng)
+    registry = get_subjects_registry()
+    all_subjects = registry['subjects']
 
     subjects = [subject for subject in subjects if subject in all_subjects.keys()]
 
     if not subjects:
         subjects = list(all_subjects)
-    k = [all_subjects[subject_name].get_number_of_questions() for subject_name in subjects]
-    random_subject = choices(subjects, weights=k)[0]
+    k = [registry['weights'][subject_name] for subject_name in subjects]
+    random_subject = rng.choices(subjects, weights=k)[0]
 
     #  returns a dictionary with the following keys "question" ; "answer" ; "subject"
-    return all_subjects[random_subject].generate()
-
-
-def verify_answer(question_data, answer):
-    is_correct = False
-    if isinstance(question_data['answer'], bool):
-        if isinstance(answer, str):
-            return (answer == 'oui' or answer == 'yes' or
-                    answer == '1' or answer == 'true')
-
-    if isinstance(question_data['answer'], bool) or isinstance(question_data['answer'], str):
-        if answer == question_data['answer']:
-            is_correct = True
-    elif isinstance(question_data['answer'], int):
-        if answer == str(question_data['answer']):
-            is_correct = True
-
-    if not is_correct:
-        others_good_answers = question_data.get('others_answers')
-        if others_good_answers:
-
-            for other_good_answer in others_good_answers:
-                if answer == other_good_answer:
-                    is_correct = True
-                    break
+    return all_subjects[random_subject].generate(rng=rng)
 
-    return is_correct
+
+def verify_answer(question_data: dict, answer: str) -> bool:
+    """
+    Checks the answer typed by the user, in any of the writings accepted (see answer_index).
+
+    :param question_data: a question of generate_question
+    """
+    accepted = question_data.get('accepted_answers')
+    if accepted is None:
+        accepted = accepted_answers(question_data['answer'], question_data.get('others_answers'))
+    return is_accepted(accepted, answer)
 
 
 def calculate_score(score_details: dict, /) -> tuple[int, int]:
@@ -1042,8 +1023,9 @@ def test(*, iteration_number: int = 1_000) -> None:
     """
     for _ in range(iteration_number):
         data = generate_question()
-        if not data.get('questions') or not data.get('answer') or not data.get('subject'):
-            raise 'Erreur : ' + data
+        #  the answer can be False or 0, so we only check that the keys exist
+        if not data.get('question') or data.get('answer') is None or not data.get('subject'):
+            raise ValueError(f'Erreur : {data}')
 
     print("Algebra : ", Algebra().get_number_of_questions(), 'kind of questions')
     print("Geometry : ", Geometry().get_number_of_questions(), 'kind of questions')
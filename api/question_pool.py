@@ -0,0 +1,129 @@
+"""
+Question pool | MathQuiz
+
+The questions are generated in advance by a background thread and kept already serialized in a buffer for each
+(subjects, latex) couple, so /api/generate only has to pop bytes from a buffer. When a buffer is under its low
+watermark, the producer fills it again up to its high watermark. If a buffer is empty (or not created yet), the
+question is generated inline, as before.
+"""
+import logging
+import threading
+from random import Random
+from collections import deque
+from typing import Callable, Optional
+
+from serialization import dump_question
+from multiple_choice_quiz import generate_mcq_question, normalise_subjects
+
+logger = logging.getLogger('uvicorn.error')
+
+PoolKey = tuple[tuple[str, ...], bool]
+
+
+class QuestionPool:
+    def __init__(self, *, low_watermark: int = 16, high_watermark: int = 64,
+                 generate: Callable[..., dict] = generate_mcq_question,
+                 serialize: Callable[[dict], bytes] = dump_question):
+        """
+        :param low_watermark: the producer refills a buffer when it has less questions than this value
+        :param high_watermark: maximal number of questions of a buffer
+        :param generate: function called with (subjects, latex=latex, rng=rng) to generate a question
+        :param serialize: function that transforms a question into bytes
+        """
+        assert 0 <= low_watermark < high_watermark
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.generate = generate
+        self.serialize = serialize
+        self.buffers: dict[PoolKey, deque] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'refills': 0, 'generated': 0}
+        #  The producer has its own generator, it doesn't share the state of the request handlers
+        self.rng = Random()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def make_key(subjects, latex: bool) -> PoolKey:
+        return normalise_subjects(subjects), bool(latex)
+
+    def pop(self, subjects, latex: bool) -> bytes:
+        """
+        Returns a serialized question of these subjects, from the buffer if possible.
+        """
+        key = self.make_key(subjects, latex)
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            #  First time we see these subjects, the producer will create and fill the buffer
+            self.buffers.setdefault(key, deque(maxlen=self.high_watermark))
+            self._wakeup.set()
+        else:
+            try:
+                data = buffer.popleft()
+            except IndexError:
+                pass
+            else:
+                self.stats['hits'] += 1
+                if len(buffer) < self.low_watermark:
+                    self._wakeup.set()
+                return data
+        #  The buffer is empty, so we generate the question inline
+        self.stats['misses'] += 1
+        return self.serialize(self.generate(list(key[0]), latex=key[1]))
+
+    def fill(self, key: PoolKey) -> int:
+        """
+        Fills the buffer of the key up to the high watermark.
+        :return: number of questions generated
+        """
+        buffer = self.buffers.setdefault(key, deque(maxlen=self.high_watermark))
+        subjects, latex = list(key[0]), key[1]
+        count = 0
+        while self._running and len(buffer) < self.high_watermark:
+            buffer.append(self.serialize(self.generate(subjects, latex=latex, rng=self.rng)))
+            count += 1
+        self.stats['generated'] += count
+        return count
+
+    def _produce(self) -> None:
+        while self._running:
+            self._wakeup.wait(timeout=1)
+            self._wakeup.clear()
+            for key, buffer in list(self.buffers.items()):
+                if len(buffer) < self.low_watermark:
+                    try:
+                        self.fill(key)
+                    except Exception as e:  # A generation bug must not stop the producer
+                        logger.error(f'Cannot fill the question pool {key} ({e.__str__()}).')
+                    else:
+                        self.stats['refills'] += 1
+
+    def start(self, keys: tuple = ()) -> None:
+        """
+        Starts the background producer.
+        :param keys: (subjects, latex) couples to fill before any request
+        """
+        if self._running:
+            return
+        for subjects, latex in keys:
+            self.buffers.setdefault(self.make_key(subjects, latex), deque(maxlen=self.high_watermark))
+        self._running = True
+        self._thread = threading.Thread(target=self._produce, name='question-pool', daemon=True)
+        self._thread.start()
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def metrics(self) -> dict:
+        requests = self.stats['hits'] + self.stats['misses']
+        return {**self.stats,
+                'hit_rate': round(self.stats['hits'] / requests, 4) if requests else None,
+                'low_watermark': self.low_watermark,
+                'high_watermark': self.high_watermark,
+                'buffers': [{'subjects': list(subjects), 'latex': latex, 'size': len(buffer)}
+                            for (subjects, latex), buffer in list(self.buffers.items())]}
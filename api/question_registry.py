@@ -0,0 +1,104 @@
+"""
+Question registry | MathQuiz
+
+Each subject (Algebra, Arithmetic...) has its questions in functions starting with the keyword "q_". Instead of
+searching them with dir() at each draw, they are registered only once, when the subject class is created, in a table
+that also keeps the metadata of each question: its subject, its name, its base weight for the draws and the kind of
+answer it expects. The @question decorator changes the default metadata of a question.
+
+The questions of the multiple choice quiz also give their sentences to the @question decorator: their "q_" function
+only draws the values, and the sentences are compiled once for each format (see question_templates).
+"""
+import inspect
+from itertools import accumulate
+from typing import Any, Callable, NamedTuple, Optional
+
+#  Kinds of answer a question can expect
+MULTIPLE_CHOICE = 'multiple_choice'  # 4 suggested answers
+TRUE_OR_FALSE = 'true_or_false'  # True or False
+OPEN_ANSWER = 'open_answer'  # free-text answer (open_answer_quiz)
+
+
+class QuestionEntry(NamedTuple):
+    subject: str
+    question_name: str  # name of the function without "q_"
+    function: Callable
+    weight: float
+    answer_kind: str
+    is_static: bool  # a static method is called without the subject object
+    sentences: tuple[str, ...] = ()  # templates of the question, if the function only draws the values
+    latex_choices: bool = True  # if the suggested answers are written as latex formulas in the latex format
+
+    def call(self, subject_object: object, *args, **kwargs) -> Any:
+        """
+        Calls the "q_" function: it returns a dict in open_answer_quiz and a Draw in multiple_choice_quiz.
+        """
+        if self.is_static:
+            return self.function(*args, **kwargs)
+        return self.function(subject_object, *args, **kwargs)
+
+    def metadata(self) -> dict:
+        return {'subject': self.subject, 'question_name': self.question_name,
+                'weight': self.weight, 'answer_kind': self.answer_kind}
+
+
+def question(*, weight: float = 1, answer_kind: str = MULTIPLE_CHOICE, sentences: tuple[str, ...] = (),
+             latex_choices: Optional[bool] = None) -> Callable:
+    """
+    Changes the metadata of a "q_" function, e.g.:
+
+        @question(answer_kind=TRUE_OR_FALSE)
+        def q_prime_number(self): ...
+
+    :param weight: the base weight of the question when we randomly pick a question of the subject
+    :param answer_kind: MULTIPLE_CHOICE, TRUE_OR_FALSE or OPEN_ANSWER
+    :param sentences: the templates of the question, one of them is drawn after the values of the question
+    :param latex_choices: if the suggested answers are written as latex formulas, by default all the answers except
+    True and False
+    """
+    assert weight > 0
+    if latex_choices is None:
+        latex_choices = answer_kind != TRUE_OR_FALSE
+
+    def decorator(function: Callable) -> Callable:
+        function.question_settings = {'weight': weight, 'answer_kind': answer_kind, 'sentences': tuple(sentences),
+                                      'latex_choices': latex_choices}
+        return function
+
+    return decorator
+
+
+def collect_questions(subject_class: type, *, default_answer_kind: str = MULTIPLE_CHOICE
+                      ) -> tuple[QuestionEntry, ...]:
+    """
+    Searches all the functions starting with the keyword "q_" of a subject class (and of its parents). It's only
+    called when the class is created, so the dir() is not done at each draw.
+
+    :return: tuple of QuestionEntry, sorted by name to always have the same order
+    """
+    entries = []
+    for attribute_name in sorted(dir(subject_class)):
+        if not attribute_name.startswith('q_'):
+            continue
+        attribute = inspect.getattr_static(subject_class, attribute_name)
+        is_static = isinstance(attribute, staticmethod)
+        function = attribute.__func__ if is_static else attribute
+        if not callable(function):
+            continue
+        settings = getattr(function, 'question_settings', {})
+        entries.append(QuestionEntry(subject=subject_class.__name__,
+                                     question_name=attribute_name[2:],  # remove "q_"
+                                     function=function,
+                                     weight=settings.get('weight', 1),
+                                     answer_kind=settings.get('answer_kind', default_answer_kind),
+                                     is_static=is_static,
+                                     sentences=settings.get('sentences', ()),
+                                     latex_choices=settings.get('latex_choices', True)))
+    return tuple(entries)
+
+
+def get_cumulative_weights(entries: tuple[QuestionEntry, ...]) -> list[float]:
+    """
+    Cumulative weights of the entries, to give them to random.choices(cum_weights=...) without computing them again.
+    """
+    return list(accumulate(entry.weight for entry in entries))
@@ -0,0 +1,166 @@
+"""
+Question space | MathQuiz
+
+Many questions are drawn from a small finite space: 28 binary numbers, 4 polygons, 3 shapes... For these questions,
+all the possible questions (the "rows" of the space) are listed only once, with their answer and all their possible
+wrong answers, in a table shared by the whole process. A question is then only a random index in this table, the
+probability of each row is exact (its weight), and we know how many different questions can be asked.
+
+The questions whose space is too large (the equations, the conversions of units...) keep their live generator.
+
+    python question_space.py  # size and coverage of each space
+"""
+from bisect import bisect
+from itertools import accumulate
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+from sampling import make_choices
+
+#  Above this number of rows, the space is not listed, the question uses its live generator
+MAX_SPACE_SIZE = 20_000
+
+
+class SpaceRow(NamedTuple):
+    fields: dict  # values of the sentence, shared by all the draws of the row (they must not be modified)
+    answer: object
+    candidates: tuple  # the possible wrong answers, the answer can be in it (it's never picked), no duplicates
+    weight: float = 1
+
+
+class QuestionSpace:
+    def __init__(self, question_name: str, rows: Iterable[SpaceRow], *, fixed_choices: Optional[tuple] = None,
+                 k: int = 3):
+        """
+        :param question_name: name of the question, for the errors and the statistics
+        :param fixed_choices: the suggested answers of all the rows (e.g. (True, False)), the candidates are ignored
+        :param k: number of wrong answers of each question
+        :raise ValueError: if a row doesn't have k wrong answers, so a bad configuration fails when the space is built
+        """
+        self.question_name = question_name
+        self.rows: tuple[SpaceRow, ...] = tuple(rows)
+        if not self.rows:
+            raise ValueError(f'The space of the question "{question_name}" is empty.')
+        self.fixed_choices = fixed_choices
+        self.k = k
+        #  Position of the answer in the candidates of each row (-1 if it's not in the candidates)
+        self.answer_positions: list[int] = []
+        positions_of_candidates: dict[int, dict] = {}
+        for row in self.rows:
+            if fixed_choices is not None:
+                self.answer_positions.append(fixed_choices.index(row.answer))
+                continue
+            #  The rows often share the same tuple of candidates, its positions are only computed once
+            positions = positions_of_candidates.get(id(row.candidates))
+            if positions is None:
+                positions = positions_of_candidates[id(row.candidates)] = {
+                    candidate: position for position, candidate in enumerate(row.candidates)}
+            position = positions.get(row.answer, -1)
+            if len(row.candidates) - (position >= 0) < k:
+                raise ValueError(f'The question "{question_name}" has only {len(row.candidates) - (position >= 0)} '
+                                 f'different wrong answers for {row.fields}, {k} are needed.')
+            self.answer_positions.append(position)
+        self.cumulative_weights = list(accumulate(row.weight for row in self.rows))
+        self.total_weight = self.cumulative_weights[-1]
+        self.uniform = len({row.weight for row in self.rows}) == 1
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def draw_index(self, rng) -> int:
+        """
+        returns the index of a random row, each row is drawn with the probability weight / total_weight
+        """
+        if self.uniform:
+            return rng.randrange(len(self.rows))
+        return bisect(self.cumulative_weights, rng.random() * self.total_weight, 0, len(self.rows) - 1)
+
+    def choices_of(self, index: int, rng) -> tuple[list, int]:
+        """
+        returns the suggested answers of a row (the answer and k wrong answers, shuffled) and the index of the answer
+        """
+        row = self.rows[index]
+        position = self.answer_positions[index]
+        if self.fixed_choices is not None:
+            return list(self.fixed_choices), position
+        candidates = row.candidates
+        #  k positions among the candidates that are not the answer: the positions after the answer are shifted
+        picked = rng.sample(range(len(candidates) - (position >= 0)), self.k)
+        return make_choices(row.answer, [candidates[i + 1 if 0 <= position <= i else i] for i in picked], rng=rng)
+
+    def draw(self, rng) -> tuple[int, dict, list, int]:
+        """
+        :return: the index of the row, the fields of the sentence, the suggested answers and the index of the answer
+        """
+        index = self.draw_index(rng)
+        choices, index_answer = self.choices_of(index, rng)
+        return index, self.rows[index].fields, choices, index_answer
+
+    def probabilities(self) -> list[float]:
+        return [row.weight / self.total_weight for row in self.rows]
+
+    def stats(self, draws: int = 20) -> dict:
+        """
+        :param draws: number of questions of a quiz
+        :return: the size of the space, the extreme probabilities of the rows, and the expected number of different
+        rows in a quiz of "draws" questions of this kind (sum of the probabilities to draw each row at least once)
+        """
+        probabilities = self.probabilities()
+        return {'question_name': self.question_name,
+                'size': len(self.rows),
+                'answers': len(set(row.answer for row in self.rows)),
+                'min_probability': min(probabilities),
+                'max_probability': max(probabilities),
+                'expected_distinct': round(sum(1 - (1 - probability) ** draws for probability in probabilities), 2)}
+
+
+#  (subject, name of the enumeration function, parameters) -> space, or None if the space is too large
+_question_spaces: dict[tuple, Optional[QuestionSpace]] = {}
+
+
+def get_question_space(subject: str, enumerate_rows: Callable[..., Iterator[SpaceRow]], *parameters,
+                       fixed_choices: Optional[tuple] = None) -> Optional[QuestionSpace]:
+    """
+    Returns the space of a question for these parameters, and lists it if this is the first call of the process.
+    The spaces don't depend on the format, so the subjects of both formats share them.
+
+    :param enumerate_rows: function called with the parameters that yields all the rows of the space
+    :param parameters: the parameters of the question (hashable), e.g. its interval
+    :return: None if the space has more than MAX_SPACE_SIZE rows
+    """
+    key = (subject, enumerate_rows.__name__, parameters)
+    if key in _question_spaces:
+        return _question_spaces[key]
+    rows = []
+    for row in enumerate_rows(*parameters):
+        rows.append(row)
+        if len(rows) > MAX_SPACE_SIZE:
+            space = None
+            break
+    else:
+        question_name = enumerate_rows.__name__.removeprefix('enumerate_')
+        space = QuestionSpace(question_name, rows, fixed_choices=fixed_choices)
+    _question_spaces[key] = space
+    return space
+
+
+def all_question_spaces() -> dict[tuple, QuestionSpace]:
+    """
+    The spaces listed until now, by (subject, enumeration function, parameters)
+    """
+    return {key: space for key, space in _question_spaces.items() if space is not None}
+
+
+def print_stats(draws: int = 20):
+    import multiple_choice_quiz
+    multiple_choice_quiz.build_question_spaces()
+    print(f"{'question':<52}  {'size':>6}  {'answers':>7}  {'min p':>8}  {'max p':>8}  distinct in {draws}")
+    for (subject, _, _), space in all_question_spaces().items():
+        stats = space.stats(draws)
+        print(f"{subject + '/' + stats['question_name']:<52}  {stats['size']:>6}  {stats['answers']:>7}  "
+              f"{stats['min_probability']:>8.4f}  {stats['max_probability']:>8.4f}  {stats['expected_distinct']}")
+
+
+if __name__ == '__main__':
+    #  The spaces are kept in the module imported by the quiz, which is not this script (__main__)
+    import question_space
+    question_space.print_stats()
@@ -0,0 +1,51 @@
+"""
+Question templates | MathQuiz
+
+The sentences of the questions ("Combien font {l}{n1}{times}{n2}{l} ?") are parsed only once for each format (latex
+or not), instead of at each str.format. The fields that only depend on the format ({l}, {times}...) are written
+directly in the texts of the template, so rendering a question is only a "%" of the texts with the values drawn.
+"""
+from string import Formatter
+from typing import Iterable
+
+
+class Template:
+    __slots__ = ('sentence', 'texts', 'fields', 'pattern')
+
+    def __init__(self, sentence: str, constants: dict[str, str]):
+        """
+        :param sentence: sentence with fields, e.g. 'Combien font {l}{n1}{times}{n2}{l} ?'
+        :param constants: value of the fields that are the same for all the questions of the format, e.g. {'l': '$'}
+        """
+        self.sentence = sentence
+        texts = ['']
+        fields = []
+        for text, field, format_spec, conversion in Formatter().parse(sentence):
+            texts[-1] += text
+            if field is None:
+                continue
+            if format_spec or conversion:
+                raise ValueError(f'The field "{field}" of the template "{sentence}" has a format, it is not supported.')
+            if field in constants:
+                texts[-1] += str(constants[field])
+            else:
+                fields.append(field)
+                texts.append('')
+        #  texts has one more item than fields: the question is texts[0] + fields[0] + texts[1] + ...
+        self.texts = tuple(texts)
+        self.fields = tuple(fields)
+        #  e.g. 'Combien font $%s\\times%s$ ?', the values are written with str() like str.format does
+        self.pattern = '%s'.join(text.replace('%', '%%') for text in texts)
+
+    def render(self, values: dict) -> str:
+        """
+        :raise KeyError: if a field of the template is not in the values
+        """
+        return self.pattern % tuple([values[field] for field in self.fields])
+
+    def __repr__(self):
+        return f'Template({self.sentence!r})'
+
+
+def compile_sentences(sentences: Iterable[str], constants: dict[str, str]) -> tuple[Template, ...]:
+    return tuple(Template(sentence, constants) for sentence in sentences)
@@ -0,0 +1,202 @@
+"""
+Quiz sessions | MathQuiz
+
+With /api/score, the client keeps all the questions and sends at the end whether each answer was correct and how long
+it took. With a session, the questions stay on the server: the client fetches them one by one, sends only the index of
+its answer, and the server checks it, measures the time itself and updates the score at each answer.
+
+A session is kept as compact as possible (the questions are already serialized, the answers and the times are in
+arrays), and the sessions are kept in a store limited in number of sessions (the least recently used is removed) and
+in time (a session not used for ttl seconds expires), so the memory used by the sessions is bounded.
+"""
+import secrets
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+
+from multiple_choice_quiz import answer_points
+from serialization import dump_public_question
+
+Value = TypeVar('Value')
+
+#  Values of the asked_at array
+NOT_ASKED = 0.0
+
+
+class SessionError(Exception):
+    """
+    Base class of the errors of a session, status_code is the HTTP status returned by the API.
+    """
+    status_code = 400
+
+
+class SessionNotFound(SessionError):
+    status_code = 404
+
+
+class InvalidQuestionIndex(SessionError):
+    status_code = 400
+
+
+class AnswerConflict(SessionError):
+    status_code = 409
+
+
+class BoundedStore(Generic[Value]):
+    def __init__(self, *, max_items: int = 10_000, ttl: float = 3600, clock: Callable[[], float] = time.monotonic):
+        """
+        Dictionary limited in size (least recently used items are removed first) and in time (an item not used for
+        ttl seconds expires).
+
+        :param max_items: maximal number of items kept
+        :param ttl: number of seconds after the last use of an item before it expires
+        :param clock: function that returns the current time in seconds
+        """
+        assert max_items > 0 and ttl > 0
+        self.max_items = max_items
+        self.ttl = ttl
+        self.clock = clock
+        #  Ordered from the least to the most recently used, so the expired items are always at the beginning
+        self._items: OrderedDict[str, tuple[float, Value]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'evicted': 0, 'expired': 0}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _purge(self, now: float):
+        while self._items:
+            key, (last_access, _) = next(iter(self._items.items()))
+            if now - last_access < self.ttl:
+                break
+            del self._items[key]
+            self.stats['expired'] += 1
+
+    def add(self, key: str, value: Value):
+        with self._lock:
+            now = self.clock()
+            self._purge(now)
+            self._items[key] = (now, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.stats['evicted'] += 1
+
+    def get(self, key: str) -> Optional[Value]:
+        """
+        Returns the item (and marks it as used) or None if it doesn't exist or has expired.
+        """
+        with self._lock:
+            now = self.clock()
+            self._purge(now)
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items[key] = (now, item[1])
+            self._items.move_to_end(key)
+            return item[1]
+
+    def pop(self, key: str) -> Optional[Value]:
+        """
+        Removes the item and returns it, or None if it doesn't exist or has expired.
+        """
+        with self._lock:
+            self._purge(self.clock())
+            item = self._items.pop(key, None)
+            return None if item is None else item[1]
+
+    def metrics(self) -> dict:
+        return {'items': len(self._items), 'max_items': self.max_items, 'ttl': self.ttl, **self.stats}
+
+
+class QuizSession:
+    __slots__ = ('questions', 'answer_indices', 'asked_at', 'answered', 'correct_answers', 'score', 'created_at',
+                 '_lock')
+
+    def __init__(self, questions: Iterable[dict], *, clock: Callable[[], float] = time.monotonic):
+        """
+        :param questions: the questions of the quiz (from generate_mcq_batch)
+        """
+        questions = list(questions)
+        #  The questions are sent without their answer, so they are serialized once here
+        self.questions: tuple[bytes, ...] = tuple(dump_public_question(question) for question in questions)
+        self.answer_indices = bytes(question['index_answer'] for question in questions)
+        #  Time of the first fetch of each question (NOT_ASKED if not fetched yet)
+        self.asked_at = array('d', [NOT_ASKED]) * len(questions)
+        #  0: not answered, 1: wrong answer, 2: right answer
+        self.answered = bytearray(len(questions))
+        self.correct_answers = 0
+        self.score = 0.0
+        self.created_at = clock()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def _check_index(self, index: int):
+        if not 0 <= index < len(self.questions):
+            raise InvalidQuestionIndex(f'The question {index} does not exist, the quiz has {len(self)} questions.')
+
+    def get_question(self, index: int, *, now: float) -> bytes:
+        """
+        Returns the serialized question, and starts its timer if it's the first time it's fetched.
+        """
+        self._check_index(index)
+        with self._lock:
+            if self.asked_at[index] == NOT_ASKED:
+                self.asked_at[index] = now
+        return self.questions[index]
+
+    def answer(self, index: int, answer_index: int, *, now: float, base_points: int = 100,
+               decay_rate: float = 0.5) -> dict:
+        """
+        Checks the answer of a question and adds its points to the score (same formula as calculate_score).
+        """
+        self._check_index(index)
+        with self._lock:
+            if self.asked_at[index] == NOT_ASKED:
+                raise AnswerConflict(f'The question {index} has not been fetched yet.')
+            if self.answered[index]:
+                raise AnswerConflict(f'The question {index} has already been answered.')
+            time_taken = now - self.asked_at[index]
+            correct = answer_index == self.answer_indices[index]
+            self.answered[index] = 2 if correct else 1
+            if correct:
+                self.correct_answers += 1
+                self.score += answer_points(time_taken, base_points=base_points, decay_rate=decay_rate)
+        return {'correct': correct, 'index_answer': self.answer_indices[index], 'timeTaken': time_taken,
+                'score': round(self.score, 0)}
+
+    def summary(self) -> dict:
+        return {'count': len(self), 'answered': len(self) - self.answered.count(0),
+                'correct': self.correct_answers, 'score': round(self.score, 0), 'finished': 0 not in self.answered}
+
+
+class SessionManager:
+    def __init__(self, *, max_sessions: int = 10_000, ttl: float = 3600, clock: Callable[[], float] = time.monotonic):
+        """
+        :param max_sessions: maximal number of sessions kept in memory
+        :param ttl: number of seconds without request before a session expires
+        """
+        self.clock = clock
+        self.store: BoundedStore[QuizSession] = BoundedStore(max_items=max_sessions, ttl=ttl, clock=clock)
+
+    def create(self, questions: Iterable[dict]) -> tuple[str, QuizSession]:
+        session_id = secrets.token_urlsafe(16)
+        session = QuizSession(questions, clock=self.clock)
+        self.store.add(session_id, session)
+        return session_id, session
+
+    def get(self, session_id: str) -> QuizSession:
+        session = self.store.get(session_id)
+        if session is None:
+            raise SessionNotFound(f'The session {session_id} does not exist or has expired.')
+        return session
+
+    def get_question(self, session_id: str, index: int) -> bytes:
+        return self.get(session_id).get_question(index, now=self.clock())
+
+    def answer(self, session_id: str, index: int, answer_index: int) -> dict:
+        return self.get(session_id).answer(index, answer_index, now=self.clock())
@@ -0,0 +1,27 @@
+"""
+Random generators | MathQuiz
+
+All the questions draw their random values from a random.Random object given in their "rng" argument, instead of
+the functions of the random module. With the same seed, we get the same question, and each worker (or each batch)
+can have its own generator without sharing a global state.
+"""
+from random import Random
+from typing import Union, Optional
+
+#  A random.Random object, or a seed to create one
+RandomSource = Optional[Union[Random, int, float, str, bytes]]
+
+#  Generator used when no generator or seed is given
+default_rng = Random()
+
+
+def get_rng(source: RandomSource = None) -> Random:
+    """
+    Returns the generator of the source: the source itself if it's already a generator, a new generator if it's a
+    seed, or the default generator of the process if it's None.
+    """
+    if source is None:
+        return default_rng
+    if isinstance(source, Random):
+        return source
+    return Random(source)
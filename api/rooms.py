@@ -0,0 +1,283 @@
+"""
+Rooms | MathQuiz
+
+Live games, like kahoot: a host opens a room, the players join it with its PIN over a WebSocket and the server sends
+the same question to every player at the same time.
+
+Each question is serialized only once and the same bytes are written to all the sockets. Every player has its own
+small outbox and its own writer task: a slow client only fills its outbox (its oldest messages are dropped) and is
+disconnected if a write takes too long, so it never stalls the other players of the room.
+"""
+import asyncio
+import secrets
+import time
+from collections import deque
+from functools import partial
+from typing import Awaitable, Callable, Optional, Union
+
+from leaderboard import Leaderboard
+from multiple_choice_quiz import generate_mcq_question, normalise_subjects
+from quiz_session import BoundedStore
+from rng import RandomSource, get_rng
+from seen_questions import SeenQuestions
+from serialization import JSON, PUBLIC_QUESTION_FIELDS, encode
+
+Send = Callable[[bytes], Awaitable[None]]
+
+
+class RoomError(Exception):
+    """
+    Error of a room, status_code is the HTTP status (or the WebSocket close reason) returned by the API.
+    """
+    status_code = 400
+
+
+class RoomNotFound(RoomError):
+    status_code = 404
+
+
+class RoomConflict(RoomError):
+    status_code = 409
+
+
+def make_message(message_type: str, **data) -> dict:
+    return {'type': message_type, **data}
+
+
+class Connection:
+    def __init__(self, name: str, send: Send, *, max_pending: int = 8, send_timeout: float = 5.0,
+                 response_format: str = JSON):
+        """
+        A player (or the host) connected to a room.
+
+        :param send: coroutine function that writes bytes to the socket
+        :param response_format: format of the messages sent to the client, JSON or MSGPACK (see serialization)
+        :param max_pending: number of messages waiting to be sent before the oldest ones are dropped
+        :param send_timeout: number of seconds a write can take before the client is disconnected
+        """
+        self.name = name
+        self.send = send
+        self.send_timeout = send_timeout
+        self.response_format = response_format
+        self.outbox: deque[bytes] = deque(maxlen=max_pending)
+        self.dropped = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+        self.correct_answers = 0
+        self.last_answered = -1  # index of the last question answered
+
+    def push(self, payload: bytes):
+        """
+        Adds a message to the outbox without waiting, the writer task sends it.
+        """
+        if self.closed:
+            return
+        if len(self.outbox) == self.outbox.maxlen:
+            self.dropped += 1
+        self.outbox.append(payload)
+        self._ready.set()
+
+    def push_message(self, message: dict):
+        self.push(encode(message, self.response_format))
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def writer(self):
+        """
+        Sends the messages of the outbox until the connection is closed.
+        """
+        try:
+            while not self.closed:
+                await self._ready.wait()
+                self._ready.clear()
+                while self.outbox and not self.closed:
+                    await asyncio.wait_for(self.send(self.outbox.popleft()), self.send_timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            #  Too slow or gone: the reader of the socket will see it and leave the room
+            self.closed = True
+
+
+class Room:
+    def __init__(self, pin: str, subjects: Union[list[str], str] = '*', *, latex: bool = True,
+                 rng: RandomSource = None, max_players: int = 1000, leaderboard_size: int = 10,
+                 clock: Callable[[], float] = time.monotonic, on_activity: Optional[Callable[[], object]] = None):
+        """
+        :param pin: code given to the players to join the room
+        :param subjects: subjects of the questions of the game
+        :param latex: format of the questions
+        :param max_players: maximal number of players in the room
+        :param leaderboard_size: number of players of the leaderboard sent to the players
+        :param on_activity: function called when a question is asked or answered (the RoomManager keeps the room alive)
+        """
+        self.pin = pin
+        self.host_token = secrets.token_urlsafe(16)
+        self.subjects = normalise_subjects(subjects)
+        self.latex = latex
+        self.rng = get_rng(rng)
+        #  The questions of the game are not asked twice
+        self.seen = SeenQuestions()
+        self.max_players = max_players
+        self.clock = clock
+        self.on_activity = on_activity
+        self.players: dict[str, Connection] = {}
+        self.host: Optional[Connection] = None
+        self.question_index = -1
+        self.index_answer: Optional[int] = None
+        self.asked_at = 0.0
+        self.answers = 0  # number of answers to the current question
+        self.finished = False
+        #  The players that leave the room stay in the leaderboard, and get their score back if they join again
+        self.leaderboard = Leaderboard()
+        self.leaderboard_size = leaderboard_size
+        self.leaderboard_version: Optional[int] = None  # version of the last leaderboard sent to the players
+
+    def touch(self):
+        if self.on_activity is not None:
+            self.on_activity()
+
+    def broadcast(self, message: dict, *, with_host: bool = False) -> dict[str, bytes]:
+        """
+        Serializes the message once for each format used in the room and writes the same bytes in the outbox of every
+        player.
+
+        :return: the bytes sent for each format
+        """
+        payloads = {}
+        connections = list(self.players.values())
+        if with_host and self.host is not None:
+            connections.append(self.host)
+        for connection in connections:
+            payload = payloads.get(connection.response_format)
+            if payload is None:
+                payload = payloads[connection.response_format] = encode(message, connection.response_format)
+            connection.push(payload)
+        return payloads
+
+    def notify_host(self, message_type: str, **data):
+        if self.host is not None:
+            self.host.push_message(make_message(message_type, **data))
+
+    def join(self, name: str, send: Send, **connection_settings) -> Connection:
+        if self.finished:
+            raise RoomConflict(f'The game of the room {self.pin} is finished.')
+        if name in self.players:
+            raise RoomConflict(f'The name {name!r} is already used in the room {self.pin}.')
+        if len(self.players) >= self.max_players:
+            raise RoomConflict(f'The room {self.pin} is full ({self.max_players} players).')
+        connection = self.players[name] = Connection(name, send, **connection_settings)
+        self.leaderboard.add_player(name)
+        connection.push_message(make_message('joined', pin=self.pin, name=name, question_index=self.question_index,
+                                     leaderboard=self.leaderboard.delta(None, self.leaderboard_size)))
+        self.notify_host('players', count=len(self.players))
+        return connection
+
+    def leave(self, name: str):
+        connection = self.players.pop(name, None)
+        if connection is not None:
+            connection.close()
+            self.notify_host('players', count=len(self.players))
+
+    def broadcast_leaderboard(self):
+        """
+        Sends to all the players the rows of the leaderboard that changed since the last one sent.
+        """
+        delta = self.leaderboard.delta(self.leaderboard_version, self.leaderboard_size)
+        self.leaderboard_version = delta['version']
+        self.broadcast(make_message('leaderboard', **delta), with_host=True)
+
+    def next_question(self) -> dict[str, bytes]:
+        """
+        Generates the next question and sends it to all the players.
+
+        :return: the bytes sent to the players, for each format
+        """
+        if self.finished:
+            raise RoomConflict(f'The game of the room {self.pin} is finished.')
+        self.touch()
+        if self.question_index >= 0:
+            self.broadcast_leaderboard()
+        question_data = generate_mcq_question(self.subjects, latex=self.latex, rng=self.rng, seen=self.seen)
+        self.question_index += 1
+        self.index_answer = question_data['index_answer']
+        self.answers = 0
+        #  Serialized once for all the players
+        message = make_message('question', index=self.question_index,
+                               **{field: question_data[field] for field in PUBLIC_QUESTION_FIELDS})
+        self.asked_at = self.clock()
+        return self.broadcast(message)
+
+    def answer(self, name: str, question_index: int, answer_index: int) -> dict:
+        """
+        Checks the answer of a player to the current question and adds its points to the leaderboard (same formula as
+        calculate_score).
+        """
+        connection = self.players.get(name)
+        if connection is None:
+            raise RoomNotFound(f'The player {name!r} is not in the room {self.pin}.')
+        if question_index != self.question_index or self.index_answer is None:
+            raise RoomConflict(f'The question {question_index} is not the current question.')
+        if connection.last_answered == question_index:
+            raise RoomConflict(f'The question {question_index} has already been answered.')
+        self.touch()
+        time_taken = self.clock() - self.asked_at
+        correct = answer_index == self.index_answer
+        connection.last_answered = question_index
+        if correct:
+            connection.correct_answers += 1
+        score = self.leaderboard.record_answer(name, correct, time_taken)
+        self.answers += 1
+        self.notify_host('answers', index=question_index, count=self.answers, players=len(self.players))
+        result = {'index': question_index, 'correct': correct, 'index_answer': self.index_answer,
+                  'timeTaken': time_taken, 'score': round(score, 0), 'rank': self.leaderboard.rank(name)}
+        connection.push_message(make_message('result', **result))
+        return result
+
+    def ranking(self, k: Optional[int] = None) -> list[dict]:
+        return self.leaderboard.top(self.leaderboard_size if k is None else k)
+
+    def end(self) -> dict[str, bytes]:
+        self.finished = True
+        return self.broadcast(make_message('end', ranking=self.ranking(), players=len(self.leaderboard)),
+                              with_host=True)
+
+
+class RoomManager:
+    def __init__(self, *, max_rooms: int = 1000, ttl: float = 3 * 3600, max_players: int = 1000):
+        """
+        :param max_rooms: maximal number of rooms kept in memory
+        :param ttl: number of seconds without activity before a room expires
+        :param max_players: maximal number of players of a room
+        """
+        self.max_players = max_players
+        self.rooms: BoundedStore[Room] = BoundedStore(max_items=max_rooms, ttl=ttl)
+
+    def create(self, subjects: Union[list[str], str] = '*', *, latex: bool = True, rng: RandomSource = None) -> Room:
+        pin = f'{secrets.randbelow(1_000_000):06}'
+        while self.rooms.get(pin) is not None:
+            pin = f'{secrets.randbelow(1_000_000):06}'
+        #  A game in progress is used (so not expired nor evicted) at each question and each answer, not only when a
+        #  player joins
+        room = Room(pin, subjects, latex=latex, rng=rng, max_players=self.max_players,
+                    on_activity=partial(self.rooms.get, pin))
+        self.rooms.add(pin, room)
+        return room
+
+    def get(self, pin: str) -> Room:
+        room = self.rooms.get(pin)
+        if room is None:
+            raise RoomNotFound(f'The room {pin} does not exist.')
+        return room
+
+    def get_host(self, pin: str, token: str) -> Room:
+        room = self.get(pin)
+        if not secrets.compare_digest(room.host_token, token):
+            raise RoomNotFound(f'The room {pin} does not exist.')
+        return room
+
+    def close(self, pin: str):
+        room = self.rooms.pop(pin)
+        if room is not None:
+            for name in list(room.players):
+                room.leave(name)
@@ -0,0 +1,85 @@
+"""
+Sampling | MathQuiz
+
+Random draws of integers in an interval without some forbidden values. Instead of drawing again until we get an
+allowed value (which gets slower when the forbidden values cover most of the interval, and never ends when they
+cover all of it), we draw the rank of the value among the allowed ones, then shift it past the forbidden values.
+The cost only depends on the number of forbidden values, not on the width of the interval.
+
+The wrong answers (distractors) of the questions follow the same idea: all the possible wrong answers are listed
+first, then k of them are picked at once, or a clear error is raised if there are not enough of them.
+"""
+from random import Random
+from typing import Iterable
+
+
+def sample_excluding(lo: int, hi: int, excluded: Iterable[int] = (), *, rng: Random) -> int:
+    """
+    returns a random integer of the interval [lo; hi] that is not in the excluded values (uniformly).
+    :raise ValueError: if all the values of the interval are excluded
+    """
+    forbidden = sorted({value for value in excluded if lo <= value <= hi})
+    size = hi - lo + 1 - len(forbidden)
+    if size <= 0:
+        raise ValueError(f'All the values of the interval [{lo}; {hi}] are forbidden.')
+    value = lo + rng.randrange(size)
+    #  value is the "rank" of the result among the allowed values, each forbidden value before it shifts it by one
+    for forbidden_value in forbidden:
+        if forbidden_value > value:
+            break
+        value += 1
+    return value
+
+
+def sample_distinct_excluding(lo: int, hi: int, k: int, excluded: Iterable[int] = (), *, rng: Random) -> list[int]:
+    """
+    returns k different random integers of the interval [lo; hi] that are not in the excluded values.
+    :raise ValueError: if the interval doesn't have k allowed values
+    """
+    forbidden = {value for value in excluded if lo <= value <= hi}
+    if hi - lo + 1 - len(forbidden) < k:
+        raise ValueError(f'The interval [{lo}; {hi}] does not have {k} values that are not forbidden.')
+    result = []
+    for _ in range(k):
+        value = sample_excluding(lo, hi, forbidden, rng=rng)
+        forbidden.add(value)
+        result.append(value)
+    return result
+
+
+class NotEnoughCandidates(ValueError):
+    """
+    The configuration of a question doesn't have enough distinct wrong answers.
+    """
+
+
+def sample_distractors(candidates: Iterable, k: int = 3, *, answer=None, excluded: Iterable = (),
+                       rng: Random) -> list:
+    """
+    Picks k different wrong answers (distractors) among the candidates. The candidates are all built before the draw,
+    so the time only depends on their number, instead of drawing again and again until we get k different values.
+
+    :param candidates: all the values that can be a wrong answer (the duplicates are removed)
+    :param answer: the good answer, it's never picked
+    :param excluded: other values that must not be picked
+    :raise NotEnoughCandidates: if there are less than k different candidates
+    """
+    excluded = set(excluded)
+    excluded.add(answer)
+    pool = [candidate for candidate in dict.fromkeys(candidates) if candidate not in excluded]
+    if len(pool) < k:
+        answer_text = f' (answer: {answer!r})' if answer is not None else ''
+        raise NotEnoughCandidates(f'Only {len(pool)} different wrong answers are possible{answer_text}, '
+                                  f'{k} are needed.')
+    return rng.sample(pool, k)
+
+
+def make_choices(answer, distractors: list, *, rng: Random) -> tuple[list, int]:
+    """
+    Shuffles the answer with the distractors.
+
+    :return: the suggested answers and the index of the good answer
+    """
+    values = [answer] + list(distractors)
+    rng.shuffle(values)
+    return values, values.index(answer)
@@ -0,0 +1,110 @@
+"""
+Seen questions | MathQuiz
+
+Each question is drawn independently, so with the small spaces (3 shapes, 28 binary numbers...) a quiz of 20
+questions often asks the same question twice. A SeenQuestions object remembers the questions already asked to a
+player (or in a session, or in a room), and the draws ask again for another question when they get one of them.
+
+A question is identified by its fingerprint: its subject, its name and the values drawn, not its text (the sentence and
+the order of the suggested answers are drawn too, they don't make another question). The memory is fixed:
+- the questions drawn in a listed space (see question_space) are a bit in a bitset of the size of the space, exact;
+- the others are hashed in a small Bloom filter, which can wrongly say that a new question was already seen, which
+  only costs one more draw.
+When a space is exhausted, or the filter is full, it's cleared, so a player can always get questions.
+"""
+from hashlib import blake2b
+from typing import Optional
+
+#  Number of times a question can be drawn again when it was already seen, the last one is kept anyway
+MAX_REDRAWS = 8
+
+
+def question_fingerprint(spec) -> int:
+    """
+    returns a 64 bits integer that identifies the question (see QuestionSpec): the same for all the draws of the same
+    values, whatever the sentence and the order of the suggested answers. It's the same in all the processes.
+    """
+    key = repr((spec.subject, spec.question_name, sorted(spec.fields.items())))
+    return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), 'little')
+
+
+class SeenQuestions:
+    __slots__ = ('bloom', 'bloom_bits', 'hashes', 'capacity', 'bloom_count', 'rows', 'count')
+
+    def __init__(self, *, bloom_bits: int = 4096, hashes: int = 3):
+        """
+        :param bloom_bits: size of the Bloom filter, a multiple of 8. It's cleared after bloom_bits / 10 questions,
+        so the probability that a new question is taken for a seen one stays under 2%.
+        :param hashes: number of bits of the filter set for each question
+        """
+        assert bloom_bits > 0 and bloom_bits % 8 == 0 and hashes > 0
+        self.bloom_bits = bloom_bits
+        self.hashes = hashes
+        self.capacity = max(bloom_bits // 10, 1)
+        self.bloom = bytearray(bloom_bits // 8)
+        self.bloom_count = 0
+        #  (subject, question_name) -> bitset of the rows seen in the listed space of the question
+        self.rows: dict[tuple[str, str], int] = {}
+        self.count = 0  # number of questions added
+
+    def _bloom_positions(self, spec) -> list[int]:
+        fingerprint = question_fingerprint(spec)
+        #  Double hashing: the k positions come from the two halves of the fingerprint
+        low, high = fingerprint & 0xFFFFFFFF, fingerprint >> 32 | 1
+        return [(low + i * high) % self.bloom_bits for i in range(self.hashes)]
+
+    def __contains__(self, spec) -> bool:
+        if spec.row is not None:
+            index, _ = spec.row
+            return bool(self.rows.get((spec.subject, spec.question_name), 0) >> index & 1)
+        bloom = self.bloom
+        return all(bloom[position >> 3] >> (position & 7) & 1 for position in self._bloom_positions(spec))
+
+    def add(self, spec):
+        self.count += 1
+        if spec.row is not None:
+            index, size = spec.row
+            key = (spec.subject, spec.question_name)
+            bits = self.rows.get(key, 0) | 1 << index
+            #  All the questions of the space were seen: they can all be asked again, except the last one
+            self.rows[key] = 1 << index if bits == (1 << size) - 1 else bits
+            return
+        if self.bloom_count >= self.capacity:
+            self.bloom = bytearray(self.bloom_bits // 8)
+            self.bloom_count = 0
+        self.bloom_count += 1
+        for position in self._bloom_positions(spec):
+            self.bloom[position >> 3] |= 1 << (position & 7)
+
+    def clear(self):
+        self.bloom = bytearray(self.bloom_bits // 8)
+        self.bloom_count = 0
+        self.rows.clear()
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def nbytes(self) -> int:
+        """
+        Approximate size of the filters in bytes (the bitsets are at most the size of their space, see MAX_SPACE_SIZE)
+        """
+        return len(self.bloom) + sum((bits.bit_length() + 7) // 8 for bits in self.rows.values())
+
+
+def draw_unseen(draw_once, seen: Optional[SeenQuestions], max_redraws: int = MAX_REDRAWS):
+    """
+    Calls draw_once until it returns a question that is not in seen (at most max_redraws + 1 times), and adds it.
+
+    :param draw_once: function without argument that returns a QuestionSpec
+    :param seen: the questions already asked, None to keep the first question drawn
+    """
+    spec = draw_once()
+    if seen is None:
+        return spec
+    for _ in range(max_redraws):
+        if spec not in seen:
+            break
+        spec = draw_once()
+    seen.add(spec)
+    return spec
@@ -0,0 +1,249 @@
+"""
+Serialization | MathQuiz
+
+The questions are generated by our own functions, so we trust their output and serialize them directly with orjson,
+without the validation of the pydantic models. The keys are written in the same order as the QuestionData model of
+main.py, so the bytes are the same as the default JSON response of FastAPI.
+
+A client can also ask (with the Accept header) for MessagePack, a binary format more compact than JSON and faster to
+decode, e.g. for the batches and the WebSocket messages. The encoder below only handles the types of our payloads
+(None, bool, int, float, str, bytes, list, tuple and dict), so no dependency is needed. The large responses are
+compressed with gzip if the client accepts it.
+"""
+import gzip
+import struct
+from typing import Any, Optional
+
+import orjson
+
+QUESTION_FIELDS = ('question', 'suggested_answer', 'index_answer', 'question_name', 'subject')
+
+JSON = 'json'
+MSGPACK = 'msgpack'
+MEDIA_TYPES = {JSON: 'application/json', MSGPACK: 'application/msgpack'}
+#  Media types of MessagePack found in the Accept header
+MSGPACK_MEDIA_TYPES = ('application/msgpack', 'application/x-msgpack', 'application/vnd.msgpack')
+#  Under this size (about one network packet), gzip saves almost nothing
+GZIP_MIN_SIZE = 1400
+
+
+def dump_question(question_data: dict) -> bytes:
+    """
+    Serializes a question (from generate_mcq_question) to JSON bytes.
+    """
+    return orjson.dumps({field: question_data[field] for field in QUESTION_FIELDS})
+
+
+#  The questions of a quiz session are sent without their answer, the server checks it
+PUBLIC_QUESTION_FIELDS = tuple(field for field in QUESTION_FIELDS if field != 'index_answer')
+
+
+def dump_public_question(question_data: dict) -> bytes:
+    """
+    Serializes a question without its answer (index_answer) to JSON bytes.
+    """
+    return orjson.dumps({field: question_data[field] for field in PUBLIC_QUESTION_FIELDS})
+
+
+def dump_quiz(questions: list[dict]) -> bytes:
+    """
+    Serializes a batch of questions (from generate_mcq_batch) to JSON bytes, like the QuizData model of main.py.
+    """
+    return orjson.dumps({'questions': [{field: question_data[field] for field in QUESTION_FIELDS}
+                                       for question_data in questions]})
+
+
+def _pack(value: Any, buffer: bytearray):
+    if value is None:
+        buffer.append(0xc0)
+    elif value is True:
+        buffer.append(0xc3)
+    elif value is False:
+        buffer.append(0xc2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            buffer.append(value)
+        elif -0x20 <= value < 0:
+            buffer.append(value & 0xff)
+        elif value >= 0:
+            for code, form, limit in ((0xcc, '>B', 1 << 8), (0xcd, '>H', 1 << 16), (0xce, '>I', 1 << 32),
+                                      (0xcf, '>Q', 1 << 64)):
+                if value < limit:
+                    buffer.append(code)
+                    buffer += struct.pack(form, value)
+                    break
+            else:
+                raise OverflowError(f'{value} is too big for MessagePack.')
+        else:
+            for code, form, limit in ((0xd0, '>b', 1 << 7), (0xd1, '>h', 1 << 15), (0xd2, '>i', 1 << 31),
+                                      (0xd3, '>q', 1 << 63)):
+                if value >= -limit:
+                    buffer.append(code)
+                    buffer += struct.pack(form, value)
+                    break
+            else:
+                raise OverflowError(f'{value} is too small for MessagePack.')
+    elif isinstance(value, float):
+        buffer.append(0xcb)
+        buffer += struct.pack('>d', value)
+    elif isinstance(value, str):
+        data = value.encode()
+        _pack_header(len(data), buffer, fix=(0xa0, 32), codes=((0xd9, '>B'), (0xda, '>H'), (0xdb, '>I')))
+        buffer += data
+    elif isinstance(value, (bytes, bytearray)):
+        _pack_header(len(value), buffer, fix=None, codes=((0xc4, '>B'), (0xc5, '>H'), (0xc6, '>I')))
+        buffer += value
+    elif isinstance(value, (list, tuple)):
+        _pack_header(len(value), buffer, fix=(0x90, 16), codes=((0xdc, '>H'), (0xdd, '>I')))
+        for item in value:
+            _pack(item, buffer)
+    elif isinstance(value, dict):
+        _pack_header(len(value), buffer, fix=(0x80, 16), codes=((0xde, '>H'), (0xdf, '>I')))
+        for key, item in value.items():
+            _pack(key, buffer)
+            _pack(item, buffer)
+    else:
+        raise TypeError(f'Type {type(value).__name__} is not serializable with MessagePack.')
+
+
+def _pack_header(length: int, buffer: bytearray, *, fix, codes):
+    if fix is not None and length < fix[1]:
+        buffer.append(fix[0] | length)
+        return
+    for code, form in codes:
+        if length < 1 << (8 * struct.calcsize(form)):
+            buffer.append(code)
+            buffer += struct.pack(form, length)
+            return
+    raise OverflowError(f'{length} items is too long for MessagePack.')
+
+
+def pack(value: Any) -> bytes:
+    """
+    Serializes a value to MessagePack bytes.
+    """
+    buffer = bytearray()
+    _pack(value, buffer)
+    return bytes(buffer)
+
+
+def _unpack(data: bytes, position: int) -> tuple[Any, int]:
+    code = data[position]
+    position += 1
+    if code < 0x80:
+        return code, position
+    if code >= 0xe0:
+        return code - 0x100, position
+    if 0x80 <= code <= 0x8f:
+        return _unpack_map(data, position, code & 0x0f)
+    if 0x90 <= code <= 0x9f:
+        return _unpack_array(data, position, code & 0x0f)
+    if 0xa0 <= code <= 0xbf:
+        length = code & 0x1f
+        return data[position:position + length].decode(), position + length
+    if code in _CONSTANTS:
+        return _CONSTANTS[code], position
+    if code in _NUMBERS:
+        form = _NUMBERS[code]
+        return struct.unpack_from(form, data, position)[0], position + struct.calcsize(form)
+    if code in _LENGTHS:
+        kind, form = _LENGTHS[code]
+        length = struct.unpack_from(form, data, position)[0]
+        position += struct.calcsize(form)
+        if kind == 'str':
+            return data[position:position + length].decode(), position + length
+        if kind == 'bin':
+            return bytes(data[position:position + length]), position + length
+        if kind == 'array':
+            return _unpack_array(data, position, length)
+        return _unpack_map(data, position, length)
+    raise ValueError(f'Unknown MessagePack code {code:#x} at position {position - 1}.')
+
+
+def _unpack_array(data: bytes, position: int, length: int) -> tuple[list, int]:
+    items = []
+    for _ in range(length):
+        item, position = _unpack(data, position)
+        items.append(item)
+    return items, position
+
+
+def _unpack_map(data: bytes, position: int, length: int) -> tuple[dict, int]:
+    items = {}
+    for _ in range(length):
+        key, position = _unpack(data, position)
+        items[key], position = _unpack(data, position)
+    return items, position
+
+
+_CONSTANTS = {0xc0: None, 0xc2: False, 0xc3: True}
+_NUMBERS = {0xcc: '>B', 0xcd: '>H', 0xce: '>I', 0xcf: '>Q', 0xd0: '>b', 0xd1: '>h', 0xd2: '>i', 0xd3: '>q',
+            0xca: '>f', 0xcb: '>d'}
+_LENGTHS = {0xd9: ('str', '>B'), 0xda: ('str', '>H'), 0xdb: ('str', '>I'), 0xc4: ('bin', '>B'),
+            0xc5: ('bin', '>H'), 0xc6: ('bin', '>I'), 0xdc: ('array', '>H'), 0xdd: ('array', '>I'),
+            0xde: ('map', '>H'), 0xdf: ('map', '>I')}
+
+
+def unpack(data: bytes) -> Any:
+    """
+    Reads MessagePack bytes (e.g. in the tests of the clients).
+    """
+    value, position = _unpack(data, 0)
+    if position != len(data):
+        raise ValueError(f'{len(data) - position} bytes left after the MessagePack value.')
+    return value
+
+
+def parse_qualities(header: str) -> dict[str, float]:
+    """
+    Reads an Accept or Accept-Encoding header, e.g. "application/msgpack;q=0.9, application/json".
+
+    :return: the quality (q parameter, 1 by default) of each media type or encoding, in lower case
+    """
+    qualities = {}
+    for item in header.split(','):
+        value, *parameters = item.split(';')
+        value = value.strip().lower()
+        if not value:
+            continue
+        quality = 1.0
+        for parameter in parameters:
+            name, _, number = parameter.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        qualities[value] = max(quality, qualities.get(value, 0.0))
+    return qualities
+
+
+def negotiate(accept: str) -> str:
+    """
+    Chooses the format of the response with the Accept header of the request: MessagePack if the client accepts it
+    (q > 0) and doesn't prefer application/json, JSON otherwise (the default, for the existing clients).
+    """
+    qualities = parse_qualities(accept)
+    msgpack_quality = max(qualities.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    if msgpack_quality > 0 and msgpack_quality >= qualities.get('application/json', 0.0):
+        return MSGPACK
+    return JSON
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    return parse_qualities(accept_encoding).get('gzip', 0.0) > 0
+
+
+def encode(value: Any, response_format: str = JSON) -> bytes:
+    return pack(value) if response_format == MSGPACK else orjson.dumps(value)
+
+
+def compress_body(body: bytes, accept_encoding: str, *, min_size: int = GZIP_MIN_SIZE) -> tuple[bytes, Optional[str]]:
+    """
+    Compresses the body with gzip if it's large enough and the client accepts gzip.
+
+    :return: the body and its Content-Encoding (None if not compressed)
+    """
+    if len(body) >= min_size and accepts_gzip(accept_encoding):
+        return gzip.compress(body, compresslevel=6), 'gzip'
+    return body, None
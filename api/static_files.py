@@ -0,0 +1,174 @@
+"""
+Static files | MathQuiz
+
+Serves the build of the React application. All the files are read only once, when the server starts, with their
+ETag and their compressed variants (gzip, and brotli if the brotli package is installed). The variants are read from
+the disk if they were created when building (python static_files.py ../ui/build), otherwise they are compressed at
+startup. Each response is then only a lookup: the variant is chosen with the Accept-Encoding header and the browser
+gets a 304 when it already has the file.
+
+The files with a hash in their name (main.40637fe2.js) never change, so they are cached by the browser for a year.
+index.html and the other files are revalidated with their ETag at each use.
+"""
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import sys
+from typing import NamedTuple, Optional
+
+from starlette.responses import Response
+
+from serialization import parse_qualities
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, the files are only compressed with gzip
+    brotli = None
+
+logger = logging.getLogger('uvicorn.error')
+
+#  Files that are worth compressing (the images are already compressed)
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml',
+                      'image/vnd.microsoft.icon', 'image/x-icon')
+#  Name of the files built by create-react-app with the hash of their content, e.g. main.40637fe2.js
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+#  Extension of the precompressed files for each encoding, in the order of preference
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+
+class StaticFile(NamedTuple):
+    content_type: str
+    etag: str
+    cache_control: str
+    variants: dict[str, bytes]  # encoding ('identity', 'gzip', 'br') -> content
+
+
+def compress(content: bytes, encoding: str, *, best: bool = False) -> Optional[bytes]:
+    """
+    :param best: the best (and slowest) compression, for the build. At startup, a faster level is used.
+    """
+    if encoding == 'gzip':
+        return gzip.compress(content, compresslevel=9 if best else 6, mtime=0)
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(content, quality=11 if best else 9)
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def guess_type(path: str) -> str:
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+def load_file(path: str, *, min_size: int = 256) -> StaticFile:
+    with open(path, 'rb') as file:
+        content = file.read()
+    content_type = guess_type(path)
+    etag = hashlib.blake2b(content, digest_size=12).hexdigest()
+    variants = {'identity': content}
+    if is_compressible(content_type) and len(content) >= min_size:
+        for encoding, extension in ENCODINGS.items():
+            if os.path.exists(path + extension):
+                with open(path + extension, 'rb') as file:
+                    compressed = file.read()
+            else:
+                compressed = compress(content, encoding)
+            #  A variant is only kept if it's smaller
+            if compressed is not None and len(compressed) < len(content):
+                variants[encoding] = compressed
+    cache_control = IMMUTABLE_CACHE if HASHED_NAME.search(os.path.basename(path)) else REVALIDATE_CACHE
+    return StaticFile(content_type=content_type, etag=etag, cache_control=cache_control, variants=variants)
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """
+    Encodings accepted by the client, e.g. "gzip, deflate, br;q=1.0, zstd;q=0" -> {'gzip', 'deflate', 'br'}
+    """
+    return {encoding for encoding, quality in parse_qualities(accept_encoding).items() if quality > 0}
+
+
+class StaticSite:
+    def __init__(self, directory: str, *, index: str = 'index.html'):
+        """
+        Reads all the files of the directory (the build of the React application).
+
+        :param index: file returned for the paths that are not a file (the routes of the React application)
+        """
+        if not os.path.isfile(os.path.join(directory, index)):
+            raise FileNotFoundError(f'{os.path.join(directory, index)} does not exist.')
+        self.directory = directory
+        self.files: dict[str, StaticFile] = {}
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if name.endswith(tuple(ENCODINGS.values())):
+                    continue
+                path = os.path.join(root, name)
+                url = '/' + os.path.relpath(path, directory).replace(os.sep, '/')
+                self.files[url] = load_file(path)
+        self.index = self.files['/' + index]
+
+    def get(self, path: str) -> Optional[StaticFile]:
+        static_file = self.files.get(path)
+        if static_file is None and not path.startswith('/static/'):
+            #  A route of the React application
+            return self.index
+        return static_file
+
+    def response(self, path: str, headers) -> Response:
+        """
+        :param path: path of the request
+        :param headers: headers of the request
+        """
+        static_file = self.get(path)
+        if static_file is None:
+            return Response(status_code=404)
+        encodings = accepted_encodings(headers.get('accept-encoding', ''))
+        encoding = next((encoding for encoding in ENCODINGS if encoding in static_file.variants
+                         and encoding in encodings), 'identity')
+        #  The ETag depends on the variant, since its bytes are not the same
+        etag = f'"{static_file.etag}"' if encoding == 'identity' else f'"{static_file.etag}-{encoding}"'
+        response_headers = {'ETag': etag, 'Cache-Control': static_file.cache_control}
+        if len(static_file.variants) > 1:
+            response_headers['Vary'] = 'Accept-Encoding'
+        if_none_match = [tag.strip() for tag in headers.get('if-none-match', '').split(',')]
+        if etag in if_none_match or '*' in if_none_match:
+            return Response(status_code=304, headers=response_headers)
+        if encoding != 'identity':
+            response_headers['Content-Encoding'] = encoding
+        return Response(static_file.variants[encoding], headers=response_headers,
+                        media_type=static_file.content_type)
+
+
+def precompress_directory(directory: str):
+    """
+    Writes the .gz and .br variants of the files of a build, with the best compression, so the server doesn't have to
+    compress them at startup.
+    """
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            if name.endswith(tuple(ENCODINGS.values())) or not is_compressible(guess_type(path)):
+                continue
+            with open(path, 'rb') as file:
+                content = file.read()
+            for encoding, extension in ENCODINGS.items():
+                compressed = compress(content, encoding, best=True)
+                if compressed is not None and len(compressed) < len(content):
+                    with open(path + extension, 'wb') as file:
+                        file.write(compressed)
+                    logger.info(f'{path}{extension}: {len(content)} -> {len(compressed)} bytes')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    precompress_directory(sys.argv[1] if len(sys.argv) > 1 else '../ui/build')
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+#  The modules of the API are flat modules of the api directory, imported as in main.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from bulk_scoring import parse_csv_stream
+
+CSV = ('player,subject,correct,timeTaken\r\n'
+       '"a\nb",Algebra,1,0.5\r\n'
+       'c,"Geo\n\nmetry",0,1.25\r\n'
+       '"say ""hi""\n",Algebra,oui,2\n'
+       '\n'
+       'c,Algebra,true,3')
+
+
+def parse(text: str, chunk_size: int):
+    async def chunks():
+        data = text.encode()
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+    return asyncio.run(parse_csv_stream(chunks()))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 16, 1000])
+def test_quoted_newlines_are_kept_whatever_the_chunks(chunk_size):
+    columns = parse(CSV, chunk_size)
+    assert list(columns.players) == ['a\nb', 'c', 'say "hi"\n']
+    assert list(columns.subjects) == ['Algebra', 'Geo\n\nmetry']
+    assert list(columns.player) == [0, 1, 2, 1]
+    assert list(columns.correct) == [1, 0, 1, 1]
+    assert list(columns.time_taken) == [0.5, 1.25, 2.0, 3.0]
+
+
+def test_empty_upload():
+    assert len(parse('', 10)) == 0
+    assert len(parse('player,subject,correct,timeTaken\n', 10)) == 0
+
+
+def test_unclosed_quote_is_an_error():
+    with pytest.raises(ValueError):
+        parse('player,subject,correct,timeTaken\n"a,Algebra,1,0.5\nb,Algebra,0,1\n', 8)
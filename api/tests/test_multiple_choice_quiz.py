@@ -0,0 +1,17 @@
+from multiple_choice_quiz import convert_degree_into_radian, convert_value_to_latex, decomposition_prime_factor, pi
+
+
+def test_decomposition_prime_factor():
+    assert decomposition_prime_factor(42) == [2, 3, 7]
+    assert decomposition_prime_factor(-28) == [-1, 2, 2, 7]
+    assert decomposition_prime_factor(0) == []
+
+
+def test_convert_value_to_latex():
+    assert convert_value_to_latex(5) == "$5$"
+    assert convert_value_to_latex("f(x)=5x+2", center=True) == "$$f(x)=5x+2$$"
+
+
+def test_convert_degree_into_radian():
+    assert convert_degree_into_radian("-50^\\circ", latex=True) == "-\\frac{5\\pi}{18}"
+    assert convert_degree_into_radian("-45°", latex=False) == f"-{pi}/4"
@@ -0,0 +1,6 @@
+from open_answer_quiz import decomposition_prime_factor
+
+
+def test_decomposition_prime_factor():
+    assert decomposition_prime_factor(40) == [2, 2, 2, 5]
+    assert decomposition_prime_factor(-28) == [-1, 2, 2, 7]
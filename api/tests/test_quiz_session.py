@@ -0,0 +1,43 @@
+from quiz_session import BoundedStore
+
+
+def make_store(now: list[float]) -> BoundedStore[int]:
+    return BoundedStore(max_items=2, ttl=10, clock=lambda: now[0])
+
+
+def test_least_recently_used_is_evicted():
+    store = make_store([0.0])
+    store.add('a', 1)
+    store.add('b', 2)
+    assert store.get('a') == 1
+    store.add('c', 3)  # "b" is the least recently used
+    assert store.get('b') is None and store.stats['evicted'] == 1
+    assert store.get('a') == 1 and store.get('c') == 3
+
+
+def test_pop():
+    store = make_store([0.0])
+    store.add('a', 1)
+    assert store.pop('a') == 1
+    assert store.pop('a') is None
+
+
+def test_expired_items_are_not_returned():
+    now = [0.0]
+    store = make_store(now)
+    store.add('c', 3)
+    now[0] = 100
+    #  Neither get nor pop return an expired item
+    assert store.pop('c') is None and store.stats['expired'] == 1
+    store.add('d', 4)
+    now[0] = 110
+    assert store.get('d') is None and len(store) == 0
+
+
+def test_use_refreshes_the_ttl():
+    now = [0.0]
+    store = make_store(now)
+    store.add('a', 1)
+    for _ in range(5):
+        now[0] += 8
+        assert store.get('a') == 1
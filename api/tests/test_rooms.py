@@ -0,0 +1,69 @@
+import asyncio
+from random import Random
+
+from rooms import Room, Send
+from serialization import JSON
+
+
+async def play_game(number_of_players: int, number_of_questions: int, *, slow_players: int, seed: int = 0):
+    """
+    Plays a game with many local clients on the current event loop (without network), the slow players take 10
+    seconds to receive a message.
+
+    :return: the room, the bytes received by each player and the JSON bytes of the questions sent
+    """
+    room = Room('000000', latex=True, rng=seed, max_players=number_of_players)
+    received: dict[str, list[bytes]] = {}
+    rng = Random(seed)
+
+    def make_send(name: str, slow: bool) -> Send:
+        async def send(payload: bytes):
+            if slow:
+                await asyncio.sleep(10)
+            received[name].append(payload)
+        return send
+
+    async def deliver():
+        #  Lets the writers of the fast players empty their outbox
+        fast_connections = [room.players[f'player{player}'] for player in range(slow_players, number_of_players)]
+        while any(connection.outbox for connection in fast_connections):
+            await asyncio.sleep(0)
+
+    writers = []
+    for player in range(number_of_players):
+        name = f'player{player}'
+        received[name] = []
+        connection = room.join(name, make_send(name, player < slow_players), send_timeout=0.5)
+        writers.append(asyncio.create_task(connection.writer()))
+
+    questions = []
+    for _ in range(number_of_questions):
+        questions.append(room.next_question()[JSON])
+        await deliver()
+        for name in list(room.players):
+            room.answer(name, room.question_index, rng.randrange(4))
+        await deliver()
+    room.end()
+    await deliver()
+    await asyncio.sleep(0.6)  # the slow players reach their timeout
+    slow_closed = [room.players[f'player{player}'].closed for player in range(slow_players)]
+    for connection in room.players.values():
+        connection.close()
+    await asyncio.gather(*writers)
+    return room, received, questions, slow_closed
+
+
+def test_slow_players_dont_stall_the_room():
+    number_of_players, number_of_questions, slow_players = 500, 5, 10
+    room, received, questions, slow_closed = asyncio.run(
+        play_game(number_of_players, number_of_questions, slow_players=slow_players))
+
+    for player in range(slow_players, number_of_players):
+        name = f'player{player}'
+        #  The question sent to a player is the same object, it has not been serialized again
+        sent_questions = [payload for payload in received[name] if payload.startswith(b'{"type":"question"')]
+        assert len(sent_questions) == number_of_questions, name
+        assert all(payload is question for payload, question in zip(sent_questions, questions)), name
+        assert received[name][-1].startswith(b'{"type":"end"'), name
+    assert all(slow_closed)
+    assert len(room.ranking()) == min(room.leaderboard_size, number_of_players)
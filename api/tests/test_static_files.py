@@ -0,0 +1,8 @@
+from static_files import accepted_encodings
+
+
+def test_accepted_encodings():
+    assert accepted_encodings('gzip, deflate, br;q=1.0, zstd;q=0') == {'gzip', 'deflate', 'br'}
+    assert accepted_encodings('GZIP;q=0.000, br ; Q=0.5') == {'br'}
+    assert accepted_encodings('gzip;q=abc') == set()
+    assert accepted_encodings('') == set()
@@ -0,0 +1,121 @@
+"""
+Unit circle | MathQuiz
+
+One immutable table per format (latex or not) with, for each angle we are supposed to know (0°, 30°, 45°, 60° plus
+multiples of 90°), its value in degrees, its exact value in radians and the exact values of its cosine and sine.
+The trigonometry questions of both quiz modules take their values in this table instead of computing cos/sin,
+rounding them and searching the rounded value in a dictionary at each question.
+"""
+from fractions import Fraction
+from math import sqrt
+from typing import NamedTuple
+
+#  How the values are written in each format (latex=True or False)
+FORMATS = {
+    False: {'pi': 'π', 'degree': '°', 'frac': '{a}/{b}', 'sqrt': '√({n})'},
+    True: {'pi': '\\pi', 'degree': '^\\circ', 'frac': '\\frac{{{a}}}{{{b}}}', 'sqrt': '\\sqrt{{{n}}}'},
+}
+#  Cosine of the angles of the first quadrant: (numeric value, (numerator, denominator) of the exact value)
+#  The numerator is a square root when it's an int greater than 1, e.g. (3, 2) is √3/2
+FIRST_QUADRANT_COSINE = {0: (1.0, (1, 1)), 30: (sqrt(3) / 2, (3, 2)), 45: (sqrt(2) / 2, (2, 2)),
+                         60: (0.5, (1, 2)), 90: (0.0, (0, 1))}
+BASE_ANGLES = (0, 30, 45, 60)
+
+
+class AngleRow(NamedTuple):
+    degree: int
+    degree_text: str
+    radian_text: str
+    cos_text: str
+    sin_text: str
+    cos: float
+    sin: float
+
+
+class UnitCircle:
+    def __init__(self, latex: bool = False, *, start: int = -4, stop: int = 4):
+        """
+        :param latex: format of the texts of the table
+        :param start: the table begins at 90° * start
+        :param stop: the table ends at 90° * stop
+        """
+        self.latex = latex
+        self.format = FORMATS[latex]
+        self._rows: dict[int, AngleRow] = {}
+        self._radians: dict[int, str] = {}
+        self.rows: tuple[AngleRow, ...] = self.rows_between(90 * start, 90 * stop)
+        #  All the different values that cos and sin can take in the table
+        self.values = {function: tuple(dict.fromkeys(getattr(row, f'{function}_text') for row in self.rows))
+                       for function in ('cos', 'sin')}
+
+    def degree_text(self, degree: int) -> str:
+        return f"{degree}{self.format['degree']}"
+
+    def radian_text(self, degree: int) -> str:
+        """
+        returns the exact value in radians of an angle in degrees (works for all integers, not only the table)
+        """
+        text = self._radians.get(degree)
+        if text is None:
+            ratio = Fraction(degree, 180)
+            if ratio == 0:
+                text = '0'
+            else:
+                sign = '-' if ratio < 0 else ''
+                #  we don't draw 1π or -1π but just π or -π
+                a = self.format['pi'] if abs(ratio.numerator) == 1 else f"{abs(ratio.numerator)}{self.format['pi']}"
+                if ratio.denominator == 1:
+                    text = f'{sign}{a}'
+                else:
+                    text = sign + self.format['frac'].format(a=a, b=ratio.denominator)
+            self._radians[degree] = text
+        return text
+
+    def exact_cosine(self, degree: int) -> tuple[str, float]:
+        """
+        returns the exact value of the cosine of an angle of the table (in text and in number)
+        """
+        angle = degree % 360
+        reference_angle = angle % 180
+        if reference_angle > 90:
+            reference_angle = 180 - reference_angle
+        if reference_angle not in FIRST_QUADRANT_COSINE:
+            raise ValueError(f'The cosine of {degree}° has no exact value in the unit circle table.')
+        value, (numerator, denominator) = FIRST_QUADRANT_COSINE[reference_angle]
+        negative = 90 < angle < 270
+        if numerator == 0:
+            return '0', 0.0
+        numerator_text = self.format['sqrt'].format(n=numerator) if numerator > 1 else numerator
+        text = self.format['frac'].format(a=numerator_text, b=denominator) if denominator > 1 else str(numerator_text)
+        return ('-' + text if negative else text), (-value if negative else value)
+
+    def row(self, degree: int) -> AngleRow:
+        row = self._rows.get(degree)
+        if row is None:
+            cos_text, cos_value = self.exact_cosine(degree)
+            sin_text, sin_value = self.exact_cosine(degree - 90)  # sin(x) = cos(x - 90°)
+            row = self._rows[degree] = AngleRow(degree=degree, degree_text=self.degree_text(degree),
+                                                radian_text=self.radian_text(degree), cos_text=cos_text,
+                                                sin_text=sin_text, cos=cos_value, sin=sin_value)
+        return row
+
+    def rows_between(self, min_degree: int, max_degree: int) -> tuple[AngleRow, ...]:
+        """
+        returns the rows of the base angles (0°, 30°, 45°, 60°) plus a multiple of 90°, between the two angles.
+        """
+        quarters = range(min_degree - min_degree % 90, max_degree + 1, 90)
+        return tuple(self.row(quarter + base_angle) for quarter in quarters
+                     for base_angle in BASE_ANGLES if min_degree <= quarter + base_angle <= max_degree)
+
+
+_unit_circles: dict[bool, UnitCircle] = {}
+
+
+def get_unit_circle(latex: bool = False) -> UnitCircle:
+    """
+    Returns the table of the format, and builds it if this is the first call of the process.
+    """
+    unit_circle = _unit_circles.get(latex)
+    if unit_circle is None:
+        unit_circle = _unit_circles[latex] = UnitCircle(latex)
+    return unit_circle